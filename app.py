@@ -5,7 +5,6 @@ Speech to insights: Transcribe → Preprocess → Sentiment → Topic Modeling 
 
 import sys
 import threading
-import time
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent
@@ -18,33 +17,108 @@ import streamlit as st
 st.set_page_config(page_title="speech2insight-AI", layout="wide")
 
 # Lazy imports for heavy modules (Whisper, transformers) — only when user triggers that step
+from src.cache import default_audio_cache, default_transcript_cache
 from src.config import (
+    EMOTION_BACKEND,
+    EMOTION_MODEL,
+    LSA_MAX_TOPICS,
     N_TOPICS,
     SENTIMENT_CHUNK_SIZE,
+    SENTIMENT_TIMELINE_STEP,
+    SENTIMENT_TIMELINE_WINDOW,
     SUMMARY_MAX_LENGTH,
     SUMMARY_MIN_LENGTH,
     TOPIC_CHUNK_SIZE,
+    WHISPER_INT8,
 )
-from src.preprocess import preprocess_document, preprocess_for_nlp
+from src.documents import TokenDocument
+from src.models import ModelLoadError, get_registry, parse_preload_spec
+from src.nltk_resources import NLTKResourceError, init_nltk_resources
+from src.online_topics import OnlineTopicModel
+from src.preprocess import preprocess_to_document
+from src.render_cache import RenderCache, render_topic_images
+from src.segments import SegmentTable
 from src.sentiment import (
     aspect_based_sentiment,
     get_emotions_transformers,
     sentiment_chunked,
+    sentiment_timeline,
 )
+from src.stage_cache import StageCache
 from src.summarization import bleu_score, rouge_scores, summarize_with_t5
 from src.topic_modeling import chunk_text as topic_chunk_text
-from src.topic_modeling import run_lsa, topic_heatmap, wordcloud_for_topic
+from src.topic_modeling import lsa_explained_variance, run_lsa
 from src.transcribe import (
+    INT8_SUFFIX,
     check_ffmpeg_available,
-    load_whisper_model,
+    lookup_cached_segments,
     transcribe_uploaded_file,
 )
 
 
-@st.cache_resource(show_spinner=False)
 def get_whisper_model_cached(model_name: str):
-    """Load Whisper once per model and reuse (reduces repeated load time)."""
-    return load_whisper_model(model_name)
+    """Whisper from the shared model registry (loaded once, evicted under memory pressure)."""
+    return get_registry().get("whisper", model_name)
+
+
+@st.cache_resource(show_spinner=False)
+def _start_model_warmup() -> bool:
+    """Preload MODEL_PRELOAD models once per server process, in the background."""
+    specs = parse_preload_spec()
+    if specs:
+        threading.Thread(target=get_registry().preload, args=(specs,), daemon=True).start()
+    return bool(specs)
+
+
+_start_model_warmup()
+
+
+@st.cache_resource(show_spinner=False)
+def _init_nltk() -> frozenset:
+    """Resolve NLTK data once per server process (raises instead of downloading mid-request)."""
+    return init_nltk_resources()
+
+
+try:
+    _init_nltk()
+except NLTKResourceError as e:
+    st.error(str(e))
+    st.stop()
+
+
+@st.cache_resource(show_spinner=False)
+def _stage_cache() -> StageCache:
+    """Stage results for all sessions of this server process (keys are content hashes)."""
+    return StageCache()
+
+
+stages = _stage_cache()
+
+
+@st.cache_resource(show_spinner=False)
+def _render_cache() -> RenderCache:
+    """Rendered topic plot PNGs by input hash, shared by sessions."""
+    return RenderCache()
+
+
+@st.cache_resource(show_spinner=False)
+def _online_topics() -> tuple[OnlineTopicModel, threading.Lock]:
+    """Persisted corpus topic model (shared by sessions) and the lock guarding its updates."""
+    return OnlineTopicModel.load_or_create(), threading.Lock()
+
+
+def _range_document(table: SegmentTable, t0: float, t1: float) -> TokenDocument:
+    return TokenDocument.from_tokens(table.tokens_between(t0, t1))
+
+
+def _timeline_chart_data(timeline, table: SegmentTable | None, t0: float) -> dict:
+    """Window midpoints in seconds for timestamped transcripts, in words otherwise."""
+    mid = (timeline.start + timeline.end) // 2
+    if table is None or not len(table):
+        return {"word": mid, "polarity": timeline.polarity}
+    first = table.index_range(t0, table.duration + 1)[0]
+    offset = table.token_start[first] if first < len(table) else 0
+    return {"time (s)": table.token_times(mid + offset), "polarity": timeline.polarity}
 
 
 def _rerun() -> None:
@@ -57,10 +131,12 @@ def _rerun() -> None:
 # ----- Session state -----
 if "transcript" not in st.session_state:
     st.session_state.transcript = ""
+if "segments" not in st.session_state:
+    st.session_state.segments = None  # SegmentTable for audio transcripts, None for pasted text
 if "preprocessed" not in st.session_state:
     st.session_state.preprocessed = ""
-if "whisper_model" not in st.session_state:
-    st.session_state.whisper_model = None
+if "preprocessed_doc" not in st.session_state:
+    st.session_state.preprocessed_doc = None  # TokenDocument shared by the later steps
 if "summary" not in st.session_state:
     st.session_state.summary = ""
 
@@ -89,6 +165,8 @@ if step_upload:
         whisper_model_name = st.selectbox(
             "Whisper model", ["tiny", "base", "small", "medium", "large"], index=1
         )
+        if st.checkbox("int8 quantized (CPU)", value=WHISPER_INT8, key="whisper_int8"):
+            whisper_model_name += INT8_SUFFIX
 
     if audio_file:
         # ffmpeg is auto-provisioned from imageio-ffmpeg (pip install); no manual install needed
@@ -98,49 +176,55 @@ if step_upload:
         except FileNotFoundError:
             st.sidebar.warning("Install ffmpeg: pip install imageio-ffmpeg")
         if st.button("Transcribe", key="transcribe_btn"):
-            progress_bar = st.progress(0, text="Starting…")
-            result_holder: list = [None]
-            exception_holder: list = [None]
+            progress_bar = st.progress(0.0, text="Starting…")
+            live_text = st.empty()
+            transcript_cache = default_transcript_cache()
+            segments: list = []
 
-            def run_transcribe() -> None:
-                try:
+            def on_progress(done: float, total: float) -> None:
+                frac = done / total if total else 1.0
+                progress_bar.progress(frac, text=f"Transcribing… {done:.0f} / {total:.0f} s")
+
+            def on_segment(seg) -> None:
+                segments.append(seg)
+                live_text.caption(" ".join(s.text for s in segments[-20:])[-600:])
+
+            try:
+                # Cache hit: same bytes + settings already transcribed, skip model load
+                cached = lookup_cached_segments(
+                    audio_file.getvalue(), whisper_model_name, cache=transcript_cache, streamed=True
+                )
+                if cached is not None:
+                    segments = cached
+                else:
+                    progress_bar.progress(0.0, text="Loading model…")
                     model = get_whisper_model_cached(whisper_model_name)
-                    progress_bar.progress(0.25, text="Model loaded. Transcribing…")
-                    text = transcribe_uploaded_file(
-                        audio_file, model=model, model_name=whisper_model_name
+                    transcribe_uploaded_file(
+                        audio_file,
+                        model=model,
+                        model_name=whisper_model_name,
+                        cache=transcript_cache,
+                        progress=on_progress,
+                        on_segment=on_segment,
+                        audio_cache=default_audio_cache(),
                     )
-                    result_holder[0] = (model, text or "")
-                except Exception as e:  # noqa: BLE001
-                    exception_holder[0] = e
-
-            thread = threading.Thread(target=run_transcribe)
-            thread.start()
-            # Animate progress 25% → 95% while transcribing (Whisper has no progress API)
-            p = 0.25
-            while thread.is_alive() and p < 0.95:
-                time.sleep(0.5)
-                p = min(p + 0.05, 0.95)
-                progress_bar.progress(p, text="Transcribing…")
-            thread.join(timeout=1.0)
-            progress_bar.progress(1.0, text="Done.")
-            time.sleep(0.3)
-            progress_bar.empty()
-
-            if exception_holder[0]:
-                e = exception_holder[0]
-                if isinstance(e, FileNotFoundError):
-                    st.error(str(e))
-                elif isinstance(e, OSError) and (
-                    getattr(e, "winerror", None) == 2 or e.errno == 2
-                ):
+                table = SegmentTable.from_segments(segments)
+            except FileNotFoundError as e:
+                st.error(str(e))
+            except OSError as e:
+                if getattr(e, "winerror", None) == 2 or e.errno == 2:
                     st.error("Audio tool not found. Install: pip install imageio-ffmpeg")
                 else:
                     st.error(f"Transcription failed: {e}")
+            except Exception as e:  # noqa: BLE001
+                st.error(f"Transcription failed: {e}")
             else:
-                model, text = result_holder[0]
-                st.session_state.transcript = text
-                st.session_state.whisper_model = model
+                st.session_state.segments = table
+                st.session_state.transcript = table.text
                 st.success("Transcription done.")
+            finally:
+                progress_bar.empty()
+                live_text.empty()
         if st.session_state.transcript:
             st.subheader("Transcript")
             st.text_area(
@@ -151,20 +235,50 @@ if step_upload:
     pasted = st.text_area("Paste text to run rest of pipeline", height=100, key="pasted_transcript")
     if pasted and st.button("Use pasted text as transcript"):
         st.session_state.transcript = pasted.strip()
+        st.session_state.segments = None
         _rerun()
 
+# Timestamped transcripts: every later step can be restricted to a time range. Each range
+# is a slice of the segment table, so moving the slider does not re-preprocess anything.
+segment_table = st.session_state.segments
+analysis_text = st.session_state.transcript
+time_range = None
+if segment_table is not None and len(segment_table) and st.session_state.transcript:
+    duration = max(segment_table.duration, 1.0)
+    time_range = st.sidebar.slider(
+        "Analysis time range (s)", 0.0, duration, (0.0, duration), key="time_range"
+    )
+    analysis_text = segment_table.text_between(*time_range)
+
+# Every step below goes through the stage cache: a rerun only recomputes the stages whose
+# inputs (or upstream stages) changed, e.g. moving the topic slider skips preprocessing.
+# The preprocessed document is built the same way whether or not step 2 is shown, so
+# sentiment and topics don't depend on that checkbox.
+doc_stage = None
+preprocess_error = None
+if st.session_state.transcript and (step_preprocess or step_sentiment or step_topics):
+    try:
+        if time_range is not None:
+            doc_stage = stages.run("preprocess", _range_document, segment_table, *time_range)
+        else:
+            doc_stage = stages.run(
+                "preprocess", preprocess_to_document, st.session_state.transcript
+            )
+    except Exception as e:
+        preprocess_error = f"Preprocessing failed: {e}"
+doc = doc_stage.value if doc_stage is not None else None
+# Later steps chunk this document (token views) instead of re-splitting the text
+st.session_state.preprocessed_doc = doc
+st.session_state.preprocessed = doc.text if doc is not None else ""
+
 # ----- 2. Preprocess -----
 if step_preprocess and st.session_state.transcript:
     st.header("2. Preprocess")
-    try:
-        preprocessed = preprocess_document(st.session_state.transcript)
-    except Exception as e:
-        st.error(f"Preprocessing failed: {e}")
-        preprocessed = ""
-    st.session_state.preprocessed = preprocessed
+    if preprocess_error:
+        st.error(preprocess_error)
     st.text_area(
         "Preprocessed text (cleaned, tokenized, stopwords removed, negatives kept)",
-        preprocessed,
+        st.session_state.preprocessed,
         height=150,
         key="preproc_ta",
     )
@@ -172,12 +286,13 @@ if step_preprocess and st.session_state.transcript:
 # ----- 3. Sentiment -----
 if step_sentiment and st.session_state.transcript:
     st.header("3. Sentiment Analysis")
-    text_for_sentiment = st.session_state.preprocessed or preprocess_for_nlp(
-        st.session_state.transcript
-    )
-    if text_for_sentiment:
+    if preprocess_error and not step_preprocess:
+        st.error(preprocess_error)
+    if doc:
         try:
-            res = sentiment_chunked(text_for_sentiment, chunk_size=SENTIMENT_CHUNK_SIZE)
+            res = stages.run(
+                "sentiment", sentiment_chunked, doc_stage, chunk_size=SENTIMENT_CHUNK_SIZE
+            ).value
         except Exception as e:
             st.error(f"Sentiment failed: {e}")
             res = None
@@ -188,6 +303,19 @@ if step_sentiment and st.session_state.transcript:
             c3.metric("Label", res.label)
         st.caption("Chunk-based TextBlob; neutral threshold 0.05")
 
+        timeline = stages.run("timeline", sentiment_timeline, doc_stage).value
+        if len(timeline.start) > 1:
+            st.subheader("Sentiment timeline")
+            chart = _timeline_chart_data(
+                timeline, segment_table, time_range[0] if time_range else 0.0
+            )
+            x_label = next(iter(chart))
+            st.line_chart(chart, x=x_label, y="polarity")
+            st.caption(
+                f"Polarity over {SENTIMENT_TIMELINE_WINDOW}-word windows every "
+                f"{SENTIMENT_TIMELINE_STEP} words"
+            )
+
         aspects_input = st.text_input(
             "Aspect-based sentiment — comma-separated aspects (e.g. god, love, faith)",
             key="aspects",
@@ -196,67 +324,143 @@ if step_sentiment and st.session_state.transcript:
             aspects = [a.strip() for a in aspects_input.split(",") if a.strip()]
             if aspects:
                 try:
-                    absa = aspect_based_sentiment(st.session_state.transcript, aspects)
+                    absa = stages.run(
+                        "aspects", aspect_based_sentiment, analysis_text, aspects
+                    ).value
                     st.write("Aspect polarities:", absa)
                 except Exception as e:
                     st.warning(f"Aspect sentiment failed: {e}")
 
         if st.checkbox("Run emotion detection (transformers)", value=False, key="run_emotions"):
+            backends = ["torch", "onnx", "onnx-int8"]
+            emotion_backend = st.radio(
+                "Emotion backend",
+                backends,
+                index=backends.index(EMOTION_BACKEND) if EMOTION_BACKEND in backends else 0,
+                horizontal=True,
+                key="emotion_backend",
+                help="ONNX Runtime (needs onnxruntime); the model is exported once and cached.",
+            )
             with st.spinner("Loading emotion model…"):
                 try:
-                    emotions = get_emotions_transformers(text_for_sentiment)
+                    emotions = stages.run(
+                        "emotions",
+                        get_emotions_transformers,
+                        doc_stage,
+                        EMOTION_MODEL,
+                        backend=emotion_backend,
+                        raise_on_load_error=True,  # not cached: retried on the next run
+                    ).value
                     if emotions:
                         st.bar_chart(emotions)
                     else:
-                        st.info("Emotion model unavailable or returned no scores.")
+                        st.info("Emotion model returned no scores.")
+                except ModelLoadError as e:
+                    st.info(f"Emotion model unavailable: {e}")
                 except Exception as e:
                     st.warning(f"Emotion detection failed: {e}")
 
 # ----- 4. Topic Modeling -----
 if step_topics and st.session_state.transcript:
     st.header("4. Topic Modeling (LSA)")
-    text_for_topic = st.session_state.preprocessed or preprocess_for_nlp(
-        st.session_state.transcript
-    )
-    if text_for_topic:
-        n_topics = st.slider("Number of topics", 2, 10, N_TOPICS, key="n_topics")
-        docs = topic_chunk_text(text_for_topic, chunk_size=TOPIC_CHUNK_SIZE)
-        if len(docs) >= 1:
+    if preprocess_error and not (step_preprocess or step_sentiment):
+        st.error(preprocess_error)
+    if doc:
+        n_topics = st.slider(
+            "Number of topics", 2, LSA_MAX_TOPICS, min(N_TOPICS, LSA_MAX_TOPICS), key="n_topics"
+        )
+        docs_stage = stages.run(
+            "topic_chunks", topic_chunk_text, doc_stage, chunk_size=TOPIC_CHUNK_SIZE
+        )
+        if len(docs_stage.value) >= 1:
             try:
-                vec, svd, doc_topic, top_words, top_weights = run_lsa(
-                    docs, n_topics=n_topics
+                # One SVD at LSA_MAX_TOPICS per document set; the slider only slices it
+                lsa_stage = stages.run(
+                    "lsa", run_lsa, docs_stage, n_topics=n_topics, max_topics=LSA_MAX_TOPICS
+                )
+                vec, svd, doc_topic, top_words, top_weights = lsa_stage.value
+                explained = stages.run(
+                    "lsa_variance", lsa_explained_variance, docs_stage, max_topics=LSA_MAX_TOPICS
+                ).value
+                if len(explained) > 1:
+                    st.caption("Cumulative explained variance by number of topics")
+                    st.line_chart(
+                        {"topics": range(1, len(explained) + 1), "explained variance": explained},
+                        x="topics",
+                        y="explained variance",
+                        height=180,
+                    )
+                # Only images whose data changed are re-rendered (in parallel)
+                images = render_topic_images(
+                    doc_topic, top_words, top_weights, cache=_render_cache()
                 )
                 st.subheader("Topic heatmap")
-                buf = topic_heatmap(doc_topic)
-                st.image(buf)
+                st.image(images.heatmap)
                 st.subheader("Top words per topic")
-                tabs = st.tabs([f"Topic {i + 1}" for i in range(n_topics)])
-                for i, (words, weights) in enumerate(zip(top_words, top_weights)):
+                tabs = st.tabs([f"Topic {i + 1}" for i in range(len(top_words))])
+                for i, words in enumerate(top_words):
                     with tabs[i]:
                         st.write("Top words:", ", ".join(words[:10]))
-                        wc_buf = wordcloud_for_topic(words, weights)
-                        st.image(wc_buf)
+                        st.image(images.wordclouds[i])
+                with st.expander("Render times"):
+                    st.dataframe(
+                        [
+                            {"image": t.image, "render s": round(t.seconds, 3), "cached": t.cached}
+                            for t in images.timings
+                        ],
+                        hide_index=True,
+                    )
             except Exception as e:
                 st.warning(f"LSA error: {e} (need enough distinct documents)")
+
+            with st.expander("Corpus topics (online model across transcripts)"):
+                corpus_model, corpus_lock = _online_topics()
+                if st.button("Add this transcript to the corpus model", key="online_topics_add"):
+                    with corpus_lock:
+                        corpus_model.partial_fit(docs_stage.value)
+                        corpus_model.save()
+                if corpus_model.fitted:
+                    with corpus_lock:
+                        mix = corpus_model.transform(docs_stage.value).mean(axis=0)
+                        corpus_words, _ = corpus_model.top_words(8)
+                    st.caption(f"Model trained on {corpus_model.n_docs} chunks so far")
+                    st.dataframe(
+                        [
+                            {
+                                "topic": i + 1,
+                                "this transcript": round(float(mix[i]), 3),
+                                "top words": ", ".join(w),
+                            }
+                            for i, w in enumerate(corpus_words)
+                        ],
+                        hide_index=True,
+                    )
+                else:
+                    st.caption("No transcripts added yet.")
         else:
             st.info("Need more text (chunk size 300 words) for topic modeling.")
 
 # ----- 5. Summarization -----
 if step_summary and st.session_state.transcript:
     st.header("5. Summarization (T5)")
-    full_text = st.session_state.transcript
+    full_text = analysis_text
     if len(full_text.split()) > 50:
         if st.button("Generate summary", key="summarize_btn"):
             with st.spinner("Summarizing with T5…"):
                 try:
-                    summary = summarize_with_t5(
+                    summary = stages.run(
+                        "summary",
+                        summarize_with_t5,
                         full_text,
                         max_length=SUMMARY_MAX_LENGTH,
                         min_length=SUMMARY_MIN_LENGTH,
-                    )
+                        raise_on_load_error=True,  # not cached: retried on the next click
+                    ).value
                     st.session_state.summary = summary or ""
-                    if st.session_state.summary and not st.session_state.summary.startswith("["):
+                    if st.session_state.summary:
                         st.success("Summary generated.")
+                except ModelLoadError as e:
+                    st.error(f"Summarization model failed to load: {e}")
                 except Exception as e:
                     st.error(f"Summarization failed: {e}")
         if st.session_state.get("summary"):
@@ -276,5 +480,41 @@ if step_summary and st.session_state.transcript:
     else:
         st.info("Transcript is short; add more text for summarization.")
 
+with st.sidebar.expander("Models in memory"):
+    model_stats = get_registry().stats()
+    if model_stats:
+        st.dataframe(
+            [
+                {
+                    "model": f"{s.kind}: {s.name}",
+                    "load s": round(s.load_seconds, 1),
+                    "MB": round(s.size_bytes / 2**20),
+                    "hits": s.hits,
+                }
+                for s in model_stats
+            ],
+            hide_index=True,
+        )
+    else:
+        st.caption("None loaded yet.")
+
+with st.sidebar.expander("Stage cache"):
+    stage_stats = stages.stats()
+    if stage_stats:
+        st.dataframe(
+            [
+                {
+                    "stage": s.stage,
+                    "hits": s.hits,
+                    "misses": s.misses,
+                    "compute s": round(s.compute_seconds, 2),
+                }
+                for s in stage_stats
+            ],
+            hide_index=True,
+        )
+    else:
+        st.caption("Nothing computed yet.")
+
 st.sidebar.divider()
 st.sidebar.caption("speech2insight-AI — Whisper, NLTK, TextBlob, LSA, T5")
@@ -0,0 +1 @@
+# Benchmarks — run as scripts: python benchmarks/<name>.py --help
@@ -0,0 +1,65 @@
+"""
+Benchmark: emotion detection, one pipeline call per chunk vs batched calls.
+
+Runs EMOTION_MODEL over a long transcript (synthetic, or --text) and reports chunks per
+second for the old per-chunk loop and for get_emotions_transformers at several batch sizes.
+
+    python benchmarks/bench_emotion.py --words 20000 --batch-sizes 8 16 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.config import EMOTION_MODEL
+from src.models import get_registry
+from src.sentiment import emotion_chunks, get_emotions_transformers
+
+VOCAB = (
+    "i am so happy with the support team but the delivery was late again and honestly that "
+    "makes me angry we were scared the order got lost what a surprise it arrived today"
+).split()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--text", help="transcript file to use instead of synthetic text")
+    parser.add_argument("--chunk-words", type=int, default=60, help="words per chunk")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 16, 32])
+    args = parser.parse_args()
+
+    if args.text:
+        text = Path(args.text).read_text(encoding="utf-8")
+    else:
+        rng = random.Random(0)
+        text = " ".join(rng.choices(VOCAB, k=args.words))
+    pipe = get_registry().get("emotion", EMOTION_MODEL)
+    chunks = emotion_chunks(text, args.chunk_words)
+    print(f"{len(chunks)} chunks of <= {args.chunk_words} words\n")
+    pipe(chunks[:2], truncation=True, max_length=512)  # warm-up
+
+    t0 = time.perf_counter()
+    for c in chunks:
+        pipe(c, truncation=True, max_length=512)
+    loop_rate = len(chunks) / (time.perf_counter() - t0)
+    print(f"{'mode':<14}{'chunks/s':>10}{'speed-up':>10}")
+    print(f"{'loop':<14}{loop_rate:>10.1f}{1.0:>9.2f}x")
+    for bs in args.batch_sizes:
+        t0 = time.perf_counter()
+        get_emotions_transformers(text, EMOTION_MODEL, args.chunk_words, batch_size=bs)
+        rate = len(chunks) / (time.perf_counter() - t0)
+        print(f"{f'batch {bs}':<14}{rate:>10.1f}{rate / loop_rate:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
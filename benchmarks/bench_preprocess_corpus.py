@@ -0,0 +1,72 @@
+"""
+Benchmark: preprocess_corpus scaling across worker processes.
+
+Preprocesses a synthetic archive of transcripts (or every .txt under --dir) with
+n_jobs = 1, 2, 4, ... up to the CPU count and reports docs/s, MB/s and speed-up over 1 job.
+
+    python benchmarks/bench_preprocess_corpus.py --docs 2000 --words 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.preprocess import preprocess_corpus
+
+VOCAB = (
+    "we the product delivery was not great love support team honestly think revenue "
+    "customers said it's worst they've seen cannot complain gonna pull slide okay quarter "
+    "numbers up 12% really amazing terrible slow fast price value"
+).split()
+
+
+def synthetic_corpus(n_docs: int, n_words: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(n_docs):
+        words = rng.choices(VOCAB, k=n_words)
+        docs.append(" ".join(w + ("." if rng.random() < 0.08 else "") for w in words))
+    return docs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=3000, help="words per synthetic transcript")
+    parser.add_argument("--dir", help="use the .txt transcripts under this directory instead")
+    parser.add_argument("--chunksize", type=int, default=16)
+    args = parser.parse_args()
+
+    if args.dir:
+        texts = [p.read_text(encoding="utf-8") for p in sorted(Path(args.dir).rglob("*.txt"))]
+    else:
+        texts = synthetic_corpus(args.docs, args.words)
+    if not texts:
+        print(f"No transcripts found in {args.dir}")
+        return 1
+    mb = sum(len(t.encode("utf-8")) for t in texts) / 1e6
+    print(f"{len(texts)} transcripts, {mb:.1f} MB\n")
+    cpus = os.cpu_count() or 1
+    jobs = sorted({1, cpus} | {2**i for i in range(1, cpus.bit_length()) if 2**i < cpus})
+    print(f"{'n_jobs':>6}{'seconds':>10}{'docs/s':>10}{'MB/s':>8}{'speed-up':>10}")
+    base = None
+    for n in jobs:
+        t0 = time.perf_counter()
+        preprocess_corpus(texts, n_jobs=n, chunksize=args.chunksize)
+        dt = time.perf_counter() - t0
+        base = base or dt
+        print(f"{n:>6}{dt:>10.2f}{len(texts) / dt:>10.0f}{mb / dt:>8.1f}{base / dt:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
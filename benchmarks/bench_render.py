@@ -0,0 +1,66 @@
+"""
+Benchmark: topic plot rendering, cold serial vs cold threaded vs cached.
+
+Renders the LSA heatmap and one word cloud per topic for a synthetic transcript with
+render_topic_images and prints wall time per mode plus the slowest images.
+
+    python benchmarks/bench_render.py --topics 10 --workers 1 2 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.render_cache import RenderCache, render_topic_images
+from src.topic_modeling import chunk_text, run_lsa
+
+THEMES = [
+    "machine learning model data training neural network deep",
+    "delivery order shipping package refund late courier address",
+    "doctor patient hospital treatment medicine nurse clinic appointment",
+    "budget revenue invoice quarter forecast profit margin cost",
+    "meeting schedule client contract deadline proposal agenda call",
+]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--topics", type=int, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    # Themed runs of 200 words, so chunks differ and topics separate
+    text = " ".join(
+        " ".join(rng.choices(rng.choice(THEMES).split(), k=200)) for _ in range(args.words // 200)
+    )
+    _, _, doc_topic, words, weights = run_lsa(chunk_text(text), n_topics=args.topics)
+    print(f"1 heatmap + {len(words)} word clouds\n")
+    render_topic_images(doc_topic[:2], words[:1], weights[:1], n_jobs=1)  # warm-up (fonts)
+
+    print(f"{'mode':<14}{'seconds':>10}")
+    for n in args.workers:
+        t0 = time.perf_counter()
+        images = render_topic_images(doc_topic, words, weights, n_jobs=n)
+        print(f"{f'cold, {n} thr':<14}{time.perf_counter() - t0:>10.3f}")
+    cache = RenderCache()
+    render_topic_images(doc_topic, words, weights, cache=cache)
+    t0 = time.perf_counter()
+    render_topic_images(doc_topic, words, weights, cache=cache)
+    print(f"{'cached':<14}{time.perf_counter() - t0:>10.3f}\n")
+    for t in sorted(images.timings, key=lambda t: -t.seconds)[:3]:
+        print(f"{t.image:<14}{t.seconds:>10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
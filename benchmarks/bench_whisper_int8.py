@@ -0,0 +1,89 @@
+"""
+Benchmark: fp32 vs int8 dynamically quantized Whisper on CPU.
+
+Reports real-time factor (decode seconds / audio seconds, lower is faster) and word error
+rate against reference transcripts for each model size, to pick e.g. base vs small on cost.
+
+    python benchmarks/bench_whisper_int8.py --models base small --samples benchmarks/samples
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.transcribe import (
+    DECODE_OPTIONS,
+    INT8_SUFFIX,
+    SAMPLE_RATE,
+    decode_audio_file,
+    load_whisper_model,
+    word_error_rate,
+)
+
+AUDIO_EXTS = {".wav", ".mp3", ".flac", ".m4a", ".ogg"}
+
+
+def load_samples(sample_dir: Path) -> list[tuple[str, object, str]]:
+    """(name, decoded audio, reference text) for every audio file with a matching .txt."""
+    samples = []
+    for audio in sorted(sample_dir.iterdir()):
+        ref = audio.with_suffix(".txt")
+        if audio.suffix.lower() in AUDIO_EXTS and ref.is_file():
+            samples.append((audio.name, decode_audio_file(audio), ref.read_text(encoding="utf-8")))
+    return samples
+
+
+def run(model_name: str, samples: list, language: str | None) -> tuple[float, float, float]:
+    """Returns (load seconds, real-time factor, mean WER) over all samples."""
+    t0 = time.perf_counter()
+    model = load_whisper_model(model_name)
+    load_s = time.perf_counter() - t0
+    model.transcribe(samples[0][1][: SAMPLE_RATE * 5], language=language, **DECODE_OPTIONS)
+    decode_s = audio_s = 0.0
+    wers = []
+    for _, audio, ref in samples:
+        t0 = time.perf_counter()
+        result = model.transcribe(audio, language=language, **DECODE_OPTIONS)
+        decode_s += time.perf_counter() - t0
+        audio_s += len(audio) / SAMPLE_RATE
+        wers.append(word_error_rate(ref, result.get("text") or ""))
+    return load_s, decode_s / audio_s, sum(wers) / len(wers)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--models", nargs="+", default=["base", "small"])
+    parser.add_argument("--samples", default=str(Path(__file__).parent / "samples"))
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--threads", type=int, default=0, help="torch threads (0 = default)")
+    args = parser.parse_args()
+
+    if args.threads:
+        import torch
+
+        torch.set_num_threads(args.threads)
+    samples = load_samples(Path(args.samples))
+    if not samples:
+        print(f"No audio + .txt reference pairs in {args.samples} (see samples/README.md)")
+        return 1
+    total = sum(len(a) for _, a, _ in samples) / SAMPLE_RATE
+    print(f"{len(samples)} samples, {total:.0f} s of audio\n")
+    print(f"{'model':<14}{'load s':>8}{'RTF':>8}{'WER':>8}{'speed-up':>10}")
+    for name in args.models:
+        fp32_rtf = None
+        for variant in (name, name + INT8_SUFFIX):
+            load_s, rtf, wer = run(variant, samples, args.language)
+            fp32_rtf = fp32_rtf or rtf
+            print(f"{variant:<14}{load_s:>8.1f}{rtf:>8.3f}{wer:>8.3f}{fp32_rtf / rtf:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
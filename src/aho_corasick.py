@@ -0,0 +1,63 @@
+"""Aho–Corasick multi-pattern substring matcher (pure Python, no extra dependency)."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+
+
+class AhoCorasick:
+    """
+    Automaton over a fixed set of patterns: matches(text) returns the indices of every pattern
+    that occurs in text as a substring, in one pass over the text regardless of how many
+    patterns there are. An empty pattern occurs in every text.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns = list(patterns)
+        self._goto: list[dict[str, int]] = [{}]
+        self._out: list[tuple[int, ...]] = [()]
+        self._always = tuple(i for i, p in enumerate(self.patterns) if not p)
+        for i, pattern in enumerate(self.patterns):
+            if pattern:
+                self._insert(pattern, i)
+        self._fail = [0] * len(self._goto)
+        self._link()
+
+    def _insert(self, pattern: str, index: int) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._out.append(())
+            state = nxt
+        self._out[state] += (index,)
+
+    def _link(self) -> None:
+        """Breadth-first failure links; each state also reports its suffix states' patterns."""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] += out[fail[nxt]]
+
+    def matches(self, text: str) -> set[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(self._always)
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
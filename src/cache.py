@@ -0,0 +1,183 @@
+"""Content-addressed on-disk caches shared by the Streamlit app, CLI and worker processes."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Any
+
+import numpy as np
+
+from .config import (
+    AUDIO_CACHE_DIR,
+    AUDIO_CACHE_MAX_MB,
+    TRANSCRIPT_CACHE_DIR,
+    TRANSCRIPT_CACHE_MAX_MB,
+)
+
+_HASH_BLOCK = 1 << 20
+
+
+def audio_digest(audio: bytes | str | Path) -> str:
+    """sha256 of raw audio bytes, or of a file's contents (read in 1 MiB blocks)."""
+    if isinstance(audio, bytes):
+        return hashlib.sha256(audio).hexdigest()
+    h = hashlib.sha256()
+    with open(audio, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class _DiskLRU:
+    """
+    Directory of one-file-per-key entries with a total size cap.
+    Writes go to a temp file in the same directory and are os.replace'd into place, so
+    concurrent processes never see partial entries. Reads bump mtime, eviction removes the
+    least recently used files first.
+    """
+
+    suffix = ".bin"
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{self.suffix}"
+
+    def _touch(self, path: Path) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _atomic_write(self, path: Path, write: Callable[[IO[bytes]], Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for p in self.cache_dir.glob(f"*/*{self.suffix}"):
+            try:
+                st = p.stat()
+            except OSError:  # removed by another process
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+            total += st.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, p in entries:
+            p.unlink(missing_ok=True)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        for p in self.cache_dir.glob(f"*/*{self.suffix}"):
+            p.unlink(missing_ok=True)
+
+
+class TranscriptCache(_DiskLRU):
+    """Whisper transcripts keyed by audio content + model name, language and decode options."""
+
+    suffix = ".json"
+
+    def __init__(
+        self,
+        cache_dir: str | Path = TRANSCRIPT_CACHE_DIR,
+        max_bytes: int = TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024,
+    ) -> None:
+        super().__init__(cache_dir, max_bytes)
+
+    @staticmethod
+    def make_key(
+        digest: str,
+        model_name: str,
+        language: str | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> str:
+        """Cache key from audio_digest() output and everything that changes the transcript."""
+        params = json.dumps(
+            {"model": model_name, "language": language, "options": options or {}},
+            sort_keys=True,
+        )
+        return hashlib.sha256(f"{digest}:{params}".encode()).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Cached entry ({"text": ...}) or None on miss or unreadable entry."""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        self._touch(path)
+        return entry
+
+    def put(self, key: str, entry: dict[str, Any]) -> None:
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        self._atomic_write(self._path(key), lambda f: f.write(data))
+
+
+class AudioCache(_DiskLRU):
+    """
+    Decoded mono PCM (float32) as .npy files, keyed by audio content + sample rate.
+    Entries are opened with np.load(mmap_mode="r"): re-runs skip ffmpeg, and only the pages
+    actually read are brought into memory.
+    """
+
+    suffix = ".npy"
+
+    def __init__(
+        self,
+        cache_dir: str | Path = AUDIO_CACHE_DIR,
+        max_bytes: int = AUDIO_CACHE_MAX_MB * 1024 * 1024,
+    ) -> None:
+        super().__init__(cache_dir, max_bytes)
+
+    @staticmethod
+    def make_key(digest: str, sample_rate: int) -> str:
+        return hashlib.sha256(f"{digest}:pcm_f32:{sample_rate}".encode()).hexdigest()
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Read-only memory-mapped samples, or None on miss or unreadable entry."""
+        path = self._path(key)
+        try:
+            samples = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        self._touch(path)
+        return samples
+
+    def put(self, key: str, samples: np.ndarray) -> None:
+        arr = np.ascontiguousarray(samples, dtype=np.float32)
+        self._atomic_write(self._path(key), lambda f: np.save(f, arr))
+
+
+def default_transcript_cache() -> TranscriptCache | None:
+    """Cache at TRANSCRIPT_CACHE_DIR, or None if caching is disabled (empty dir setting)."""
+    if not TRANSCRIPT_CACHE_DIR:
+        return None
+    return TranscriptCache()
+
+
+def default_audio_cache() -> AudioCache | None:
+    """Cache at AUDIO_CACHE_DIR, or None if caching is disabled (empty dir setting)."""
+    if not AUDIO_CACHE_DIR:
+        return None
+    return AudioCache()
@@ -7,6 +7,37 @@ import os
 
 # Whisper: tiny | base | small | medium | large
 WHISPER_MODEL: str = os.environ.get("WHISPER_MODEL", "base")
+# int8 dynamic quantization for CPU inference (default of the app's "int8" toggle)
+WHISPER_INT8: bool = os.environ.get("WHISPER_INT8", "0").lower() in ("1", "true", "yes")
+# Worker processes for batch transcription (each holds its own Whisper model)
+TRANSCRIBE_WORKERS: int = int(os.environ.get("TRANSCRIBE_WORKERS", "2"))
+# Cascade mode: fast first pass, larger model only for low-confidence segments
+CASCADE_FAST_MODEL: str = os.environ.get("CASCADE_FAST_MODEL", "tiny")
+CASCADE_ACCURATE_MODEL: str = os.environ.get("CASCADE_ACCURATE_MODEL", "small")
+CASCADE_LOGPROB_THRESHOLD: float = float(os.environ.get("CASCADE_LOGPROB_THRESHOLD", "-0.8"))
+CASCADE_COMPRESSION_RATIO_THRESHOLD: float = float(
+    os.environ.get("CASCADE_COMPRESSION_RATIO_THRESHOLD", "2.4")
+)
+# Long-recording mode: target window length and overlap (seconds) when splitting at silence
+LONG_AUDIO_WINDOW_S: float = float(os.environ.get("LONG_AUDIO_WINDOW_S", "300"))
+LONG_AUDIO_OVERLAP_S: float = float(os.environ.get("LONG_AUDIO_OVERLAP_S", "2.0"))
+# ... and how far back (seconds) from each target length to look for the quietest point
+LONG_AUDIO_SEARCH_S: float = float(os.environ.get("LONG_AUDIO_SEARCH_S", "15"))
+
+# On-disk transcript cache (set TRANSCRIPT_CACHE_DIR to an empty string to disable)
+_CACHE_HOME = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+TRANSCRIPT_CACHE_DIR: str = os.environ.get(
+    "TRANSCRIPT_CACHE_DIR", os.path.join(_CACHE_HOME, "speech2insight", "transcripts")
+)
+TRANSCRIPT_CACHE_MAX_MB: int = int(os.environ.get("TRANSCRIPT_CACHE_MAX_MB", "256"))
+# Decoded 16 kHz PCM cache (.npy, memory-mapped); empty AUDIO_CACHE_DIR disables it
+AUDIO_CACHE_DIR: str = os.environ.get(
+    "AUDIO_CACHE_DIR", os.path.join(_CACHE_HOME, "speech2insight", "audio")
+)
+AUDIO_CACHE_MAX_MB: int = int(os.environ.get("AUDIO_CACHE_MAX_MB", "2048"))
+
+# NLTK: never download at runtime; stopwords fall back to the vendored list in src/data
+NLTK_OFFLINE: bool = os.environ.get("NLTK_OFFLINE", "0").lower() in ("1", "true", "yes")
 
 # Preprocessing — these negative words are always kept during stopword removal
 NEGATIVE_WORDS = {
@@ -41,10 +72,25 @@ NEGATIVE_WORDS = {
 # Sentiment (Step 3)
 SENTIMENT_CHUNK_SIZE: int = int(os.environ.get("SENTIMENT_CHUNK_SIZE", "200"))
 NEUTRAL_THRESHOLD: float = float(os.environ.get("NEUTRAL_THRESHOLD", "0.05"))
+# lexicon = batched array engine (same scores as TextBlob) | textblob = one TextBlob per chunk
+SENTIMENT_ENGINE: str = os.environ.get("SENTIMENT_ENGINE", "lexicon")
+# Rolling sentiment timeline: window length and hop, in tokens
+SENTIMENT_TIMELINE_WINDOW: int = int(os.environ.get("SENTIMENT_TIMELINE_WINDOW", "200"))
+SENTIMENT_TIMELINE_STEP: int = int(os.environ.get("SENTIMENT_TIMELINE_STEP", "20"))
 
 # Topic modeling (Step 4)
 TOPIC_CHUNK_SIZE: int = int(os.environ.get("TOPIC_CHUNK_SIZE", "300"))
 N_TOPICS: int = int(os.environ.get("N_TOPICS", "5"))
+# run_lsa fits once at this many topics; smaller topic counts are slices of that fit
+LSA_MAX_TOPICS: int = int(os.environ.get("LSA_MAX_TOPICS", "10"))
+# Randomized SVD for LSA: power iterations and oversampling (accuracy vs fit time)
+LSA_N_ITER: int = int(os.environ.get("LSA_N_ITER", "5"))
+LSA_N_OVERSAMPLES: int = int(os.environ.get("LSA_N_OVERSAMPLES", "10"))
+# Online topic model across transcripts: hashed feature buckets, persisted model directory
+ONLINE_TOPIC_FEATURES: int = int(os.environ.get("ONLINE_TOPIC_FEATURES", str(2**18)))
+TOPIC_MODEL_DIR: str = os.environ.get(
+    "TOPIC_MODEL_DIR", os.path.join(_CACHE_HOME, "speech2insight", "topics")
+)
 
 # Summarization (Step 5)
 SUMMARY_MODEL: str = os.environ.get("SUMMARY_MODEL", "google-t5/t5-base")
@@ -56,3 +102,22 @@ SUMMARY_CHUNK_SIZE: int = int(os.environ.get("SUMMARY_CHUNK_SIZE", "512"))
 EMOTION_MODEL: str = os.environ.get(
     "EMOTION_MODEL", "j-hartmann/emotion-english-distilroberta-base"
 )
+# Chunks per emotion-model forward pass (chunks are length-sorted to minimize padding)
+EMOTION_BATCH_SIZE: int = int(os.environ.get("EMOTION_BATCH_SIZE", "16"))
+# torch = transformers pipeline | onnx = ONNX Runtime (exported once, cached) | onnx-int8
+EMOTION_BACKEND: str = os.environ.get("EMOTION_BACKEND", "torch")
+EMOTION_ONNX_DIR: str = os.environ.get(
+    "EMOTION_ONNX_DIR", os.path.join(_CACHE_HOME, "speech2insight", "onnx")
+)
+
+# App stage cache: memoized results of preprocess/sentiment/LSA across Streamlit reruns
+STAGE_CACHE_MAX_ENTRIES: int = int(os.environ.get("STAGE_CACHE_MAX_ENTRIES", "256"))
+# Topic plot rendering: PNG cache keyed by input hash (MB, LRU) and threads for cache misses
+RENDER_CACHE_MAX_MB: float = float(os.environ.get("RENDER_CACHE_MAX_MB", "64"))
+RENDER_WORKERS: int = int(os.environ.get("RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Model registry (Whisper, summarization, emotion share one RAM budget, LRU eviction)
+MODEL_MEMORY_BUDGET_MB: int = int(os.environ.get("MODEL_MEMORY_BUDGET_MB", "4096"))
+MODEL_LOAD_ATTEMPTS: int = int(os.environ.get("MODEL_LOAD_ATTEMPTS", "2"))
+# Comma-separated kind:name pairs loaded at app startup, e.g. "whisper:base,emotion:<model>"
+MODEL_PRELOAD: str = os.environ.get("MODEL_PRELOAD", "")
@@ -0,0 +1,241 @@
+"""Corpus LSA: fit TF-IDF + randomized SVD once over an archive, fold new transcripts in.
+
+run_lsa refits on every transcript. CorpusLSA is fitted once over many chunks and saved as
+a directory that loads without refitting:
+
+    meta.json           vectorizer settings, vocabulary, SVD settings, explained variance
+    idf.npy             float32 IDF weights
+    components.npy      float32 (n_topics, n_terms) topic-term matrix, memory-mapped on load
+    singular_values.npy
+    doc_topic.npy       float32 (n_docs, n_topics) archive chunks in topic space, memory-mapped
+    tfidf.npz           the archive's TF-IDF matrix, scipy sparse float32
+
+transform_to_topics folds a new transcript into the fixed topic space with one sparse
+TF-IDF transform and a product with the components: milliseconds, no refit.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .config import LSA_N_ITER, LSA_N_OVERSAMPLES, N_TOPICS, TOPIC_CHUNK_SIZE, TOPIC_MODEL_DIR
+from .logger import get_logger
+
+log = get_logger()
+
+FORMAT_VERSION = 1
+# TfidfVectorizer settings that change how text maps to features (saved with the model)
+_VECTORIZER_PARAMS = (
+    "lowercase",
+    "stop_words",
+    "token_pattern",
+    "ngram_range",
+    "norm",
+    "smooth_idf",
+    "sublinear_tf",
+)
+
+
+def default_model_dir() -> Path:
+    return Path(TOPIC_MODEL_DIR) / "corpus_lsa"
+
+
+class CorpusLSA:
+    """A fitted TF-IDF vocabulary plus LSA components; see the module docstring for the format."""
+
+    def __init__(
+        self,
+        vectorizer: TfidfVectorizer,
+        components: np.ndarray,
+        singular_values: np.ndarray,
+        explained_variance_ratio: np.ndarray,
+        doc_topic: np.ndarray | None = None,
+        tfidf: sp.csr_matrix | None = None,
+        svd_params: dict[str, Any] | None = None,
+    ) -> None:
+        self.vectorizer = vectorizer
+        self.components = components
+        self.singular_values = singular_values
+        self.explained_variance_ratio = explained_variance_ratio
+        self.doc_topic = doc_topic
+        self.tfidf = tfidf
+        self.svd_params = svd_params or {}
+        self._terms: np.ndarray | None = None
+
+    @property
+    def n_topics(self) -> int:
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(
+        cls,
+        documents: Iterable[str],
+        n_topics: int = N_TOPICS,
+        max_features: int | None = 20000,
+        min_df: int | float = 2,
+        max_df: float = 0.95,
+        n_iter: int = LSA_N_ITER,
+        n_oversamples: int = LSA_N_OVERSAMPLES,
+        random_state: int = 42,
+    ) -> CorpusLSA:
+        """
+        TfidfVectorizer (float32) + randomized TruncatedSVD over an archive of chunks (any
+        iterable, consumed once). n_iter (power iterations) and n_oversamples trade fit time
+        for accuracy of the leading components; the defaults suit up to millions of chunks.
+        """
+        vectorizer = TfidfVectorizer(
+            max_features=max_features,
+            min_df=min_df,
+            max_df=max_df,
+            stop_words="english",
+            dtype=np.float32,
+        )
+        X = vectorizer.fit_transform(documents)
+        n_topics = max(1, min(n_topics, X.shape[0], X.shape[1]))
+        svd_params = {
+            "n_iter": n_iter,
+            "n_oversamples": n_oversamples,
+            "random_state": random_state,
+        }
+        svd = TruncatedSVD(n_components=n_topics, algorithm="randomized", **svd_params)
+        doc_topic = svd.fit_transform(X).astype(np.float32)
+        return cls(
+            vectorizer,
+            svd.components_.astype(np.float32),
+            svd.singular_values_,
+            svd.explained_variance_ratio_,
+            doc_topic,
+            X.tocsr(),
+            svd_params,
+        )
+
+    def transform_to_topics(self, documents: Sequence[str]) -> np.ndarray:
+        """(len(documents), n_topics) fold-in of new chunks; same as svd.transform."""
+        X = self.vectorizer.transform(documents)
+        return np.asarray(X @ self.components.T, dtype=np.float32)
+
+    def top_words(self, n_words: int = 15) -> tuple[list[list[str]], list[list[float]]]:
+        """Top words and weights per topic (same layout as run_lsa's last two values)."""
+        if self._terms is None:
+            self._terms = self.vectorizer.get_feature_names_out()
+        k = min(n_words, self.components.shape[1])
+        words, weights = [], []
+        for comp in self.components:
+            top = np.argpartition(-comp, k - 1)[:k]
+            top = top[np.argsort(-comp[top])]
+            words.append(self._terms[top].tolist())
+            weights.append(comp[top].astype(float).tolist())
+        return words, weights
+
+    def save(self, path: str | Path | None = None) -> Path:
+        """Write the model directory (replacing any previous one as a whole)."""
+        path = Path(path) if path is not None else default_model_dir()
+        tmp = path.with_name(f".tmp_{os.getpid()}_{path.name}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        try:
+            params = self.vectorizer.get_params()
+            meta = {
+                "version": FORMAT_VERSION,
+                "vectorizer": {p: params[p] for p in _VECTORIZER_PARAMS},
+                "terms": self.vectorizer.get_feature_names_out().tolist(),
+                "svd": self.svd_params,
+                "explained_variance_ratio": np.asarray(self.explained_variance_ratio).tolist(),
+            }
+            (tmp / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+            np.save(tmp / "idf.npy", self.vectorizer.idf_.astype(np.float32))
+            np.save(tmp / "components.npy", np.asarray(self.components, dtype=np.float32))
+            np.save(tmp / "singular_values.npy", np.asarray(self.singular_values))
+            if self.doc_topic is not None:
+                np.save(tmp / "doc_topic.npy", np.asarray(self.doc_topic, dtype=np.float32))
+            if self.tfidf is not None:
+                sp.save_npz(tmp / "tfidf.npz", self.tfidf.astype(np.float32), compressed=False)
+            if path.exists():
+                shutil.rmtree(path)
+            os.replace(tmp, path)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path | None = None, load_tfidf: bool = False) -> CorpusLSA:
+        """
+        Open a saved model: components and doc_topic are memory-mapped (read-only), so loading
+        is fast and several processes share the pages. The archive TF-IDF matrix is only read
+        with load_tfidf.
+        """
+        path = Path(path) if path is not None else default_model_dir()
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported corpus LSA format in {path}: {meta.get('version')}")
+        settings = dict(meta["vectorizer"])
+        settings["ngram_range"] = tuple(settings["ngram_range"])
+        vectorizer = TfidfVectorizer(vocabulary=meta["terms"], dtype=np.float32, **settings)
+        vectorizer.idf_ = np.load(path / "idf.npy")
+        doc_topic_path = path / "doc_topic.npy"
+        tfidf_path = path / "tfidf.npz"
+        return cls(
+            vectorizer,
+            np.load(path / "components.npy", mmap_mode="r"),
+            np.load(path / "singular_values.npy"),
+            np.asarray(meta["explained_variance_ratio"]),
+            np.load(doc_topic_path, mmap_mode="r") if doc_topic_path.exists() else None,
+            sp.load_npz(tfidf_path).tocsr() if load_tfidf and tfidf_path.exists() else None,
+            meta.get("svd"),
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI: python -m src.corpus_lsa FILE [FILE ...] -- fit and save a corpus LSA model."""
+    from .preprocess import preprocess_document  # noqa: PLC0415
+    from .topic_modeling import chunk_text  # noqa: PLC0415
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.corpus_lsa",
+        description="Fit LSA once over transcript text files and save it for fold-in.",
+    )
+    parser.add_argument("paths", nargs="+", help="Transcript .txt files")
+    parser.add_argument(
+        "-o", "--out", default=None, help=f"Model dir (default {default_model_dir()})"
+    )
+    parser.add_argument("-k", "--topics", type=int, default=N_TOPICS)
+    parser.add_argument("--chunk-size", type=int, default=TOPIC_CHUNK_SIZE)
+    parser.add_argument("--n-iter", type=int, default=LSA_N_ITER, help="SVD power iterations")
+    parser.add_argument("--n-oversamples", type=int, default=LSA_N_OVERSAMPLES)
+    args = parser.parse_args(argv)
+
+    def chunks() -> Iterable[str]:
+        for p in args.paths:
+            text = Path(p).read_text(encoding="utf-8")
+            yield from chunk_text(preprocess_document(text), args.chunk_size)
+
+    model = CorpusLSA.fit(
+        chunks(), args.topics, n_iter=args.n_iter, n_oversamples=args.n_oversamples
+    )
+    path = model.save(args.out)
+    log.info(
+        "Saved corpus LSA (%d chunks, %d terms, %d topics) to %s",
+        model.doc_topic.shape[0],
+        model.components.shape[1],
+        model.n_topics,
+        path,
+    )
+    for i, words in enumerate(model.top_words(10)[0]):
+        print(f"Topic {i + 1}: {', '.join(words)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Token-ID documents shared between pipeline stages.
+
+Preprocessing produces one TokenDocument: the space-joined token text (built once), an int32
+token-ID array over a Vocabulary, and each token's character offset. Sentiment, topic and
+summarization chunkers take slice views of it (NumPy views plus one substring) instead of
+re-splitting and re-joining the text for every stage. Each document gets its own vocabulary
+unless the caller passes one to share, so nothing grows for the life of the process.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+
+
+class Vocabulary:
+    """
+    Interned word <-> int32 id mapping; grows as new words are encoded. Thread-safe: ids are
+    assigned under a lock, and words is only ever appended to.
+    """
+
+    def __init__(self) -> None:
+        self._index: dict[str, int] = {}
+        self.words: list[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._index
+
+    def encode(self, tokens: Iterable[str]) -> np.ndarray:
+        index, words = self._index, self.words
+        ids = []
+        with self._lock:
+            for w in tokens:
+                i = index.get(w)
+                if i is None:
+                    i = index[w] = len(words)
+                    words.append(w)
+                ids.append(i)
+        return np.array(ids, dtype=np.int32)
+
+    def decode(self, ids: Iterable[int]) -> list[str]:
+        words = self.words
+        return [words[i] for i in ids]
+
+
+class TokenDocument:
+    """
+    Tokens of one preprocessed document. ids[i] is the vocabulary id of token i and
+    starts[i] its character offset in the joined text; slicing (doc[a:b]) returns a view that
+    shares the text, arrays and vocabulary with the parent.
+    """
+
+    __slots__ = ("_text", "ids", "starts", "vocab")
+
+    def __init__(self, text: str, ids: np.ndarray, starts: np.ndarray, vocab: Vocabulary) -> None:
+        self._text = text
+        self.ids = ids
+        self.starts = starts
+        self.vocab = vocab
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[str], vocab: Vocabulary | None = None) -> TokenDocument:
+        """Encode tokens over vocab (a new vocabulary for this document if not given)."""
+        tokens = list(tokens)
+        vocab = Vocabulary() if vocab is None else vocab
+        lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+        starts = np.zeros(len(tokens), dtype=np.int64)
+        np.cumsum(lengths[:-1] + 1, out=starts[1:])
+        return cls(" ".join(tokens), vocab.encode(tokens), starts, vocab)
+
+    @classmethod
+    def from_text(cls, text: str, vocab: Vocabulary | None = None) -> TokenDocument:
+        """From already-preprocessed (whitespace-separated) text."""
+        return cls.from_tokens(text.split(), vocab)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, key: slice) -> TokenDocument:
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("TokenDocument supports contiguous slices only")
+        return TokenDocument(self._text, self.ids[key], self.starts[key], self.vocab)
+
+    @property
+    def text(self) -> str:
+        """Space-joined tokens of this document or view."""
+        if not len(self.ids):
+            return ""
+        end = self.starts[-1] + len(self.vocab.words[self.ids[-1]])
+        return self._text[self.starts[0] : end]
+
+    def __str__(self) -> str:
+        return self.text
+
+    @property
+    def tokens(self) -> list[str]:
+        return self.vocab.decode(self.ids)
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[TokenDocument]:
+        for i in range(0, len(self), chunk_size):
+            yield self[i : i + chunk_size]
+
+    def chunks(self, chunk_size: int) -> list[TokenDocument]:
+        """Consecutive views of chunk_size tokens (the last may be shorter)."""
+        return list(self.iter_chunks(chunk_size))
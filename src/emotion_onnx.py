@@ -0,0 +1,215 @@
+"""ONNX Runtime backend for the emotion classifier (optional: needs onnxruntime).
+
+The HuggingFace model is exported to ONNX once with torch.onnx.export, optionally int8
+dynamically quantized with onnxruntime.quantization, and cached on disk (EMOTION_ONNX_DIR)
+next to its tokenizer and config, under a directory named after the opset and the torch,
+transformers and onnxruntime versions, so upgrading any of them triggers a fresh export. OnnxEmotionClassifier is called like the transformers
+text-classification pipeline with top_k=None, so get_emotions_transformers returns the same
+dict of label -> mean score on either backend.
+"""
+
+from __future__ import annotations
+
+import inspect
+import os
+import re
+from collections.abc import Sequence
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .config import EMOTION_ONNX_DIR
+from .logger import get_logger
+
+log = get_logger()
+
+# Model-name suffix selecting the int8 quantized graph (same convention as Whisper's "-int8")
+INT8_SUFFIX = "-int8"
+_OPSET = 17
+
+
+def export_tag() -> str:
+    """Opset and library versions an exported graph depends on, e.g. opset17-torch2.1.0-..."""
+    parts = [f"opset{_OPSET}"]
+    for dist in ("torch", "transformers", "onnxruntime"):
+        try:
+            parts.append(dist + version(dist))
+        except PackageNotFoundError:
+            parts.append(dist + "-none")
+    return re.sub(r"[^\w.-]+", "_", "-".join(parts))
+
+
+def onnx_model_dir(model_name: str, cache_dir: str | Path = EMOTION_ONNX_DIR) -> Path:
+    """Directory holding the exported graph(s), tokenizer and config for model_name."""
+    return Path(cache_dir) / re.sub(r"[^\w.-]+", "--", model_name.strip("/")) / export_tag()
+
+
+def export_onnx(
+    model_name: str, cache_dir: str | Path = EMOTION_ONNX_DIR, quantize: bool = False
+) -> Path:
+    """
+    Path to model.onnx (or model.int8.onnx with quantize) for model_name, exporting it on the
+    first call. Files are written under a temporary name and os.replace'd into place, so a
+    concurrent process never loads a half-written graph.
+    """
+    out = onnx_model_dir(model_name, cache_dir)
+    fp32 = out / "model.onnx"
+    target = out / "model.int8.onnx" if quantize else fp32
+    if target.exists():
+        return target
+    out.mkdir(parents=True, exist_ok=True)
+    if not fp32.exists():
+        _export_fp32(model_name, out, fp32)
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic  # noqa: PLC0415
+
+        tmp = out / f".tmp_{os.getpid()}_{target.name}"
+        try:
+            quantize_dynamic(fp32, tmp, weight_type=QuantType.QInt8)
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+        log.info("Quantized %s to int8 (%s)", model_name, target)
+    return target
+
+
+def export_input_names(model: Any, sample: Any) -> list[str]:
+    """
+    Tokenizer outputs that model.forward accepts, in forward's parameter order (the order of
+    the exported graph inputs). A tokenizer can emit inputs the model has no parameter for,
+    e.g. token_type_ids for DistilBERT, whose third positional parameter is head_mask.
+    """
+    params = inspect.signature(model.forward).parameters
+    return [n for n in params if n in sample]
+
+
+def _export_fp32(model_name: str, out: Path, path: Path) -> None:
+    import torch  # noqa: PLC0415
+    from transformers import (  # noqa: PLC0415
+        AutoModelForSequenceClassification,
+        AutoTokenizer,
+    )
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+    tokenizer.save_pretrained(out)
+    model.config.save_pretrained(out)
+    sample = tokenizer(["an example sentence", "short"], padding=True, return_tensors="pt")
+    input_names = export_input_names(model, sample)
+    dynamic = {n: {0: "batch", 1: "sequence"} for n in input_names}
+    # torch >= 2.9 defaults to the torch.export-based exporter, whose graphs onnxruntime's int8
+    # quantizer rejects; keep the TorchScript exporter wherever torch offers the choice
+    legacy = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        legacy["dynamo"] = False
+    tmp = out / f".tmp_{os.getpid()}_{path.name}"
+    try:
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                ({n: sample[n] for n in input_names},),  # trailing dict: passed by name
+                str(tmp),
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes={**dynamic, "logits": {0: "batch"}},
+                opset_version=_OPSET,
+                **legacy,
+            )
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    log.info("Exported %s to ONNX (%s)", model_name, path)
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    z = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return z / z.sum(axis=-1, keepdims=True)
+
+
+def _sigmoid(logits: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-logits))
+
+
+class OnnxEmotionClassifier:
+    """
+    ONNX Runtime session + tokenizer behaving like pipeline("text-classification", top_k=None):
+    a string gives a list of {"label", "score"} dicts sorted by score, a list of strings a
+    list of those. Scores use the same function as the pipeline (softmax, or sigmoid for
+    multi-label / single-logit models).
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        tokenizer: Any,
+        id2label: dict[int, str],
+        multi_label: bool = False,
+        nbytes: int = 0,
+    ) -> None:
+        self.session = session
+        self.tokenizer = tokenizer
+        self.labels = [id2label[i] for i in range(len(id2label))]
+        self.multi_label = multi_label or len(self.labels) == 1
+        self.input_names = [i.name for i in session.get_inputs()]
+        self.nbytes = nbytes  # graph size on disk, for the model registry's RAM budget
+
+    @classmethod
+    def from_pretrained(
+        cls, model_name: str, cache_dir: str | Path = EMOTION_ONNX_DIR, quantize: bool = False
+    ) -> OnnxEmotionClassifier:
+        """Export (first call only) and load model_name on the CPU execution provider."""
+        import onnxruntime as ort  # noqa: PLC0415
+        from transformers import AutoConfig, AutoTokenizer  # noqa: PLC0415
+
+        path = export_onnx(model_name, cache_dir, quantize)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+        config = AutoConfig.from_pretrained(path.parent)
+        return cls(
+            session,
+            AutoTokenizer.from_pretrained(path.parent),
+            {int(k): v for k, v in config.id2label.items()},
+            multi_label=config.problem_type == "multi_label_classification",
+            nbytes=path.stat().st_size,
+        )
+
+    def scores(
+        self,
+        texts: Sequence[str],
+        batch_size: int = 16,
+        truncation: bool = True,
+        max_length: int = 512,
+    ) -> np.ndarray:
+        """(len(texts), n_labels) probabilities."""
+        out = np.zeros((len(texts), len(self.labels)), dtype=np.float32)
+        for i in range(0, len(texts), max(1, batch_size)):
+            enc = self.tokenizer(
+                list(texts[i : i + batch_size]),
+                padding=True,
+                truncation=truncation,
+                max_length=max_length,
+                return_tensors="np",
+            )
+            feed = {n: np.asarray(enc[n], dtype=np.int64) for n in self.input_names}
+            (logits,) = self.session.run(["logits"], feed)
+            out[i : i + len(logits)] = (_sigmoid if self.multi_label else _softmax)(logits)
+        return out
+
+    def __call__(
+        self,
+        texts: str | Sequence[str],
+        batch_size: int = 16,
+        truncation: bool = True,
+        max_length: int = 512,
+        **_: Any,
+    ) -> list[dict[str, float]] | list[list[dict[str, float]]]:
+        single = isinstance(texts, str)
+        probs = self.scores([texts] if single else texts, batch_size, truncation, max_length)
+        results = [
+            [{"label": self.labels[j], "score": float(row[j])} for j in np.argsort(-row)]
+            for row in probs
+        ]
+        return results[0] if single else results
@@ -0,0 +1,252 @@
+"""Shared, thread-safe registry for heavy models (Whisper, summarization, emotion).
+
+One place to load, cache and evict models: a RAM budget with least-recently-used eviction,
+optional warm-up preload, load failures that are retried instead of cached, and per-model
+load time / resident size stats.
+"""
+
+from __future__ import annotations
+
+import gc
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple
+
+from .config import MODEL_LOAD_ATTEMPTS, MODEL_MEMORY_BUDGET_MB, MODEL_PRELOAD
+from .logger import get_logger
+
+log = get_logger()
+
+
+class ModelLoadError(RuntimeError):
+    """A model could not be loaded (after all attempts). Nothing is cached."""
+
+
+class ModelStats(NamedTuple):
+    kind: str
+    name: str
+    load_seconds: float
+    size_bytes: int
+    hits: int
+
+
+def _load_whisper(name: str) -> Any:
+    from .transcribe import load_whisper_model  # noqa: PLC0415  # avoid import cycle
+
+    return load_whisper_model(name)
+
+
+def _load_summarization(name: str) -> Any:
+    from transformers import pipeline  # noqa: PLC0415
+
+    return pipeline("summarization", model=name)
+
+
+def _load_emotion(name: str) -> Any:
+    from transformers import pipeline  # noqa: PLC0415
+
+    return pipeline("text-classification", model=name, top_k=None)
+
+
+def _load_emotion_onnx(name: str) -> Any:
+    from .emotion_onnx import INT8_SUFFIX, OnnxEmotionClassifier  # noqa: PLC0415
+
+    quantize = name.endswith(INT8_SUFFIX)
+    if quantize:
+        name = name[: -len(INT8_SUFFIX)]
+    return OnnxEmotionClassifier.from_pretrained(name, quantize=quantize)
+
+
+LOADERS: dict[str, Callable[[str], Any]] = {
+    "whisper": _load_whisper,
+    "summarization": _load_summarization,
+    "emotion": _load_emotion,
+    "emotion-onnx": _load_emotion_onnx,
+}
+
+
+def model_nbytes(model: Any) -> int:
+    """
+    Resident size of a torch model (or HF pipeline's .model): parameters + buffers. Models
+    that are not torch modules (ONNX Runtime sessions) can report their size as .nbytes.
+    """
+    nbytes = getattr(model, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    module = getattr(model, "model", model)
+    total = 0
+    for attr in ("parameters", "buffers"):
+        fn = getattr(module, attr, None)
+        if not callable(fn):
+            continue
+        try:
+            total += sum(t.numel() * t.element_size() for t in fn())
+        except (TypeError, AttributeError):
+            return 0
+    return total
+
+
+class _Entry:
+    __slots__ = ("model", "load_seconds", "size_bytes", "hits")
+
+    def __init__(self, model: Any, load_seconds: float, size_bytes: int) -> None:
+        self.model = model
+        self.load_seconds = load_seconds
+        self.size_bytes = size_bytes
+        self.hits = 0
+
+
+class ModelRegistry:
+    """
+    Loaded models keyed by (kind, name), kept within budget_bytes by evicting the least
+    recently used ones. The model just requested is never evicted, so a single model larger
+    than the budget still loads.
+
+    Room is made before a load, using the model's size from an earlier load (or, for a model
+    never loaded, the largest one seen so far), so a cold load does not stack on top of a full
+    budget. Loads run outside the registry lock with one lock per model: a slow load never
+    blocks hits on models that are already resident, and concurrent requests for the same
+    model load it once. Different models may load at the same time.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = MODEL_MEMORY_BUDGET_MB * 1024 * 1024,
+        loaders: dict[str, Callable[[str], Any]] | None = None,
+        attempts: int = MODEL_LOAD_ATTEMPTS,
+        size_of: Callable[[Any], int] = model_nbytes,
+    ) -> None:
+        self.budget_bytes = budget_bytes
+        self.loaders = dict(LOADERS if loaders is None else loaders)
+        self.attempts = max(1, attempts)
+        self.size_of = size_of
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._known_sizes: dict[tuple[str, str], int] = {}
+        self._load_locks: dict[tuple[str, str], threading.Lock] = {}
+        self._lock = threading.RLock()
+
+    def get(self, kind: str, name: str) -> Any:
+        """Return the cached model, loading it (and evicting others) if needed."""
+        if kind not in self.loaders:
+            raise ValueError(f"Unknown model kind: {kind!r} (known: {', '.join(self.loaders)})")
+        key = (kind, name)
+        with self._lock:
+            entry = self._hit(key)
+            if entry is not None:
+                return entry.model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        with load_lock:
+            with self._lock:
+                entry = self._hit(key)  # loaded by another thread while we waited
+                if entry is not None:
+                    return entry.model
+                self._evict_to(self.budget_bytes - self._expected_size(key))
+            entry = self._load(kind, name)
+            with self._lock:
+                self._entries[key] = entry
+                self._known_sizes[key] = entry.size_bytes
+                self._evict_to(self.budget_bytes, keep=key)
+                return entry.model
+
+    def _hit(self, key: tuple[str, str]) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.hits += 1
+            self._entries.move_to_end(key)
+        return entry
+
+    def _expected_size(self, key: tuple[str, str]) -> int:
+        if key in self._known_sizes:
+            return self._known_sizes[key]
+        return max(self._known_sizes.values(), default=0)
+
+    def _load(self, kind: str, name: str) -> _Entry:
+        loader = self.loaders[kind]
+        last_error: Exception | None = None
+        for attempt in range(1, self.attempts + 1):
+            t0 = time.perf_counter()
+            try:
+                model = loader(name)
+            except Exception as e:  # noqa: BLE001
+                last_error = e
+                log.warning("Loading %s model %s failed (attempt %d): %s", kind, name, attempt, e)
+                continue
+            entry = _Entry(model, time.perf_counter() - t0, self.size_of(model))
+            log.info(
+                "Loaded %s model %s in %.1f s (%.0f MB)",
+                kind,
+                name,
+                entry.load_seconds,
+                entry.size_bytes / 2**20,
+            )
+            return entry
+        raise ModelLoadError(f"Could not load {kind} model {name!r}: {last_error}") from last_error
+
+    def _evict_to(self, limit: int, keep: tuple[str, str] | None = None) -> None:
+        """Evict least recently used models (never keep) until resident bytes <= limit."""
+        evicted = False
+        while self.resident_bytes() > limit:
+            victim = next((k for k in self._entries if k != keep), None)
+            if victim is None:
+                break
+            entry = self._entries.pop(victim)
+            log.info("Evicting %s model %s (%.0f MB)", *victim, entry.size_bytes / 2**20)
+            evicted = True
+        if evicted:
+            gc.collect()
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(e.size_bytes for e in self._entries.values())
+
+    def evict(self, kind: str, name: str) -> bool:
+        with self._lock:
+            return self._entries.pop((kind, name), None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        gc.collect()
+
+    def preload(self, specs: Iterable[tuple[str, str]]) -> dict[tuple[str, str], str]:
+        """Warm up models; returns {(kind, name): error} for the ones that failed to load."""
+        errors = {}
+        for kind, name in specs:
+            try:
+                self.get(kind, name)
+            except (ModelLoadError, ValueError) as e:
+                errors[(kind, name)] = str(e)
+        return errors
+
+    def stats(self) -> list[ModelStats]:
+        """Loaded models, least recently used first."""
+        with self._lock:
+            return [
+                ModelStats(kind, name, e.load_seconds, e.size_bytes, e.hits)
+                for (kind, name), e in self._entries.items()
+            ]
+
+
+def parse_preload_spec(spec: str = MODEL_PRELOAD) -> list[tuple[str, str]]:
+    """'whisper:base,emotion:j-hartmann/...' -> [("whisper", "base"), ("emotion", "...")]."""
+    out = []
+    for item in spec.split(","):
+        kind, sep, name = item.strip().partition(":")
+        if sep and kind and name:
+            out.append((kind.strip(), name.strip()))
+    return out
+
+
+_registry: ModelRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """Process-wide registry shared by the app and all pipeline modules."""
+    global _registry  # noqa: PLW0603
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
@@ -0,0 +1,80 @@
+"""NLTK resources resolved once per process (stopwords, punkt tokenizer).
+
+Lookups happen on first use (or in init_nltk_resources() at startup) and are then frozen,
+so request paths never call nltk.data.find or nltk.download. With NLTK_OFFLINE nothing is
+downloaded: stopwords fall back to the vendored copy of NLTK's English list in
+src/data/, and a missing tokenizer is reported instead of fetched.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+
+import nltk
+
+from .config import NLTK_OFFLINE
+from .logger import get_logger
+
+log = get_logger()
+
+VENDORED_STOPWORDS = Path(__file__).parent / "data" / "stopwords_english.txt"
+# nltk>=3.9 word_tokenize loads punkt_tab; older releases the pickled punkt model
+_TOKENIZER_RESOURCES = (
+    ("tokenizers/punkt_tab/english/", "punkt_tab"),
+    ("tokenizers/punkt", "punkt"),
+)
+
+
+class NLTKResourceError(RuntimeError):
+    """A required NLTK resource is missing and could not (or may not) be downloaded."""
+
+
+def _find(resource: str, package: str, offline: bool) -> bool:
+    try:
+        nltk.data.find(resource)
+        return True
+    except LookupError:
+        pass
+    if offline:
+        return False
+    log.info("Downloading NLTK resource %s", package)
+    try:
+        nltk.download(package, quiet=True)
+        nltk.data.find(resource)
+        return True
+    except (LookupError, OSError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=None)
+def english_stopwords() -> frozenset[str]:
+    """NLTK's English stopwords (corpus if installed/downloadable, else the vendored list)."""
+    if _find("corpora/stopwords", "stopwords", NLTK_OFFLINE):
+        from nltk.corpus import stopwords
+
+        return frozenset(stopwords.words("english"))
+    log.info("NLTK stopwords corpus unavailable, using %s", VENDORED_STOPWORDS.name)
+    return frozenset(VENDORED_STOPWORDS.read_text(encoding="utf-8").split())
+
+
+@lru_cache(maxsize=None)
+def _tokenizer_available() -> bool:
+    return any(_find(res, pkg, NLTK_OFFLINE) for res, pkg in _TOKENIZER_RESOURCES)
+
+
+def ensure_tokenizer() -> None:
+    """Raise NLTKResourceError unless word_tokenize's punkt data is available."""
+    if not _tokenizer_available():
+        raise NLTKResourceError(
+            "NLTK punkt tokenizer data not found"
+            + (" (NLTK_OFFLINE is set)" if NLTK_OFFLINE else "")
+            + ". Install it with: python -m nltk.downloader punkt_tab punkt, "
+            "or point NLTK_DATA at a directory that has it."
+        )
+
+
+def init_nltk_resources() -> frozenset[str]:
+    """Resolve everything up front (call at startup to fail fast). Returns the stopwords."""
+    ensure_tokenizer()
+    return english_stopwords()
@@ -0,0 +1,197 @@
+"""Online topic model shared across transcripts (HashingVectorizer + MiniBatchNMF.partial_fit).
+
+run_lsa fits a fresh vocabulary and SVD per transcript, so its topics are not comparable
+between calls. OnlineTopicModel keeps one topic space for a whole corpus and is updated
+incrementally as transcripts arrive:
+
+- terms are hashed into a fixed number of buckets (no vocabulary to grow), TF-IDF weights
+  come from running document-frequency counts per bucket;
+- topics are learned with MiniBatchNMF.partial_fit, one call per batch of chunks;
+- one representative word is kept per bucket, to label topics.
+
+Every array is sized by n_features and n_topics, never by the number of documents seen, so
+memory stays bounded however large the corpus grows. The model is persisted with joblib.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.decomposition import MiniBatchNMF
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from .config import N_TOPICS, ONLINE_TOPIC_FEATURES, TOPIC_CHUNK_SIZE, TOPIC_MODEL_DIR
+from .logger import get_logger
+
+log = get_logger()
+
+MODEL_FILENAME = "online_topics.joblib"
+
+
+def default_model_path() -> Path:
+    return Path(TOPIC_MODEL_DIR) / MODEL_FILENAME
+
+
+class OnlineTopicModel:
+    """Incrementally trained NMF topics over hashed TF-IDF features."""
+
+    def __init__(
+        self,
+        n_topics: int = N_TOPICS,
+        n_features: int = ONLINE_TOPIC_FEATURES,
+        batch_size: int = 256,
+        random_state: int = 42,
+    ) -> None:
+        self.n_topics = n_topics
+        self.n_features = n_features
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None,
+            stop_words="english",
+            dtype=np.float32,
+        )
+        self.nmf = MiniBatchNMF(
+            n_components=n_topics, batch_size=batch_size, random_state=random_state
+        )
+        self.df = np.zeros(n_features, dtype=np.int64)  # documents containing each bucket
+        self.n_docs = 0
+        self.bucket_words: dict[int, str] = {}  # first word seen per bucket
+
+    def _counts(self, documents: Sequence[str]):
+        counts = self.vectorizer.transform(documents).tocsr()
+        counts.sum_duplicates()
+        return counts
+
+    def _tfidf(self, counts):
+        idf = np.log((1.0 + self.n_docs) / (1.0 + self.df)) + 1.0
+        X = counts.astype(np.float32, copy=True)
+        X.data *= idf[X.indices].astype(np.float32)
+        return normalize(X)
+
+    def _learn_words(self, documents: Sequence[str]) -> None:
+        analyze = self.vectorizer.build_analyzer()
+        words = sorted({w for d in documents for w in analyze(d)})
+        if not words:
+            return
+        X = self._counts(words)
+        for i, w in enumerate(words):
+            lo, hi = X.indptr[i], X.indptr[i + 1]
+            if hi > lo:
+                self.bucket_words.setdefault(int(X.indices[lo]), w)
+
+    def partial_fit(self, documents: Sequence[str]) -> OnlineTopicModel:
+        """Update document frequencies and topics with a batch of chunks (e.g. chunk_text)."""
+        documents = [d for d in documents if d and d.strip()]
+        if not documents:
+            return self
+        counts = self._counts(documents)
+        counts = counts[counts.getnnz(axis=1) > 0]
+        if counts.shape[0] == 0:
+            return self
+        self.df += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_docs += counts.shape[0]
+        self._learn_words(documents)
+        self.nmf.partial_fit(self._tfidf(counts))
+        return self
+
+    @property
+    def fitted(self) -> bool:
+        return self.n_docs > 0
+
+    def transform(self, documents: Sequence[str]) -> np.ndarray:
+        """(len(documents), n_topics) topic weights in the shared corpus topic space."""
+        if not self.fitted:
+            raise ValueError("OnlineTopicModel has not seen any documents yet")
+        if not documents:
+            return np.zeros((0, self.n_topics))
+        return self.nmf.transform(self._tfidf(self._counts(documents)))
+
+    def top_words(self, n_words: int = 15) -> tuple[list[list[str]], list[list[float]]]:
+        """Top words and weights per topic (same layout as run_lsa's last two values)."""
+        if not self.fitted:
+            return [], []
+        buckets = np.fromiter(self.bucket_words, dtype=np.int64, count=len(self.bucket_words))
+        words, weights = [], []
+        for comp in self.nmf.components_:
+            scores = comp[buckets]
+            k = min(n_words, len(buckets))
+            top = np.argpartition(-scores, k - 1)[:k] if k else np.array([], dtype=np.int64)
+            top = top[np.argsort(-scores[top])]
+            words.append([self.bucket_words[int(buckets[j])] for j in top])
+            weights.append([float(scores[j]) for j in top])
+        return words, weights
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the model's arrays; independent of how many documents were seen."""
+        arrays = [self.df] + [v for v in vars(self.nmf).values() if isinstance(v, np.ndarray)]
+        return sum(a.nbytes for a in arrays)
+
+    def save(self, path: str | Path | None = None) -> Path:
+        """Persist atomically (temp file + os.replace) to path (default under TOPIC_MODEL_DIR)."""
+        path = Path(path) if path is not None else default_model_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".tmp_{os.getpid()}_{path.name}")
+        try:
+            joblib.dump(self, tmp)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path | None = None) -> OnlineTopicModel:
+        path = Path(path) if path is not None else default_model_path()
+        model = joblib.load(path)
+        if not isinstance(model, cls):
+            raise TypeError(f"{path} does not contain an {cls.__name__}")
+        return model
+
+    @classmethod
+    def load_or_create(cls, path: str | Path | None = None, **kw) -> OnlineTopicModel:
+        """The persisted model if there is one, else a new model built with **kw."""
+        path = Path(path) if path is not None else default_model_path()
+        if path.exists():
+            return cls.load(path)
+        return cls(**kw)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI: python -m src.online_topics FILE [FILE ...] -- add transcripts to the model."""
+    from .preprocess import preprocess_document  # noqa: PLC0415
+    from .topic_modeling import chunk_text  # noqa: PLC0415
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.online_topics",
+        description="Update the persisted online topic model with transcript text files.",
+    )
+    parser.add_argument("paths", nargs="+", help="Transcript .txt files")
+    parser.add_argument(
+        "--model", default=None, help=f"Model file (default {default_model_path()})"
+    )
+    parser.add_argument("-k", "--topics", type=int, default=N_TOPICS, help="Topics (new model)")
+    parser.add_argument("--chunk-size", type=int, default=TOPIC_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    model = OnlineTopicModel.load_or_create(args.model, n_topics=args.topics)
+    for p in args.paths:
+        text = Path(p).read_text(encoding="utf-8")
+        model.partial_fit(chunk_text(preprocess_document(text), args.chunk_size))
+        log.info("%s: model has seen %d chunks", p, model.n_docs)
+    path = model.save(args.model)
+    log.info("Saved online topic model to %s", path)
+    for i, words in enumerate(model.top_words(10)[0]):
+        print(f"Topic {i + 1}: {', '.join(words)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
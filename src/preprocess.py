@@ -2,35 +2,29 @@
 
 from __future__ import annotations
 
+import os
 import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Set
+from typing import Any, Set
 
-import nltk
-from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 
 from .config import NEGATIVE_WORDS
+from .documents import TokenDocument, Vocabulary
+from .nltk_resources import english_stopwords, ensure_tokenizer
 
 
-# Ensure NLTK data (report: punkt, stopwords)
-def _ensure_nltk_data():
-    for name in ("punkt", "punkt_tab", "stopwords"):
-        try:
-            nltk.data.find(f"tokenizers/{name}")
-        except LookupError:
-            nltk.download(name, quiet=True)
-    try:
-        nltk.data.find("corpora/stopwords")
-    except LookupError:
-        nltk.download("stopwords", quiet=True)
+@lru_cache(maxsize=None)
+def get_effective_stopwords() -> frozenset[str]:
+    """Stopwords minus negative words (for sentiment). Resolved once per process."""
+    return english_stopwords() - NEGATIVE_WORDS
 
 
-def get_effective_stopwords() -> Set[str]:
-    """Stopwords minus negative words (for sentiment)."""
-    _ensure_nltk_data()
-    sw = set(stopwords.words("english"))
-    return sw - NEGATIVE_WORDS
+_STATS_LINE_RE = re.compile(r"^[\d.\s%]+$")
 
 
 def clean_raw_whisper_text(text: str) -> str:
@@ -40,17 +34,74 @@ def clean_raw_whisper_text(text: str) -> str:
     lines = []
     for line in text.splitlines():
         line = line.strip()
-        if not line:
-            continue
-        # Skip lines that look like stats/probabilities
-        if re.match(r"^[\d.\s%]+$", line):
-            continue
-        if line.lower().startswith("probability") or "probability of" in line.lower():
-            continue
-        lines.append(line)
+        if line and not _is_whisper_artifact(line):
+            lines.append(line)
     return "\n".join(lines)
 
 
+def _is_whisper_artifact(line: str) -> bool:
+    """Stripped line that looks like stats/probabilities rather than speech."""
+    if _STATS_LINE_RE.match(line):
+        return True
+    lower = line.lower()
+    return lower.startswith("probability") or "probability of" in lower
+
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_DIGITS_RE = re.compile(r"\d+")
+_SPECIAL_RE = re.compile(r"[^a-z\s]")
+_SPACE_RE = re.compile(r"\s+")
+_LETTERS_RE = re.compile(r"[a-z]+")
+
+# The only word_tokenize rules that fire on text already reduced to [a-z\s]: NLTK's
+# MacIntyre contractions (NLTKWordTokenizer.CONTRACTIONS2), which split whole words.
+_TOKENIZER_SPLITS = {
+    "cannot": ("can", "not"),
+    "gimme": ("gim", "me"),
+    "gonna": ("gon", "na"),
+    "gotta": ("got", "ta"),
+    "lemme": ("lem", "me"),
+    "wanna": ("wan", "na"),
+}
+
+
+def _tokens_fast(text: str) -> list[str]:
+    """Single findall over [a-z]+ runs; same tokens as the reference path with remove_special."""
+    tokens = _LETTERS_RE.findall(text)
+    if _TOKENIZER_SPLITS.keys().isdisjoint(tokens):
+        return tokens
+    out: list[str] = []
+    for w in tokens:
+        split = _TOKENIZER_SPLITS.get(w)
+        if split is None:
+            out.append(w)
+        else:
+            out.extend(split)
+    return out
+
+
+def _tokens_reference(
+    text: str,
+    lowercase: bool = True,
+    remove_punct: bool = True,
+    remove_digits: bool = True,
+    remove_special: bool = True,
+) -> list[str]:
+    """Regex clean-up passes followed by NLTK word_tokenize."""
+    ensure_tokenizer()
+    t = text
+    if lowercase:
+        t = t.lower()
+    if remove_punct:
+        t = _PUNCT_RE.sub(" ", t)
+    if remove_digits:
+        t = _DIGITS_RE.sub(" ", t)
+    if remove_special:
+        t = _SPECIAL_RE.sub(" ", t)
+    t = _SPACE_RE.sub(" ", t).strip()
+    return word_tokenize(t)
+
+
 def preprocess_for_nlp(
     text: str,
     lowercase: bool = True,
@@ -63,28 +114,29 @@ def preprocess_for_nlp(
     """
     Clean and tokenize: lowercase, remove punctuation/digits/special, stopwords (keeping negatives).
     Returns space-joined tokens.
+
+    With remove_special (the default) only [a-z] runs survive cleaning, so tokens come from a
+    single regex pass instead of four substitutions plus word_tokenize; the output is the same.
     """
     if not isinstance(text, str) or not text.strip():
         return ""
-    _ensure_nltk_data()
-    if custom_stopwords is None:
+    if remove_stopwords and custom_stopwords is None:
         custom_stopwords = get_effective_stopwords()
+    flags = (lowercase, remove_punct, remove_digits, remove_special)
+    return " ".join(_tokens(text, flags, custom_stopwords if remove_stopwords else None))
 
-    t = text
-    if lowercase:
-        t = t.lower()
-    if remove_punct:
-        t = re.sub(r"[^\w\s]", " ", t)
-    if remove_digits:
-        t = re.sub(r"\d+", " ", t)
-    if remove_special:
-        t = re.sub(r"[^a-z\s]", " ", t)
-    t = re.sub(r"\s+", " ", t).strip()
 
-    tokens = word_tokenize(t)
-    if remove_stopwords:
-        tokens = [w for w in tokens if w not in custom_stopwords and len(w) > 1]
-    return " ".join(tokens)
+def _tokens(
+    text: str, flags: tuple[bool, bool, bool, bool], stopwords: Set[str] | None
+) -> list[str]:
+    lowercase, remove_punct, remove_digits, remove_special = flags
+    if remove_special:
+        tokens = _tokens_fast(text.lower() if lowercase else text)
+    else:
+        tokens = _tokens_reference(text, lowercase, remove_punct, remove_digits, remove_special)
+    if stopwords is not None:
+        tokens = [w for w in tokens if len(w) > 1 and w not in stopwords]
+    return tokens
 
 
 def preprocess_document(
@@ -98,6 +150,97 @@ def preprocess_document(
     return preprocess_for_nlp(raw_text, **preprocess_kw)
 
 
+def preprocess_stream(
+    lines: Iterable[str | Any],
+    clean_whisper: bool = True,
+    lowercase: bool = True,
+    remove_punct: bool = True,
+    remove_digits: bool = True,
+    remove_special: bool = True,
+    remove_stopwords: bool = True,
+    custom_stopwords: Set[str] | None = None,
+) -> Iterator[str]:
+    """
+    Streaming preprocess_document: takes lines (or Segments / anything with .text) and yields
+    tokens as each line is processed, so memory stays flat however long the transcript is.
+    Feed it a file object or transcribe_stream() directly; group the tokens with chunk_tokens.
+    """
+    if remove_stopwords and custom_stopwords is None:
+        custom_stopwords = get_effective_stopwords()
+    flags = (lowercase, remove_punct, remove_digits, remove_special)
+    stopwords = custom_stopwords if remove_stopwords else None
+    for item in lines:
+        text = item if isinstance(item, str) else item.text
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or (clean_whisper and _is_whisper_artifact(line)):
+                continue
+            yield from _tokens(line, flags, stopwords)
+
+
+def preprocess_to_document(
+    raw_text: str,
+    clean_whisper: bool = True,
+    vocab: Vocabulary | None = None,
+    **preprocess_kw: Any,
+) -> TokenDocument:
+    """
+    preprocess_document as a TokenDocument (token ids + offsets, text joined once), for
+    stages that chunk the tokens: pass it to sentiment_chunked, chunk_text, etc.
+    """
+    return TokenDocument.from_tokens(
+        preprocess_stream([raw_text], clean_whisper, **preprocess_kw), vocab
+    )
+
+
+def chunk_tokens(tokens: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """Group a token stream into space-joined chunks of chunk_size tokens (last may be shorter)."""
+    it = iter(tokens)
+    while chunk := list(islice(it, chunk_size)):
+        yield " ".join(chunk)
+
+
+_worker_kw: dict[str, Any] = {}
+
+
+def _init_corpus_worker(clean_whisper: bool, preprocess_kw: dict[str, Any]) -> None:
+    """Pool initializer: resolve the stopword set once per worker process."""
+    global _worker_kw  # noqa: PLW0603
+    kw = dict(preprocess_kw)
+    if kw.get("remove_stopwords", True) and kw.get("custom_stopwords") is None:
+        kw["custom_stopwords"] = get_effective_stopwords()
+    _worker_kw = {"clean_whisper": clean_whisper, **kw}
+
+
+def _preprocess_in_worker(text: str) -> str:
+    return preprocess_document(text, **_worker_kw)
+
+
+def preprocess_corpus(
+    texts: Iterable[str],
+    n_jobs: int | None = None,
+    chunksize: int = 16,
+    clean_whisper: bool = True,
+    **preprocess_kw: Any,
+) -> list[str]:
+    """
+    preprocess_document over many transcripts on a process pool (n_jobs workers, default all
+    CPUs), in input order. Texts are sent to workers in batches of chunksize to amortize IPC;
+    each worker resolves stopwords once. n_jobs=1 runs in-process.
+    """
+    texts = list(texts)
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, len(texts)))
+    if n_jobs == 1:
+        _init_corpus_worker(clean_whisper, preprocess_kw)
+        return [_preprocess_in_worker(t) for t in texts]
+    with ProcessPoolExecutor(
+        max_workers=n_jobs,
+        initializer=_init_corpus_worker,
+        initargs=(clean_whisper, preprocess_kw),
+    ) as pool:
+        return list(pool.map(_preprocess_in_worker, texts, chunksize=chunksize))
+
+
 def save_text(content: str, path: str | Path) -> Path:
     """Save string to file."""
     path = Path(path)
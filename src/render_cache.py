@@ -0,0 +1,131 @@
+"""Rendering layer for the topic plots: PNG bytes cached by input hash, rendered in parallel.
+
+render_topic_images renders the topic heatmap and one word cloud per topic. Each image is
+keyed by a fingerprint of exactly the data it is drawn from (doc-topic matrix, or one topic's
+words and weights), so moving the topic slider or rerunning the app re-renders only the images
+whose data changed. Misses are rendered concurrently on a thread pool: both renderers avoid
+pyplot's global state (standalone Figure / WordCloud.to_image), and PNG encoding and PIL
+drawing release the GIL. Every image reports its own render time.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from .config import RENDER_CACHE_MAX_MB, RENDER_WORKERS
+from .stage_cache import fingerprint
+from .topic_modeling import topic_heatmap_png, wordcloud_png
+
+
+class RenderTiming(NamedTuple):
+    image: str
+    seconds: float  # render time; 0.0 for a cache hit
+    cached: bool
+
+
+class TopicImages(NamedTuple):
+    heatmap: bytes
+    wordclouds: list[bytes]  # one per topic
+    timings: list[RenderTiming]  # heatmap first, then topics in order
+
+
+class RenderCache:
+    """PNG bytes by key, least recently used evicted beyond max_bytes. Thread-safe."""
+
+    def __init__(self, max_mb: float = RENDER_CACHE_MAX_MB) -> None:
+        self.max_bytes = max(0, int(max_mb * 2**20))
+        self._images: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            png = self._images.get(key)
+            if png is None:
+                self.misses += 1
+                return None
+            self._images.move_to_end(key)
+            self.hits += 1
+            return png
+
+    def put(self, key: str, png: bytes) -> None:
+        with self._lock:
+            if key in self._images:
+                self._size -= len(self._images.pop(key))
+            self._images[key] = png
+            self._size += len(png)
+            while self._size > self.max_bytes and self._images:
+                self._size -= len(self._images.popitem(last=False)[1])
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            return self._size
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._images)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._images.clear()
+            self._size = 0
+            self.hits = self.misses = 0
+
+
+def _render(kind: str, args: tuple) -> tuple[bytes, float]:
+    """(PNG, seconds) for one image; runs in a pool thread."""
+    t0 = time.perf_counter()
+    png = topic_heatmap_png(*args) if kind == "heatmap" else wordcloud_png(*args)
+    return png, time.perf_counter() - t0
+
+
+def render_topic_images(
+    doc_topic: np.ndarray,
+    top_words: Sequence[list[str]],
+    top_weights: Sequence[list[float]] | None = None,
+    cache: RenderCache | None = None,
+    n_jobs: int = RENDER_WORKERS,
+) -> TopicImages:
+    """
+    Heatmap and per-topic word clouds as PNG bytes (run_lsa's last three values). Cached
+    images are returned without rendering; the rest render on up to n_jobs threads
+    (n_jobs <= 1 renders in the calling thread).
+    """
+    weights = list(top_weights) if top_weights is not None else [None] * len(top_words)
+    # (image name, renderer kind, renderer args); the key hashes kind and args only
+    jobs: list[tuple[str, str, tuple[Any, ...]]] = [("heatmap", "heatmap", (doc_topic,))]
+    jobs += [
+        (f"topic {i + 1}", "wordcloud", (list(words), weights[i]))
+        for i, words in enumerate(top_words)
+    ]
+    pngs: list[bytes | None] = [None] * len(jobs)
+    timings: list[RenderTiming | None] = [None] * len(jobs)
+    keys = [fingerprint((kind, args)) for _, kind, args in jobs]
+    todo = []
+    for i, (name, _, _) in enumerate(jobs):
+        png = cache.get(keys[i]) if cache is not None else None
+        if png is None:
+            todo.append(i)
+        else:
+            pngs[i], timings[i] = png, RenderTiming(name, 0.0, True)
+
+    if n_jobs > 1 and len(todo) > 1:
+        with ThreadPoolExecutor(max_workers=min(n_jobs, len(todo))) as pool:
+            rendered = list(pool.map(lambda i: _render(*jobs[i][1:]), todo))
+    else:
+        rendered = [_render(*jobs[i][1:]) for i in todo]
+    for i, (png, seconds) in zip(todo, rendered):
+        pngs[i], timings[i] = png, RenderTiming(jobs[i][0], seconds, False)
+        if cache is not None:
+            cache.put(keys[i], png)
+    return TopicImages(pngs[0], pngs[1:], timings)
@@ -0,0 +1,110 @@
+"""Timestamped segment table: Whisper segments kept through the whole pipeline.
+
+Start/end times plus character offsets into the joined transcript and token offsets into the
+preprocessed token list, all in NumPy arrays. Any time range maps to a contiguous slice of
+both, so "sentiment for minutes 10-20" costs O(log n + range) instead of re-splitting and
+re-preprocessing the full transcript.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+
+from .preprocess import preprocess_document
+
+
+def _exclusive_cumsum(counts: np.ndarray) -> np.ndarray:
+    out = np.zeros(len(counts), dtype=np.int64)
+    np.cumsum(counts[:-1], out=out[1:])
+    return out
+
+
+class SegmentTable:
+    """
+    Segments sorted by time. text is the raw transcript (segment texts joined by a space),
+    tokens the preprocessed tokens of every segment in order; segment i covers
+    text[char_start[i]:char_end[i]] and tokens[token_start[i]:token_end[i]].
+    """
+
+    def __init__(
+        self, start: np.ndarray, end: np.ndarray, texts: list[str], token_lists: list[list[str]]
+    ) -> None:
+        self.start = np.asarray(start, dtype=np.float64)
+        self.end = np.asarray(end, dtype=np.float64)
+        # running max of end times: sorted even when segments overlap, for index_range
+        self._end_max = np.maximum.accumulate(self.end)
+        lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+        self.char_start = _exclusive_cumsum(lengths + 1)
+        self.char_end = self.char_start + lengths
+        counts = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=len(texts))
+        self.token_start = _exclusive_cumsum(counts)
+        self.token_end = self.token_start + counts
+        self.text = " ".join(texts)
+        self.tokens = [w for toks in token_lists for w in toks]
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Any], **preprocess_kw: Any) -> SegmentTable:
+        """
+        Build from Segment tuples or Whisper segment dicts ("start", "end", "text"),
+        preprocessing each segment's text once with preprocess_document(**preprocess_kw).
+        """
+        rows = []
+        for seg in segments:
+            if isinstance(seg, dict):
+                start, end, text = seg["start"], seg["end"], seg["text"]
+            else:
+                start, end, text = seg[0], seg[1], seg[2]
+            text = text.strip()
+            if text:
+                rows.append((float(start), float(end), text))
+        rows.sort(key=lambda r: r[0])
+        texts = [r[2] for r in rows]
+        token_lists = [preprocess_document(t, **preprocess_kw).split() for t in texts]
+        return cls(
+            np.array([r[0] for r in rows]), np.array([r[1] for r in rows]), texts, token_lists
+        )
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @property
+    def duration(self) -> float:
+        return float(self.end.max()) if len(self) else 0.0
+
+    @property
+    def preprocessed_text(self) -> str:
+        """Same tokens as preprocessing the whole transcript, joined by spaces."""
+        return " ".join(self.tokens)
+
+    def index_range(self, t0: float, t1: float) -> tuple[int, int]:
+        """Segments [i, j) overlapping the time range [t0, t1) seconds."""
+        i = int(np.searchsorted(self._end_max, t0, side="right"))
+        j = int(np.searchsorted(self.start, t1, side="left"))
+        return i, max(i, j)
+
+    def text_between(self, t0: float, t1: float) -> str:
+        i, j = self.index_range(t0, t1)
+        if i == j:
+            return ""
+        return self.text[self.char_start[i] : self.char_end[j - 1]]
+
+    def tokens_between(self, t0: float, t1: float) -> list[str]:
+        i, j = self.index_range(t0, t1)
+        if i == j:
+            return []
+        return self.tokens[self.token_start[i] : self.token_end[j - 1]]
+
+    def token_times(self, token_index: np.ndarray) -> np.ndarray:
+        """Start time (s) of the segment holding each index into tokens."""
+        token_index = np.asarray(token_index)
+        if not len(self):
+            return np.zeros(token_index.shape)
+        seg = np.searchsorted(self.token_end, token_index, side="right")
+        return self.start[np.minimum(seg, len(self) - 1)]
+
+    def preprocessed_between(self, t0: float, t1: float) -> str:
+        """Preprocessed text for a time range, ready for sentiment/topics."""
+        return " ".join(self.tokens_between(t0, t1))
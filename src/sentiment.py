@@ -3,12 +3,29 @@
 from __future__ import annotations
 
 import re
-from functools import lru_cache
+from collections.abc import Iterable, Iterator
+from itertools import islice
 from typing import Any, NamedTuple
 
+import numpy as np
 from textblob import TextBlob
 
-from .config import NEUTRAL_THRESHOLD, SENTIMENT_CHUNK_SIZE
+from .aho_corasick import AhoCorasick
+from .config import (
+    EMOTION_BACKEND,
+    EMOTION_BATCH_SIZE,
+    NEUTRAL_THRESHOLD,
+    SENTIMENT_CHUNK_SIZE,
+    SENTIMENT_ENGINE,
+    SENTIMENT_TIMELINE_STEP,
+    SENTIMENT_TIMELINE_WINDOW,
+)
+from .documents import TokenDocument
+from .models import ModelLoadError, get_registry
+from .preprocess import chunk_tokens
+from .sentiment_engine import get_lexicon_engine
+
+_SCORE_BATCH = 512  # chunks per lexicon-engine pass (bounds memory on token streams)
 
 
 class SentimentResult(NamedTuple):
@@ -17,34 +34,55 @@ class SentimentResult(NamedTuple):
     label: str  # positive | negative | neutral
 
 
-def chunk_text(text: str, chunk_size: int = SENTIMENT_CHUNK_SIZE) -> list[str]:
-    """Split text into ~chunk_size word chunks."""
-    words = text.split()
-    chunks = []
-    for i in range(0, len(words), chunk_size):
-        chunks.append(" ".join(words[i : i + chunk_size]))
-    return [c for c in chunks if c.strip()]
+def chunk_text(
+    text: str | Iterable[str] | TokenDocument, chunk_size: int = SENTIMENT_CHUNK_SIZE
+) -> list[str]:
+    """Split text (or a token stream, e.g. preprocess_stream) into ~chunk_size word chunks."""
+    if isinstance(text, TokenDocument):
+        return [c.text for c in text.iter_chunks(chunk_size)]
+    words = text.split() if isinstance(text, str) else text
+    return list(chunk_tokens(words, chunk_size))
 
 
-def sentiment_chunked(
-    text: str, chunk_size: int = SENTIMENT_CHUNK_SIZE, neutral_threshold: float = NEUTRAL_THRESHOLD
-) -> SentimentResult:
+def _chunks(
+    text: str | Iterable[str] | TokenDocument, chunk_size: int
+) -> Iterable[str | TokenDocument]:
+    if isinstance(text, TokenDocument):
+        return text.iter_chunks(chunk_size)
+    if isinstance(text, str):
+        return chunk_tokens(text.split(), chunk_size)
+    return chunk_tokens(text, chunk_size)
+
+
+def score_chunks(chunks: Iterable[str | TokenDocument]) -> Iterator[tuple[float, float]]:
     """
-    Chunk-based sentiment with TextBlob; average polarity; classify by threshold.
+    (polarity, subjectivity) per chunk, same values as TextBlob(chunk).sentiment. The
+    lexicon engine scores _SCORE_BATCH chunks per pass; SENTIMENT_ENGINE=textblob builds a
+    TextBlob per chunk instead.
     """
-    if not text or not text.strip():
-        return SentimentResult(0.0, 0.0, "neutral")
-    chunks = chunk_text(text, chunk_size)
-    if not chunks:
+    if SENTIMENT_ENGINE == "textblob":
+        for c in chunks:
+            sentiment = TextBlob(str(c)).sentiment
+            yield sentiment.polarity, sentiment.subjectivity
+        return
+    engine = get_lexicon_engine()
+    it = iter(chunks)
+    while batch := list(islice(it, _SCORE_BATCH)):
+        yield from map(tuple, engine.score(batch).tolist())
+
+
+def _aggregate(scores: Iterable[tuple[float, float]], neutral_threshold: float) -> SentimentResult:
+    """Average chunk scores; classify by threshold."""
+    n = 0
+    pol_sum = subj_sum = 0.0
+    for pol, subj in scores:
+        pol_sum += pol
+        subj_sum += subj
+        n += 1
+    if n == 0:
         return SentimentResult(0.0, 0.0, "neutral")
-    polarities = []
-    subjectivities = []
-    for c in chunks:
-        blob = TextBlob(c)
-        polarities.append(blob.sentiment.polarity)
-        subjectivities.append(blob.sentiment.subjectivity)
-    avg_pol = sum(polarities) / len(polarities)
-    avg_subj = sum(subjectivities) / len(subjectivities)
+    avg_pol = pol_sum / n
+    avg_subj = subj_sum / n
     if avg_pol > neutral_threshold:
         label = "positive"
     elif avg_pol < -neutral_threshold:
@@ -54,70 +92,169 @@ def sentiment_chunked(
     return SentimentResult(avg_pol, avg_subj, label)
 
 
+def sentiment_chunked(
+    text: str | Iterable[str] | TokenDocument,
+    chunk_size: int = SENTIMENT_CHUNK_SIZE,
+    neutral_threshold: float = NEUTRAL_THRESHOLD,
+) -> SentimentResult:
+    """
+    Chunk-based sentiment (TextBlob lexicon); average polarity; classify by threshold.
+    A token iterator (preprocess_stream) is consumed chunk by chunk without materializing it;
+    a TokenDocument is chunked into views without re-splitting.
+    """
+    if isinstance(text, str) and not text.strip():
+        return SentimentResult(0.0, 0.0, "neutral")
+    return _aggregate(score_chunks(_chunks(text, chunk_size)), neutral_threshold)
+
+
+def sentiment_chunked_many(
+    texts: Iterable[str | TokenDocument],
+    chunk_size: int = SENTIMENT_CHUNK_SIZE,
+    neutral_threshold: float = NEUTRAL_THRESHOLD,
+) -> list[SentimentResult]:
+    """sentiment_chunked for many transcripts, with all their chunks scored together."""
+    per_text = [list(_chunks(t, chunk_size)) for t in texts]
+    scores = list(score_chunks(c for chunks in per_text for c in chunks))
+    results = []
+    pos = 0
+    for chunks in per_text:
+        results.append(_aggregate(scores[pos : pos + len(chunks)], neutral_threshold))
+        pos += len(chunks)
+    return results
+
+
+class SentimentTimeline(NamedTuple):
+    start: np.ndarray  # first token of each window
+    end: np.ndarray  # one past the last token
+    polarity: np.ndarray
+    subjectivity: np.ndarray
+
+
+def sentiment_timeline(
+    text: str | TokenDocument,
+    window: int = SENTIMENT_TIMELINE_WINDOW,
+    step: int = SENTIMENT_TIMELINE_STEP,
+) -> SentimentTimeline:
+    """
+    Rolling sentiment over windows of `window` tokens every `step` tokens (the last window
+    ends at the last token). Takes preprocessed text or a TokenDocument. Every token is
+    scored once by the lexicon engine; window averages come from prefix sums over the
+    per-token assessments, so the cost is O(tokens + windows) whatever the overlap.
+    """
+    doc = text if isinstance(text, TokenDocument) else TokenDocument.from_text(text)
+    n = len(doc)
+    if n == 0:
+        empty = np.zeros(0)
+        return SentimentTimeline(empty.astype(np.int64), empty.astype(np.int64), empty, empty)
+    window, step = max(1, window), max(1, step)
+    pos, pol, subj = get_lexicon_engine().token_assessments(doc)
+    cum = np.zeros((3, n + 1))
+    cum[0, 1:] = np.cumsum(np.bincount(pos, minlength=n))
+    cum[1, 1:] = np.cumsum(np.bincount(pos, weights=pol, minlength=n))
+    cum[2, 1:] = np.cumsum(np.bincount(pos, weights=subj, minlength=n))
+    last = max(n - window, 0)
+    start = np.arange(0, last + 1, step)
+    if start[-1] != last:
+        start = np.append(start, last)
+    end = np.minimum(start + window, n)
+    count, pol_sum, subj_sum = cum[:, end] - cum[:, start]
+    denom = np.maximum(np.rint(count), 1)
+    return SentimentTimeline(start, end, pol_sum / denom, subj_sum / denom)
+
+
 def aspect_based_sentiment(text: str, aspects: list[str]) -> dict[str, float]:
     """
     For each aspect word, compute average polarity of sentences containing it.
     aspects: list of terms to score (e.g. from report: extracted aspects).
+    All aspects are matched in one Aho–Corasick pass per sentence (case-insensitive
+    substring match, as before) and each matched sentence is scored once.
     """
     if not text or not aspects:
         return {}
     # Simple sentence split
     sentences = re.split(r"[.!?]+", text)
     sentences = [s.strip() for s in sentences if s.strip()]
-    result = {}
-    for aspect in aspects:
-        aspect_lower = aspect.lower().strip()
-        pols = []
-        for sent in sentences:
-            if aspect_lower in sent.lower():
-                pols.append(TextBlob(sent).sentiment.polarity)
-        result[aspect] = sum(pols) / len(pols) if pols else 0.0
-    return result
-
-
-@lru_cache(maxsize=2)
-def _get_emotion_pipeline(model_name: str) -> Any | None:
-    """Cached emotion pipeline to avoid reloading on every call."""
+    matcher = AhoCorasick(a.lower().strip() for a in aspects)
+    hits = [(sent, matcher.matches(sent.lower())) for sent in sentences]
+    hits = [(sent, found) for sent, found in hits if found]
+    polarities = [p for p, _ in score_chunks(sent for sent, _ in hits)]
+    sums = [0.0] * len(aspects)
+    counts = [0] * len(aspects)
+    for (_, found), pol in zip(hits, polarities):
+        for i in found:
+            sums[i] += pol
+            counts[i] += 1
+    return {a: sums[i] / counts[i] if counts[i] else 0.0 for i, a in enumerate(aspects)}
+
+
+def emotion_model_key(model_name: str, backend: str = EMOTION_BACKEND) -> tuple[str, str]:
+    """Model-registry (kind, name) for an emotion model on backend torch | onnx | onnx-int8."""
+    if backend == "torch":
+        return "emotion", model_name
+    if backend == "onnx":
+        return "emotion-onnx", model_name
+    if backend == "onnx-int8":
+        return "emotion-onnx", model_name + "-int8"
+    raise ValueError(f"Unknown emotion backend: {backend!r} (torch, onnx, onnx-int8)")
+
+
+def _get_emotion_pipeline(
+    model_name: str, backend: str = EMOTION_BACKEND, raise_on_load_error: bool = False
+) -> Any | None:
+    """Emotion pipeline from the shared model registry; None if it can't be loaded (retried)."""
     try:
-        from transformers import pipeline
-        return pipeline("text-classification", model=model_name, top_k=None)
-    except Exception:
+        return get_registry().get(*emotion_model_key(model_name, backend))
+    except ModelLoadError:
+        if raise_on_load_error:
+            raise
         return None
 
 
+def _label_scores(out: Any) -> dict[str, float]:
+    """One chunk's pipeline output (a dict, a list of dicts, or [[dicts]]) as label -> score."""
+    while isinstance(out, list) and len(out) == 1 and isinstance(out[0], list):
+        out = out[0]
+    if isinstance(out, dict):
+        out = [out]
+    return {x["label"]: x["score"] for x in out or []}
+
+
+def emotion_chunks(text: str | TokenDocument, max_length: int = 512) -> list[str]:
+    """Non-empty chunks fed to the emotion model, in text order (cut to 512 characters)."""
+    return [c[:512] for c in chunk_text(text, chunk_size=max_length) if c.strip()]
+
+
 def get_emotions_transformers(
-    text: str,
+    text: str | TokenDocument,
     model_name: str = "j-hartmann/emotion-english-distilroberta-base",
     max_length: int = 512,
+    batch_size: int = EMOTION_BATCH_SIZE,
+    backend: str = EMOTION_BACKEND,
+    raise_on_load_error: bool = False,
 ) -> dict[str, float]:
     """
     Emotion scores using transformers pipeline.
     Returns dict emotion -> score (averaged over chunks if text is long).
+    Chunks run through the pipeline in batches of batch_size instead of one call each;
+    per-label means are taken over the chunks that report the label.
+    backend "onnx" / "onnx-int8" runs the same model on ONNX Runtime (src/emotion_onnx.py).
+    A model that can't be loaded gives {}, or raises ModelLoadError with raise_on_load_error
+    (so a memoizing caller does not keep the empty result).
     """
-    pipe = _get_emotion_pipeline(model_name)
+    pipe = _get_emotion_pipeline(model_name, backend, raise_on_load_error)
     if pipe is None:
         return {}
-    chunks = chunk_text(text, chunk_size=max_length)
+    chunks = emotion_chunks(text, max_length)
     if not chunks:
         return {}
-    all_scores = []
-    for c in chunks:
-        if not c.strip():
-            continue
-        out = pipe(c[:512], truncation=True, max_length=512)
-        if out and isinstance(out, list) and len(out) > 0:
-            item = out[0] if not isinstance(out[0], list) else out
-            if isinstance(item, list):
-                all_scores.append({x["label"]: x["score"] for x in item})
-            else:
-                all_scores.append({item["label"]: item["score"]})
-    if not all_scores:
+    outputs = pipe(chunks, batch_size=batch_size, truncation=True, max_length=512)
+    per_chunk = [_label_scores(out) for out in outputs]
+    labels = sorted({label for scores in per_chunk for label in scores})
+    if not labels:
         return {}
-    labels = set()
-    for s in all_scores:
-        labels.update(s.keys())
-    result = {}
-    for label in labels:
-        vals = [s.get(label, 0.0) for s in all_scores if label in s]
-        result[label] = sum(vals) / len(vals) if vals else 0.0
-    return result
+    col = {label: j for j, label in enumerate(labels)}
+    matrix = np.full((len(per_chunk), len(labels)), np.nan)
+    for i, scores in enumerate(per_chunk):
+        for label, score in scores.items():
+            matrix[i, col[label]] = score
+    return dict(zip(labels, np.nanmean(matrix, axis=0).tolist()))
@@ -0,0 +1,213 @@
+"""Lexicon sentiment engine: TextBlob's PatternAnalyzer compiled into arrays.
+
+The en-sentiment lexicon TextBlob uses (polarity, subjectivity, intensity per word, adverb
+modifiers, negations) is loaded once into NumPy arrays indexed by word id. Chunks are scored
+in one batch: token -> lexicon id is a single gather (free for TokenDocument ids), the
+modifier/negation rules run as one scan over integer arrays, and per-chunk averages come
+from np.bincount. Results match TextBlob(text).sentiment for word-only text (what
+preprocessing produces); text with punctuation, digits or emoticons, which TextBlob
+tokenizes and scores specially ("!" boosts, emoticons), is handed to TextBlob itself.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+from .documents import TokenDocument, Vocabulary
+
+NEGATIONS = ("no", "not", "n't", "never")
+
+
+class LexiconSentiment:
+    """Batched (polarity, subjectivity) scoring with PatternAnalyzer semantics."""
+
+    def __init__(self, lexicon: Any = None) -> None:
+        if lexicon is None:
+            from textblob.en import sentiment as lexicon  # noqa: PLC0415
+
+            len(lexicon)  # lazydict: loads en-sentiment.xml
+        self.negations = tuple(getattr(lexicon, "negations", NEGATIONS))
+        modifiers = tuple(getattr(lexicon, "modifiers", ("RB",)))
+        words = [w for w in dict.keys(lexicon) if w]
+        self.index = {w: i for i, w in enumerate(words)}
+        psi = np.array([dict.__getitem__(lexicon, w)[None] for w in words], dtype=np.float64)
+        psi = psi.reshape(-1, 3)
+        self.polarity, self.subjectivity, self.intensity = psi[:, 0], psi[:, 1], psi[:, 2]
+        self.is_modifier = np.array(
+            [any(m in dict.__getitem__(lexicon, w) for m in modifiers) for w in words], dtype=bool
+        )
+        # PatternAnalyzer's `modifier` callback: adverbs ending in -ly can absorb a negation
+        self.is_ly = np.array([w.endswith("ly") for w in words], dtype=bool)
+        self._scan_tables = (
+            self.polarity.tolist(),
+            self.subjectivity.tolist(),
+            self.intensity.tolist(),
+            self.is_modifier.tolist(),
+            self.is_ly.tolist(),
+        )
+        # Feature table per vocabulary, dropped with the vocabulary (the engine is shared)
+        self._vocab_tables: weakref.WeakKeyDictionary[Vocabulary, np.ndarray] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._tables_lock = threading.Lock()
+
+    def _features(self, words: Sequence[str]) -> np.ndarray:
+        """(n, 5) int array: lexicon id (-1 unknown), negation, len > 1, len > 2, alphabetic."""
+        index, negations = self.index, self.negations
+        rows = [
+            (index.get(w, -1), w in negations, len(w.strip("'")) > 1, len(w) > 2, w.isalpha())
+            for w in words
+        ]
+        return np.array(rows, dtype=np.int64).reshape(-1, 5)
+
+    def _vocab_features(self, vocab: Vocabulary) -> np.ndarray:
+        """Features per vocabulary id, extended as the vocabulary grows."""
+        with self._tables_lock:
+            table = self._vocab_tables.get(vocab)
+            if table is None:
+                table = np.empty((0, 5), dtype=np.int64)
+            n = len(vocab)
+            if len(table) < n:
+                table = np.concatenate([table, self._features(vocab.words[len(table) : n])])
+                self._vocab_tables[vocab] = table
+            return table
+
+    def _assessments(
+        self, feats: np.ndarray, chunk_of: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        PatternAnalyzer.assessments over all tokens: (chunk, token position, polarity,
+        subjectivity) arrays, one entry per assessment, positioned at its first token.
+        """
+        # Plain lists: indexing them in the loop is much cheaper than NumPy scalar access
+        pol, subj, inten, is_mod, is_ly = self._scan_tables
+        a_chunk: list[int] = []
+        a_pos: list[int] = []
+        a_p: list[float] = []
+        a_s: list[float] = []
+        a_neg: list[bool] = []
+        a_i = 1.0
+        # An unknown word of 3+ letters that is not a negation clears both the pending modifier
+        # and negation without producing an assessment, and so does a chunk boundary. Only the
+        # remaining "active" tokens (lexicon words, negations, 1-2 letter words) are scanned.
+        active = (feats[:, 0] >= 0) | (feats[:, 1] == 1) | (feats[:, 3] == 0)
+        pos = np.flatnonzero(active)
+        fresh = np.ones(len(pos), dtype=bool)
+        if len(pos) > 1:
+            fresh[1:] = (np.diff(pos) > 1) | (np.diff(chunk_of[pos]) != 0)
+        m = n = -1
+        rows = zip(feats[pos, :4].tolist(), chunk_of[pos].tolist(), fresh.tolist(), pos.tolist())
+        for (k, neg, long1, long2), c, reset, i in rows:
+            if reset:
+                m = n = -1
+            if k >= 0:
+                if m < 0:
+                    a_chunk.append(c)
+                    a_pos.append(i)
+                    a_p.append(pol[k])
+                    a_s.append(subj[k])
+                    a_neg.append(False)
+                else:  # "really good": scale by the modifier's intensity
+                    a_p[-1] = max(-1.0, min(pol[k] * a_i, 1.0))
+                    a_s[-1] = max(-1.0, min(subj[k] * a_i, 1.0))
+                a_i = inten[k]
+                if n >= 0:  # "not good"
+                    a_i = 1.0 / a_i
+                    a_neg[-1] = True
+                m = k if is_mod[k] else -1
+                n = k if neg else -1
+            else:  # negation or a 1-2 letter word
+                if neg:
+                    n = 0
+                elif n >= 0 and long1:  # negation survives only across 1-letter words
+                    n = -1
+                if n >= 0 and m >= 0 and is_ly[m]:  # "really not good"
+                    a_neg[-1] = True
+                    n = -1
+                elif m >= 0 and long2:  # modifier survives only across short words
+                    m = -1
+        p = np.array(a_p, dtype=np.float64)
+        p[np.array(a_neg, dtype=bool)] *= -0.5  # "not good" = slightly bad
+        return (
+            np.array(a_chunk, dtype=np.int64),
+            np.array(a_pos, dtype=np.int64),
+            p,
+            np.array(a_s, dtype=np.float64),
+        )
+
+    def _scan(self, feats: np.ndarray, chunk_of: np.ndarray, n_chunks: int) -> np.ndarray:
+        """Per-chunk (polarity, subjectivity) averages of the assessments; (n_chunks, 2)."""
+        idx, _, p, s = self._assessments(feats, chunk_of)
+        out = np.zeros((n_chunks, 2))
+        if len(idx):
+            denom = np.maximum(np.bincount(idx, minlength=n_chunks), 1)
+            out[:, 0] = np.bincount(idx, weights=p, minlength=n_chunks) / denom
+            out[:, 1] = np.bincount(idx, weights=s, minlength=n_chunks) / denom
+        return out
+
+    def token_assessments(self, doc: TokenDocument) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (token position, polarity, subjectivity) of every assessment in doc, scanned once as
+        a single chunk. Averaging the assessments that start inside a token range gives that
+        range's score, except for a modifier/negation whose pair straddles the range start.
+        """
+        feats = self._vocab_features(doc.vocab)[doc.ids]
+        _, pos, p, s = self._assessments(feats, np.zeros(len(feats), dtype=np.int64))
+        return pos, p, s
+
+    def score_documents(self, docs: Sequence[TokenDocument]) -> np.ndarray:
+        """(len(docs), 2) polarity/subjectivity for TokenDocuments or their chunk views."""
+        return self._score(docs, [d.text for d in docs])
+
+    def _score(self, docs: Sequence[TokenDocument], originals: Sequence[str]) -> np.ndarray:
+        """Scan word-only docs in one batch; the rest go to TextBlob with their original text."""
+        out = np.zeros((len(docs), 2))
+        fast: list[int] = []
+        feats: list[np.ndarray] = []
+        for j, doc in enumerate(docs):
+            f = self._vocab_features(doc.vocab)[doc.ids]
+            if f[:, 4].all():
+                fast.append(j)
+                feats.append(f)
+            else:
+                out[j] = _textblob_sentiment(originals[j])
+        if fast:
+            chunk_of = np.repeat(np.arange(len(fast)), [len(f) for f in feats])
+            out[fast] = self._scan(np.concatenate(feats), chunk_of, len(fast))
+        return out
+
+    def score(self, chunks: Sequence[str | TokenDocument]) -> np.ndarray:
+        """(len(chunks), 2) polarity/subjectivity for a mix of strings and TokenDocuments."""
+        out = np.zeros((len(chunks), 2))
+        docs = [j for j, c in enumerate(chunks) if isinstance(c, TokenDocument)]
+        texts = [j for j, c in enumerate(chunks) if not isinstance(c, TokenDocument)]
+        if docs:
+            out[docs] = self.score_documents([chunks[j] for j in docs])
+        if texts:
+            out[texts] = self.score_texts([chunks[j] for j in texts])
+        return out
+
+    def score_texts(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), 2) polarity/subjectivity; same values as TextBlob(text).sentiment."""
+        vocab = Vocabulary()  # per call: words of plain-string inputs are not kept around
+        docs = [TokenDocument.from_tokens(t.lower().split(), vocab) for t in texts]
+        return self._score(docs, texts)
+
+
+def _textblob_sentiment(text: str) -> tuple[float, float]:
+    from textblob import TextBlob  # noqa: PLC0415
+
+    s = TextBlob(text).sentiment
+    return s.polarity, s.subjectivity
+
+
+@lru_cache(maxsize=1)
+def get_lexicon_engine() -> LexiconSentiment:
+    """Process-wide engine (the lexicon is compiled on first use)."""
+    return LexiconSentiment()
@@ -0,0 +1,126 @@
+"""Stage-result memoization for the Streamlit app (which reruns app.py on every interaction).
+
+Each pipeline stage is run through StageCache.run(stage, fn, *inputs, **params). Its key is a
+hash of the stage name, the inputs and the params; an input that is itself a StageResult
+contributes its key instead of its data, so keys chain like a Merkle tree: a stage is
+recomputed only when something upstream of it changed, and downstream stages never rehash
+large intermediate results. Hits and misses are counted per stage.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from .config import STAGE_CACHE_MAX_ENTRIES
+from .documents import TokenDocument
+from .segments import SegmentTable
+
+
+class StageResult(NamedTuple):
+    stage: str
+    key: str
+    value: Any
+    hit: bool
+
+
+class StageStats(NamedTuple):
+    stage: str
+    hits: int
+    misses: int
+    compute_seconds: float  # total time spent in misses
+
+
+def _update(h: Any, obj: Any) -> None:
+    """Feed a type-tagged encoding of obj into hash h."""
+    if isinstance(obj, StageResult):
+        h.update(b"K" + obj.key.encode())
+    elif obj is None or isinstance(obj, (bool, int, float)):
+        h.update(b"P" + repr(obj).encode() + b"\0")
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8", "surrogatepass")
+        h.update(b"S%d:" % len(data) + data)
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        h.update(b"B%d:" % len(obj) + bytes(obj))
+    elif isinstance(obj, np.ndarray):
+        h.update(f"A{obj.dtype.str}{obj.shape}:".encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, TokenDocument):
+        h.update(b"D")
+        _update(h, obj.text)
+    elif isinstance(obj, SegmentTable):
+        h.update(b"T")
+        for part in (obj.start, obj.end, obj.text):
+            _update(h, part)
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"L%d:" % len(obj))
+        for item in obj:
+            _update(h, item)
+    elif isinstance(obj, dict):
+        h.update(b"M%d:" % len(obj))
+        for k in sorted(obj, key=repr):
+            _update(h, k)
+            _update(h, obj[k])
+    else:
+        raise TypeError(f"Cannot fingerprint {type(obj).__name__}; pass data or a StageResult")
+
+
+def fingerprint(obj: Any) -> str:
+    """Content hash of stage inputs (strings, arrays, documents, containers, StageResults)."""
+    h = hashlib.blake2b(digest_size=16)
+    _update(h, obj)
+    return h.hexdigest()
+
+
+class StageCache:
+    """
+    Results keyed by (stage, inputs, params), least recently used evicted beyond max_entries.
+    Thread-safe; a stage that raises is not cached.
+    """
+
+    def __init__(self, max_entries: int = STAGE_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max(1, max_entries)
+        self._results: OrderedDict[str, Any] = OrderedDict()
+        self._counts: dict[str, list[float]] = {}  # stage -> [hits, misses, compute seconds]
+        self._lock = threading.RLock()
+
+    def run(self, stage: str, fn: Callable[..., Any], *inputs: Any, **params: Any) -> StageResult:
+        """fn(*inputs, **params), with StageResult inputs replaced by their values."""
+        key = fingerprint((stage, inputs, params))
+        with self._lock:
+            counts = self._counts.setdefault(stage, [0, 0, 0.0])
+            if key in self._results:
+                self._results.move_to_end(key)
+                counts[0] += 1
+                return StageResult(stage, key, self._results[key], True)
+        args = [x.value if isinstance(x, StageResult) else x for x in inputs]
+        t0 = time.perf_counter()
+        value = fn(*args, **params)
+        elapsed = time.perf_counter() - t0
+        with self._lock:
+            counts[1] += 1
+            counts[2] += elapsed
+            self._results[key] = value
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return StageResult(stage, key, value, False)
+
+    def stats(self) -> list[StageStats]:
+        """Hit/miss counters per stage, in first-run order."""
+        with self._lock:
+            return [StageStats(s, int(h), int(m), t) for s, (h, m, t) in self._counts.items()]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._counts.clear()
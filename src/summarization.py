@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
-from functools import lru_cache
 from typing import Any
 
 from .config import SUMMARY_CHUNK_SIZE, SUMMARY_MAX_LENGTH, SUMMARY_MIN_LENGTH, SUMMARY_MODEL
+from .documents import TokenDocument
+from .models import ModelLoadError, get_registry
 
 
-def chunk_for_summary(text: str, chunk_size: int = SUMMARY_CHUNK_SIZE) -> list[str]:
-    """Split by ~chunk_size words so model can process."""
+def chunk_for_summary(text: str | TokenDocument, chunk_size: int = SUMMARY_CHUNK_SIZE) -> list[str]:
+    """Split by ~chunk_size words so model can process (TokenDocument: chunk views)."""
+    if isinstance(text, TokenDocument):
+        return [c.text for c in text.iter_chunks(chunk_size)]
     words = text.split()
     chunks = []
     for i in range(0, len(words), chunk_size):
@@ -18,19 +21,22 @@ def chunk_for_summary(text: str, chunk_size: int = SUMMARY_CHUNK_SIZE) -> list[s
 
 
 def summarize_with_t5(
-    text: str,
+    text: str | TokenDocument,
     model_name: str = SUMMARY_MODEL,
     max_length: int = SUMMARY_MAX_LENGTH,
     min_length: int = SUMMARY_MIN_LENGTH,
     chunk_size: int = SUMMARY_CHUNK_SIZE,
+    raise_on_load_error: bool = False,
 ) -> str:
     """
     Summarize long text by chunking, summarizing each chunk, then joining.
+    A model that can't be loaded gives "[Model load error: ...]", or raises ModelLoadError
+    with raise_on_load_error (so a memoizing caller does not keep the error string).
     """
     chunks = chunk_for_summary(text, chunk_size)
     if not chunks:
         return ""
-    pipe = _get_summarization_pipeline(model_name)
+    pipe = _get_summarization_pipeline(model_name, raise_on_load_error)
     if isinstance(pipe, str):
         return pipe  # error message
     summaries = []
@@ -44,27 +50,25 @@ def summarize_with_t5(
     return " ".join(summaries).strip()
 
 
-@lru_cache(maxsize=1)
-def _get_summarization_pipeline(model_name: str) -> Any:
-    """Cached summarization pipeline to avoid reloading on every call."""
+def _get_summarization_pipeline(model_name: str, raise_on_load_error: bool = False) -> Any:
+    """Summarization pipeline from the shared model registry (load errors are not cached)."""
     try:
-        from transformers import pipeline
-        return pipeline("summarization", model=model_name)
-    except Exception as e:
-        return f"[Model load error: {e}]"
+        return get_registry().get("summarization", model_name)
+    except ModelLoadError as e:
+        if raise_on_load_error:
+            raise
+        return f"[Model load error: {e.__cause__ or e}]"
 
 
 def bleu_score(reference: str, candidate: str) -> float:
     """BLEU between reference and candidate (sentence level)."""
     try:
-        import nltk
         from nltk.tokenize import word_tokenize
         from nltk.translate.bleu_score import sentence_bleu
 
-        try:
-            nltk.data.find("tokenizers/punkt")
-        except LookupError:
-            nltk.download("punkt", quiet=True)
+        from .nltk_resources import ensure_tokenizer
+
+        ensure_tokenizer()
         ref_tokens = [word_tokenize(reference)]
         can_tokens = word_tokenize(candidate)
         return float(sentence_bleu(ref_tokens, can_tokens))
@@ -2,28 +2,89 @@
 
 from __future__ import annotations
 
+import copy
+from collections.abc import Iterable
+from functools import lru_cache
 from io import BytesIO
 from typing import Any
 
 import matplotlib
 
 matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
+from matplotlib.figure import Figure
 from sklearn.decomposition import TruncatedSVD
 from sklearn.feature_extraction.text import TfidfVectorizer
 
-from .config import N_TOPICS, TOPIC_CHUNK_SIZE
+from .config import LSA_MAX_TOPICS, N_TOPICS, TOPIC_CHUNK_SIZE
+from .documents import TokenDocument
+from .preprocess import chunk_tokens
 
 
-def chunk_text(text: str, chunk_size: int = TOPIC_CHUNK_SIZE) -> list[str]:
-    """Split text into ~chunk_size word chunks (documents for LSA)."""
-    words = text.split()
-    chunks = []
-    for i in range(0, len(words), chunk_size):
-        chunks.append(" ".join(words[i : i + chunk_size]))
-    return [c for c in chunks if c.strip()]
+def chunk_text(
+    text: str | Iterable[str] | TokenDocument, chunk_size: int = TOPIC_CHUNK_SIZE
+) -> list[str]:
+    """Split text (or a token stream, e.g. preprocess_stream) into ~chunk_size word documents."""
+    if isinstance(text, TokenDocument):
+        return [c.text for c in text.iter_chunks(chunk_size)]
+    words = text.split() if isinstance(text, str) else text
+    return list(chunk_tokens(words, chunk_size))
+
+
+@lru_cache(maxsize=8)
+def _fit_lsa(
+    documents: tuple[str, ...], max_topics: int, max_features: int, min_df: int, max_df: float
+) -> tuple[Any, Any, np.ndarray, np.ndarray]:
+    """
+    TF-IDF + TruncatedSVD at max_topics components (at most one per vocabulary term);
+    (vectorizer, svd, doc_topic, terms).
+    The result is shared by every caller, so its arrays are made read-only.
+    """
+    vectorizer = TfidfVectorizer(
+        max_features=max_features, min_df=min_df, max_df=max_df, stop_words="english"
+    )
+    X = vectorizer.fit_transform(documents)
+    svd = TruncatedSVD(n_components=max(1, min(max_topics, X.shape[1])), random_state=42)
+    doc_topic = svd.fit_transform(X)
+    terms = vectorizer.get_feature_names_out()
+    for arr in (doc_topic, terms, *(getattr(svd, a) for a in _SVD_ARRAYS)):
+        arr.flags.writeable = False
+    return vectorizer, svd, doc_topic, terms
+
+
+_SVD_ARRAYS = (
+    "components_",
+    "explained_variance_",
+    "explained_variance_ratio_",
+    "singular_values_",
+)
+
+
+def _slice_svd(svd: Any, k: int) -> Any:
+    """
+    Copy of a fitted TruncatedSVD keeping its first k components (transform still works).
+    The arrays are read-only views of the cached fit; refitting the copy leaves it intact.
+    """
+    out = copy.copy(svd)
+    out.n_components = k
+    for attr in _SVD_ARRAYS:
+        setattr(out, attr, getattr(svd, attr)[:k])
+    return out
+
+
+def _top_terms(
+    components: np.ndarray, terms: np.ndarray, n_words: int = 15
+) -> tuple[list[list[str]], list[list[float]]]:
+    """Top n_words terms per component, by weight: argpartition, then sort only those."""
+    k = min(n_words, components.shape[1])
+    top_words, top_weights = [], []
+    for comp in components:
+        top = np.argpartition(-comp, k - 1)[:k]
+        top = top[np.argsort(-comp[top], kind="stable")]
+        top_words.append(terms[top].tolist())
+        top_weights.append(comp[top].astype(float).tolist())
+    return top_words, top_weights
 
 
 def run_lsa(
@@ -32,34 +93,73 @@ def run_lsa(
     max_features: int = 2000,
     min_df: int = 1,
     max_df: float = 0.95,
+    max_topics: int = LSA_MAX_TOPICS,
 ) -> tuple[Any, Any, np.ndarray, list[list[str]], list[list[float]]]:
     """
     LSA: TfidfVectorizer + TruncatedSVD.
     Returns: vectorizer, svd, doc_topic matrix, top words per topic, top weights per topic.
+
+    SVD components are ordered by singular value, so the decomposition is fitted once at
+    max_topics (cached per document set) and any smaller n_topics is a slice of it: changing
+    n_topics does not re-vectorize or refit. The vectorizer and svd returned are copies, free
+    to refit without touching the cache.
     """
     if not documents:
         return None, None, np.array([]), [], []
-    n_topics = max(1, min(n_topics, len(documents), max_features))
-    vectorizer = TfidfVectorizer(
-        max_features=max_features, min_df=min_df, max_df=max_df, stop_words="english"
+    vectorizer, svd, doc_topic, terms = _fit_lsa(
+        tuple(documents),
+        max(1, min(max(n_topics, max_topics), len(documents), max_features)),
+        max_features,
+        min_df,
+        max_df,
+    )
+    k = max(1, min(n_topics, svd.n_components))
+    top_words, top_weights = _top_terms(svd.components_[:k], terms)
+    return (
+        copy.deepcopy(vectorizer),
+        _slice_svd(svd, k),
+        doc_topic[:, :k].copy(),
+        top_words,
+        top_weights,
     )
-    X = vectorizer.fit_transform(documents)
-    svd = TruncatedSVD(n_components=n_topics, random_state=42)
-    doc_topic = svd.fit_transform(X)
-    feature_names = vectorizer.get_feature_names_out()
-    top_words_per_topic = []
-    top_weights_per_topic = []
-    for i in range(n_topics):
-        comp = svd.components_[i]
-        top_idx = np.argsort(comp)[::-1][:15]
-        top_words_per_topic.append([feature_names[j] for j in top_idx])
-        top_weights_per_topic.append([float(comp[j]) for j in top_idx])
-    return vectorizer, svd, doc_topic, top_words_per_topic, top_weights_per_topic
 
 
-def topic_heatmap(doc_topic: np.ndarray, n_docs_show: int = 20) -> BytesIO:
-    """Heatmap of topic distribution across documents."""
-    fig, ax = plt.subplots(figsize=(10, max(4, min(12, doc_topic.shape[0] * 0.3))))
+def lsa_explained_variance(
+    documents: list[str],
+    max_topics: int = LSA_MAX_TOPICS,
+    max_features: int = 2000,
+    min_df: int = 1,
+    max_df: float = 0.95,
+) -> np.ndarray:
+    """
+    Cumulative explained variance ratio for k = 1..max_topics topics (entry k-1), from the
+    same cached fit as run_lsa, to pick a topic count from the data.
+    """
+    if not documents:
+        return np.array([])
+    _, svd, _, _ = _fit_lsa(
+        tuple(documents),
+        max(1, min(max_topics, len(documents), max_features)),
+        max_features,
+        min_df,
+        max_df,
+    )
+    return np.cumsum(svd.explained_variance_ratio_)
+
+
+def _figure_png(fig: Figure) -> bytes:
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=100, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def topic_heatmap_png(doc_topic: np.ndarray, n_docs_show: int = 20) -> bytes:
+    """
+    PNG of the topic heatmap. Drawn on a standalone Figure (no pyplot state), so several
+    images can render concurrently in threads.
+    """
+    fig = Figure(figsize=(10, max(4, min(12, doc_topic.shape[0] * 0.3))))
+    ax = fig.subplots()
     n_show = min(n_docs_show, doc_topic.shape[0])
     data = doc_topic[:n_show]
     sns.heatmap(
@@ -71,37 +171,40 @@ def topic_heatmap(doc_topic: np.ndarray, n_docs_show: int = 20) -> BytesIO:
     )
     ax.set_xlabel("Document chunk")
     ax.set_ylabel("Topic")
-    buf = BytesIO()
     fig.tight_layout()
-    fig.savefig(buf, format="png", dpi=100, bbox_inches="tight")
-    plt.close(fig)
-    buf.seek(0)
-    return buf
+    return _figure_png(fig)
 
 
-def wordcloud_for_topic(words: list[str], weights: list[float] | None = None) -> BytesIO:
-    """Word cloud for one topic (word list; optional weights)."""
+def topic_heatmap(doc_topic: np.ndarray, n_docs_show: int = 20) -> BytesIO:
+    """Heatmap of topic distribution across documents."""
+    return BytesIO(topic_heatmap_png(doc_topic, n_docs_show))
+
+
+def wordcloud_png(
+    words: list[str], weights: list[float] | None = None, width: int = 400, height: int = 200
+) -> bytes:
+    """
+    PNG of one topic's word cloud, encoded straight from WordCloud.to_image() (the cloud is
+    already a raster; no matplotlib round-trip). Layout is seeded, so equal input gives
+    equal bytes.
+    """
     try:
         from wordcloud import WordCloud
     except ImportError:
-        fig, ax = plt.subplots(figsize=(6, 4))
-        ax.text(0.5, 0.5, "wordcloud not available", ha="center", va="center")
-        buf = BytesIO()
-        fig.savefig(buf, format="png")
-        plt.close(fig)
-        buf.seek(0)
-        return buf
+        fig = Figure(figsize=(6, 4))
+        fig.text(0.5, 0.5, "wordcloud not available", ha="center", va="center")
+        return _figure_png(fig)
     if weights and len(weights) == len(words):
-        freq = dict(zip(words, weights))
+        # LSA weights can be negative; WordCloud needs positive frequencies
+        freq = {w: max(float(x), 1e-6) for w, x in zip(words, weights)}
     else:
         freq = {w: 1 for w in words}
-    wc = WordCloud(width=400, height=200, background_color="white").generate_from_frequencies(freq)
-    fig, ax = plt.subplots(figsize=(8, 4))
-    ax.imshow(wc, interpolation="bilinear")
-    ax.axis("off")
+    wc = WordCloud(width=width, height=height, background_color="white", random_state=42)
     buf = BytesIO()
-    fig.tight_layout()
-    fig.savefig(buf, format="png", dpi=100, bbox_inches="tight")
-    plt.close(fig)
-    buf.seek(0)
-    return buf
+    wc.generate_from_frequencies(freq).to_image().save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def wordcloud_for_topic(words: list[str], weights: list[float] | None = None) -> BytesIO:
+    """Word cloud for one topic (word list; optional weights)."""
+    return BytesIO(wordcloud_png(words, weights))
@@ -2,13 +2,39 @@
 
 from __future__ import annotations
 
+import argparse
+import json
 import os
 import shutil
+import subprocess
+import sys
 import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
-from .config import WHISPER_MODEL
+import numpy as np
+
+from .cache import (
+    AudioCache,
+    TranscriptCache,
+    audio_digest,
+    default_audio_cache,
+    default_transcript_cache,
+)
+from .config import (
+    CASCADE_ACCURATE_MODEL,
+    CASCADE_COMPRESSION_RATIO_THRESHOLD,
+    CASCADE_FAST_MODEL,
+    CASCADE_LOGPROB_THRESHOLD,
+    LONG_AUDIO_OVERLAP_S,
+    LONG_AUDIO_SEARCH_S,
+    LONG_AUDIO_WINDOW_S,
+    TRANSCRIBE_WORKERS,
+    WHISPER_MODEL,
+)
+from .logger import get_logger
 
 # Fallback message when ffmpeg cannot be provided (no system, no bundle)
 FFMPEG_REQUIRED_MSG = (
@@ -16,6 +42,19 @@ FFMPEG_REQUIRED_MSG = (
     "pip install imageio-ffmpeg  (bundled), or install ffmpeg and add to PATH."
 )
 
+# Decode options passed to model.transcribe; part of the transcript cache key
+DECODE_OPTIONS: dict[str, Any] = {"fp16": False}
+
+# Model-name suffix selecting the int8 dynamically quantized CPU variant (e.g. "base-int8")
+INT8_SUFFIX = "-int8"
+
+# Whisper's input format: 16 kHz mono float32 in [-1, 1]
+SAMPLE_RATE = 16000
+# Whisper decodes 30 s of audio per forward pass; transcribe_stream yields once per window
+WINDOW_SECONDS = 30
+# Characters of previous text fed back as initial_prompt for the next window
+_PROMPT_CHARS = 200
+
 _ffmpeg_path_ensured = False
 
 
@@ -74,10 +113,227 @@ def check_ffmpeg_available() -> None:
         raise FileNotFoundError(FFMPEG_REQUIRED_MSG)
 
 
-def load_whisper_model(model_name: str = WHISPER_MODEL) -> Any:
-    """Load Whisper model (tiny/base/small/medium/large). Lazy-import for fast startup."""
+def load_whisper_model(model_name: str = WHISPER_MODEL, quantize: bool = False) -> Any:
+    """
+    Load Whisper model (tiny/base/small/medium/large). Lazy-import for fast startup.
+    quantize=True, or a name ending in "-int8" (e.g. "small-int8"), loads on CPU and applies
+    int8 dynamic quantization to the linear layers (see quantize_whisper).
+    """
     import whisper  # noqa: PLC0415  # lazy to reduce initial load time
-    return whisper.load_model(model_name)
+
+    if model_name.endswith(INT8_SUFFIX):
+        model_name, quantize = model_name[: -len(INT8_SUFFIX)], True
+    if not quantize:
+        return whisper.load_model(model_name)
+    return quantize_whisper(whisper.load_model(model_name, device="cpu"))
+
+
+def quantize_whisper(model: Any) -> Any:
+    """
+    int8 dynamic quantization of all linear layers (weights int8, activations quantized on
+    the fly); convolutions and the output projection stay fp32. CPU only.
+    """
+    import torch  # noqa: PLC0415
+
+    # Whisper's Linear subclass only adds dtype casting for fp16; quantize_dynamic matches
+    # exact types, so turn them back into plain nn.Linear first.
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear):
+            module.__class__ = torch.nn.Linear
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """WER = word-level edit distance / reference length (case and punctuation ignored)."""
+    ref = [w for w in (_norm_word(w) for w in reference.split()) if w]
+    hyp = [w for w in (_norm_word(w) for w in hypothesis.split()) if w]
+    if not ref:
+        return float(bool(hyp))
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i]
+        for j, h in enumerate(hyp, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h)))
+        prev = cur
+    return prev[-1] / len(ref)
+
+
+def _ffmpeg_decode(source: str, data: bytes | None, sr: int) -> np.ndarray:
+    cmd = ["ffmpeg", "-nostdin", "-threads", "0", "-i", source]
+    cmd += ["-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sr), "-"]
+    if data is not None:
+        cmd.remove("-nostdin")
+    out = subprocess.run(cmd, input=data, capture_output=True, check=True).stdout
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+
+def decode_audio_bytes(data: bytes, sr: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    Decode encoded audio bytes (mp3, wav, ...) to mono float32 PCM at sr, piping them into
+    ffmpeg's stdin instead of writing a temp file. Containers that need a seekable input
+    (e.g. m4a with the index at the end) fall back to a temp file.
+    """
+    check_ffmpeg_available()
+    try:
+        return _ffmpeg_decode("pipe:0", data, sr)
+    except subprocess.CalledProcessError:
+        pass
+    fd, tmp_path = tempfile.mkstemp(prefix="whisper_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return _ffmpeg_decode(tmp_path, None, sr)
+    except subprocess.CalledProcessError as e:
+        raise _decode_error(e) from e
+    finally:
+        Path(tmp_path).unlink(missing_ok=True)
+
+
+def decode_audio_file(path: str | Path, sr: int = SAMPLE_RATE) -> np.ndarray:
+    """Decode an audio file to mono float32 PCM at sr."""
+    check_ffmpeg_available()
+    try:
+        return _ffmpeg_decode(str(path), None, sr)
+    except subprocess.CalledProcessError as e:
+        raise _decode_error(e) from e
+
+
+def _decode_error(e: subprocess.CalledProcessError) -> RuntimeError:
+    err = (e.stderr or b"").decode(errors="replace").strip().splitlines()
+    return RuntimeError(f"Failed to decode audio: {err[-1] if err else e}")
+
+
+def load_audio(
+    audio: str | Path | bytes | np.ndarray, audio_cache: AudioCache | None = None
+) -> np.ndarray:
+    """
+    16 kHz float32 samples from a path, encoded bytes or an already decoded array.
+    With an audio cache, decoded PCM is stored once per content and later calls get a
+    memory-mapped array without running ffmpeg.
+    """
+    if isinstance(audio, np.ndarray):
+        return audio
+    if not isinstance(audio, bytes):
+        audio = Path(audio).resolve()
+        if not audio.is_file():
+            raise FileNotFoundError(f"Audio file not found: {audio}")
+    key = AudioCache.make_key(audio_digest(audio), SAMPLE_RATE) if audio_cache else None
+    if key is not None and (cached := audio_cache.get(key)) is not None:
+        return cached
+    if isinstance(audio, bytes):
+        samples = decode_audio_bytes(audio)
+    else:
+        samples = decode_audio_file(audio)
+    if key is not None:
+        audio_cache.put(key, samples)
+    return samples
+
+
+class Segment(NamedTuple):
+    start: float  # seconds from the start of the recording
+    end: float
+    text: str
+
+
+def _run_whisper(
+    model: Any, audio: str | np.ndarray, language: str | None
+) -> tuple[str, list[Segment]]:
+    result = model.transcribe(audio, language=language, **DECODE_OPTIONS)
+    segments = [
+        Segment(s["start"], s["end"], s["text"].strip())
+        for s in result.get("segments") or []
+        if s["text"].strip()
+    ]
+    return (result.get("text") or "").strip(), segments
+
+
+def _cache_entry(text: str, segments: list[Segment]) -> dict:
+    return {"text": text, "segments": [list(s) for s in segments]}
+
+
+def transcribe_stream(
+    audio: str | Path | bytes | np.ndarray,
+    model: Any = None,
+    model_name: str = WHISPER_MODEL,
+    language: str | None = None,
+    progress: Callable[[float, float], None] | None = None,
+    audio_cache: AudioCache | None = None,
+) -> Iterator[Segment]:
+    """
+    Transcribe window by window (WINDOW_SECONDS each), yielding timestamped segments as soon
+    as each window is decoded. progress(done_seconds, total_seconds) is called after every
+    window. Like Whisper's own seek loop, a window's trailing segment is re-decoded as part of
+    the next window so words cut at the boundary are not lost; the previous text is passed
+    as initial_prompt to keep context across windows.
+    """
+    samples = load_audio(audio, audio_cache)
+    if model is None:
+        model = load_whisper_model(model_name)
+    n = len(samples)
+    total = n / SAMPLE_RATE
+    window = WINDOW_SECONDS * SAMPLE_RATE
+    seek = 0
+    prompt: str | None = None
+    while seek < n:
+        chunk = samples[seek : seek + window]
+        result = model.transcribe(chunk, language=language, initial_prompt=prompt, **DECODE_OPTIONS)
+        segs = result.get("segments") or []
+        advance = len(chunk)
+        if seek + window < n and len(segs) > 1:
+            cut = int(segs[-1]["start"] * SAMPLE_RATE)
+            if 0 < cut < advance:
+                segs, advance = segs[:-1], cut
+        offset = seek / SAMPLE_RATE
+        texts = []
+        for s in segs:
+            text = s["text"].strip()
+            if text:
+                texts.append(text)
+                end = offset + min(s["end"], advance / SAMPLE_RATE)
+                yield Segment(offset + s["start"], end, text)
+        language = language or result.get("language")  # keep the detected language fixed
+        prompt = " ".join(texts)[-_PROMPT_CHARS:] or prompt
+        seek += advance
+        if progress is not None:
+            progress(min(seek, n) / SAMPLE_RATE, total)
+
+
+def _cache_key(
+    audio: bytes | str | Path, model_name: str, language: str | None, streamed: bool = False
+) -> str:
+    # Windowed decoding can differ slightly from one-shot, so it gets its own entries
+    options = {**DECODE_OPTIONS, "window_s": WINDOW_SECONDS} if streamed else DECODE_OPTIONS
+    return TranscriptCache.make_key(audio_digest(audio), model_name, language, options)
+
+
+def lookup_cached_transcript(
+    audio: bytes | str | Path,
+    model_name: str = WHISPER_MODEL,
+    language: str | None = None,
+    cache: TranscriptCache | None = None,
+    streamed: bool = False,
+) -> str | None:
+    """Cached transcript for these audio bytes (or file) and settings, else None."""
+    if cache is None:
+        return None
+    entry = cache.get(_cache_key(audio, model_name, language, streamed))
+    return entry["text"] if entry else None
+
+
+def lookup_cached_segments(
+    audio: bytes | str | Path,
+    model_name: str = WHISPER_MODEL,
+    language: str | None = None,
+    cache: TranscriptCache | None = None,
+    streamed: bool = False,
+) -> list[Segment] | None:
+    """Cached timestamped segments for this audio and settings, else None."""
+    if cache is None:
+        return None
+    entry = cache.get(_cache_key(audio, model_name, language, streamed))
+    if not entry or "segments" not in entry:  # entries written before segments were stored
+        return None
+    return [Segment(*s) for s in entry["segments"]]
 
 
 def transcribe_audio(
@@ -85,40 +341,513 @@ def transcribe_audio(
     model: Any = None,
     model_name: str = WHISPER_MODEL,
     language: str | None = None,
+    cache: TranscriptCache | None = None,
+    audio_cache: AudioCache | None = None,
 ) -> str:
     """
     Transcribe audio file to text.
     Accepts mp3, wav, etc. (Whisper/ffmpeg handle conversion).
-    Validates ffmpeg and file before loading model.
+    Validates ffmpeg and file before loading model. With a cache, a hit on the file's
+    content skips ffmpeg and model loading entirely; with an audio_cache, re-runs (other
+    model or language) reuse the decoded PCM instead of running ffmpeg again.
     """
-    check_ffmpeg_available()
     audio_path = Path(audio_path).resolve()
     if not audio_path.is_file():
         raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    key = _cache_key(audio_path, model_name, language) if cache is not None else None
+    if key is not None and (entry := cache.get(key)) is not None:
+        return entry["text"]
+    check_ffmpeg_available()
     if model is None:
         model = load_whisper_model(model_name)
-    result = model.transcribe(str(audio_path), language=language, fp16=False)
-    return (result.get("text") or "").strip()
+    source = load_audio(audio_path, audio_cache) if audio_cache is not None else str(audio_path)
+    text, segments = _run_whisper(model, source, language)
+    if key is not None:
+        cache.put(key, _cache_entry(text, segments))
+    return text
 
 
 def transcribe_uploaded_file(
-    uploaded_file: Any, model: Any = None, model_name: str = WHISPER_MODEL
+    uploaded_file: Any,
+    model: Any = None,
+    model_name: str = WHISPER_MODEL,
+    cache: TranscriptCache | None = None,
+    progress: Callable[[float, float], None] | None = None,
+    on_segment: Callable[[Segment], None] | None = None,
+    audio_cache: AudioCache | None = None,
 ) -> str:
     """
-    Transcribe a Streamlit UploadedFile (save to temp then transcribe).
-    Uses a simple filename under system temp for Windows compatibility.
+    Transcribe a Streamlit UploadedFile: bytes are decoded in memory (ffmpeg stdin → 16 kHz
+    float32 array) and passed straight to the model, without a temp file round-trip.
+    Passing progress or on_segment switches to windowed decoding (see transcribe_stream).
     """
-    check_ffmpeg_available()
-    name = getattr(uploaded_file, "name", "audio.mp3")
-    suffix = Path(name).suffix or ".mp3"
-    fd, tmp_path = tempfile.mkstemp(suffix=suffix, prefix="whisper_")
+    data = uploaded_file.getvalue()  # type: ignore[union-attr]
+    streamed = progress is not None or on_segment is not None
+    key = _cache_key(data, model_name, None, streamed) if cache is not None else None
+    if key is not None and (entry := cache.get(key)) is not None:
+        return entry["text"]
+    audio = load_audio(data, audio_cache)
+    if model is None:
+        model = load_whisper_model(model_name)
+    if streamed:
+        segments = []
+        for seg in transcribe_stream(audio, model, progress=progress):
+            segments.append(seg)
+            if on_segment is not None:
+                on_segment(seg)
+        text = " ".join(s.text for s in segments)
+    else:
+        text, segments = _run_whisper(model, audio, None)
+    if key is not None:
+        cache.put(key, _cache_entry(text, segments))
+    return text
+
+
+class TranscriptionResult(NamedTuple):
+    path: str
+    text: str
+    error: str | None = None  # set when this file failed; text is then ""
+
+
+# Per-process model for transcribe_many workers (loaded once by _init_worker)
+_worker_model: Any = None
+
+
+def _init_worker(model_name: str, n_workers: int) -> None:
+    """Pool initializer: split CPU threads between workers, load Whisper once per process."""
+    global _worker_model  # noqa: PLW0603
     try:
-        os.close(fd)
-        with open(tmp_path, "wb") as f:
-            f.write(uploaded_file.getvalue())  # type: ignore[union-attr]
-        return transcribe_audio(tmp_path, model=model, model_name=model_name)
+        import torch  # noqa: PLC0415
+
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // n_workers))
+    except ImportError:
+        pass
+    _worker_model = load_whisper_model(model_name)
+
+
+def whisper_pool(model_name: str = WHISPER_MODEL, workers: int = TRANSCRIBE_WORKERS) -> Executor:
+    """Process pool whose workers each load model_name once; reusable across calls."""
+    return ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(model_name, workers)
+    )
+
+
+def _transcribe_one(
+    path: str,
+    model: Any,
+    model_name: str,
+    language: str | None,
+    cache: TranscriptCache | None,
+    audio_cache: AudioCache | None,
+) -> TranscriptionResult:
+    """Transcribe one file; failures are reported in the result instead of raised."""
+    try:
+        text = transcribe_audio(
+            path,
+            model=model,
+            model_name=model_name,
+            language=language,
+            cache=cache,
+            audio_cache=audio_cache,
+        )
+    except Exception as e:  # noqa: BLE001
+        return TranscriptionResult(path, "", f"{type(e).__name__}: {e}")
+    return TranscriptionResult(path, text)
+
+
+def _transcribe_in_worker(
+    path: str,
+    model_name: str,
+    language: str | None,
+    cache: TranscriptCache | None,
+    audio_cache: AudioCache | None,
+) -> TranscriptionResult:
+    return _transcribe_one(path, _worker_model, model_name, language, cache, audio_cache)
+
+
+def transcribe_many(
+    paths: Iterable[str | Path],
+    workers: int = TRANSCRIBE_WORKERS,
+    model_name: str = WHISPER_MODEL,
+    language: str | None = None,
+    cache: TranscriptCache | None = None,
+    audio_cache: AudioCache | None = None,
+) -> Iterator[TranscriptionResult]:
+    """
+    Transcribe many files on a pool of worker processes, each holding its own Whisper model.
+    Yields results in completion order; a failing file yields a result with error set and
+    the rest of the batch continues. workers=1 runs in-process with a single model.
+    Cached files are yielded first without starting any workers; workers share the cache
+    directory (entries are written atomically).
+    """
+    pending = []
+    for p in map(str, paths):
+        try:
+            text = lookup_cached_transcript(p, model_name, language, cache)
+        except OSError:  # unreadable/missing: let the worker report it
+            text = None
+        if text is None:
+            pending.append(p)
+        else:
+            yield TranscriptionResult(p, text)
+    paths = pending
+    if not paths:
+        return
+    check_ffmpeg_available()  # PATH fix-up is inherited by the worker processes
+    workers = max(1, min(workers, len(paths)))
+    if workers == 1:
+        model = load_whisper_model(model_name)
+        for p in paths:
+            yield _transcribe_one(p, model, model_name, language, cache, audio_cache)
+        return
+    pool = whisper_pool(model_name, workers)
+    try:
+        futures = {
+            pool.submit(_transcribe_in_worker, p, model_name, language, cache, audio_cache): p
+            for p in paths
+        }
+        for fut in as_completed(futures):
+            try:
+                yield fut.result()
+            except Exception as e:  # noqa: BLE001  # worker crashed or model failed to load
+                yield TranscriptionResult(futures[fut], "", f"{type(e).__name__}: {e}")
     finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def frame_energy(samples: np.ndarray, sr: int = SAMPLE_RATE, frame_ms: int = 30) -> np.ndarray:
+    """RMS energy per frame_ms frame (trailing partial frame dropped); low values = silence."""
+    frame = max(1, sr * frame_ms // 1000)
+    n_frames = len(samples) // frame
+    frames = np.asarray(samples[: n_frames * frame], dtype=np.float32).reshape(n_frames, frame)
+    return np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame)
+
+
+def split_at_silence(
+    samples: np.ndarray,
+    window_s: float = LONG_AUDIO_WINDOW_S,
+    overlap_s: float = LONG_AUDIO_OVERLAP_S,
+    search_s: float = LONG_AUDIO_SEARCH_S,
+    sr: int = SAMPLE_RATE,
+    frame_ms: int = 30,
+) -> list[tuple[int, int, int]]:
+    """
+    Split a recording into ~window_s windows, cutting at the quietest frame within the last
+    search_s seconds before each target length. Returns (start, end, cut) sample indices per
+    window: [start, end) includes overlap_s on both sides of the cuts, cut is the boundary
+    with the next window (len(samples) for the last one).
+    """
+    n = len(samples)
+    window = int(window_s * sr)
+    if n <= window:
+        return [(0, n, n)]
+    frame = max(1, sr * frame_ms // 1000)
+    energy = frame_energy(samples, sr, frame_ms)
+    search = max(1, int(search_s * sr) // frame)
+    overlap = int(overlap_s * sr)
+    cuts = []
+    pos = 0
+    while n - pos > window:
+        hi = (pos + window) // frame
+        lo = max(pos // frame + 1, hi - search)
+        cut = (lo + int(np.argmin(energy[lo:hi]))) * frame + frame // 2 if hi > lo else hi * frame
+        cuts.append(cut)
+        pos = cut
+    bounds = [0, *cuts, n]
+    return [(max(0, a - overlap), min(n, b + overlap), b) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def _norm_word(w: str) -> str:
+    return "".join(c for c in w.lower() if c.isalnum())
+
+
+def _repeated_word_count(prev: list[Segment], nxt: list[Segment], max_words: int = 30) -> int:
+    """Number of leading words of nxt that repeat the last words of prev (overlap decoded twice)."""
+    tail = [_norm_word(w) for s in prev[-max_words:] for w in s.text.split()][-max_words:]
+    head = [_norm_word(w) for s in nxt[:max_words] for w in s.text.split()][:max_words]
+    for k in range(min(len(tail), len(head)), 0, -1):
+        if tail[-k:] == head[:k]:
+            return k
+    return 0
+
+
+def _drop_leading_words(segs: list[Segment], k: int) -> list[Segment]:
+    out = []
+    for seg in segs:
+        words = seg.text.split()
+        if k >= len(words):
+            k -= len(words)
+            continue
+        out.append(seg._replace(text=" ".join(words[k:])) if k else seg)
+        k = 0
+    return out
+
+
+def stitch_windows(
+    windows: list[tuple[int, int, int]], results: list[list[Segment]], sr: int = SAMPLE_RATE
+) -> list[Segment]:
+    """
+    Merge per-window segments (absolute times) into one list. Each window keeps the segments
+    that reach into its own span between the cuts; the words decoded twice in the overlap
+    (end of one window = start of the next) are then dropped from the later window.
+    """
+    merged: list[Segment] = []
+    prev_cut = 0.0
+    for i, ((_, _, cut), segs) in enumerate(zip(windows, results)):
+        cut_s = cut / sr if i < len(windows) - 1 else float("inf")
+        kept = [s for s in segs if s.end > prev_cut and s.start < cut_s]
+        if merged:
+            kept = _drop_leading_words(kept, _repeated_word_count(merged, kept))
+        merged.extend(kept)
+        prev_cut = cut_s
+    return merged
+
+
+def _segments_for_window(
+    model: Any, samples: np.ndarray, offset_s: float, language: str | None
+) -> list[Segment]:
+    result = model.transcribe(samples, language=language, **DECODE_OPTIONS)
+    return [
+        Segment(offset_s + s["start"], offset_s + s["end"], s["text"].strip())
+        for s in result.get("segments") or []
+        if s["text"].strip()
+    ]
+
+
+def _window_in_worker(samples: np.ndarray, offset_s: float, language: str | None) -> list[Segment]:
+    return _segments_for_window(_worker_model, samples, offset_s, language)
+
+
+def transcribe_long(
+    audio: str | Path | bytes | np.ndarray,
+    workers: int = TRANSCRIBE_WORKERS,
+    model: Any = None,
+    model_name: str = WHISPER_MODEL,
+    language: str | None = None,
+    window_s: float = LONG_AUDIO_WINDOW_S,
+    overlap_s: float = LONG_AUDIO_OVERLAP_S,
+    audio_cache: AudioCache | None = None,
+    pool: Executor | None = None,
+    search_s: float = LONG_AUDIO_SEARCH_S,
+) -> list[Segment]:
+    """
+    Long-recording mode: split at silence (split_at_silence), transcribe the windows in
+    parallel on worker processes (one Whisper model each) and stitch the segments back
+    together, dropping text duplicated in the overlaps. workers=1 (or a single window) runs
+    in-process, using model if given. Pass a whisper_pool(model_name) as pool to reuse its
+    loaded workers across files; it is left running for the caller to shut down.
+    """
+    samples = load_audio(audio, audio_cache)
+    windows = split_at_silence(samples, window_s, overlap_s, search_s)
+    if pool is None and max(1, min(workers, len(windows))) == 1:
+        if model is None:
+            model = load_whisper_model(model_name)
+        results = [
+            _segments_for_window(model, samples[a:b], a / SAMPLE_RATE, language)
+            for a, b, _ in windows
+        ]
+        return stitch_windows(windows, results)
+    own_pool = pool is None
+    if own_pool:
+        pool = whisper_pool(model_name, min(workers, len(windows)))
+    try:
+        futures = [
+            pool.submit(_window_in_worker, samples[a:b], a / SAMPLE_RATE, language)
+            for a, b, _ in windows
+        ]
+        results = [f.result() for f in futures]
+    finally:
+        if own_pool:
+            pool.shutdown(wait=True, cancel_futures=True)
+    return stitch_windows(windows, results)
+
+
+class CascadeResult(NamedTuple):
+    text: str
+    segments: list[Segment]
+    second_pass_fraction: float  # share of the audio duration re-decoded by the larger model
+
+
+def _needs_second_pass(seg: dict, logprob_threshold: float, compression_threshold: float) -> bool:
+    return (
+        seg.get("avg_logprob", 0.0) < logprob_threshold
+        or seg.get("compression_ratio", 0.0) > compression_threshold
+    )
+
+
+def transcribe_cascade(
+    audio: str | Path | bytes | np.ndarray,
+    fast_model: Any = None,
+    accurate_model: Any = None,
+    fast_model_name: str = CASCADE_FAST_MODEL,
+    accurate_model_name: str = CASCADE_ACCURATE_MODEL,
+    language: str | None = None,
+    logprob_threshold: float = CASCADE_LOGPROB_THRESHOLD,
+    compression_ratio_threshold: float = CASCADE_COMPRESSION_RATIO_THRESHOLD,
+    pad_s: float = 0.2,
+    audio_cache: AudioCache | None = None,
+) -> CascadeResult:
+    """
+    Two-pass transcription: decode everything with a fast model, then re-decode only the
+    segments whose avg_logprob is below logprob_threshold or whose compression_ratio is above
+    compression_ratio_threshold (repetitive output) with a larger model. Adjacent flagged
+    segments are re-decoded as one span (padded by pad_s) and replace the fast text.
+    Models not passed in come from the shared model registry; the accurate one is only
+    loaded if some segment needs it.
+    """
+    from .models import get_registry  # noqa: PLC0415  # models imports this module
+
+    samples = load_audio(audio, audio_cache)
+    total = len(samples) / SAMPLE_RATE
+    if fast_model is None:
+        fast_model = get_registry().get("whisper", fast_model_name)
+    first = fast_model.transcribe(samples, language=language, **DECODE_OPTIONS)
+    language = language or first.get("language")
+    raw = [s for s in first.get("segments") or [] if s["text"].strip()]
+    flags = [_needs_second_pass(s, logprob_threshold, compression_ratio_threshold) for s in raw]
+
+    segments: list[Segment] = []
+    redecoded = 0.0
+    i = 0
+    while i < len(raw):
+        if not flags[i]:
+            segments.append(Segment(raw[i]["start"], raw[i]["end"], raw[i]["text"].strip()))
+            i += 1
+            continue
+        j = i
+        while j + 1 < len(raw) and flags[j + 1]:
+            j += 1
+        start, end = raw[i]["start"], raw[j]["end"]
+        if accurate_model is None:
+            accurate_model = get_registry().get("whisper", accurate_model_name)
+        a = max(0, int((start - pad_s) * SAMPLE_RATE))
+        b = min(len(samples), int((end + pad_s) * SAMPLE_RATE))
+        prompt = " ".join(s.text for s in segments[-3:]) or None
+        second = accurate_model.transcribe(
+            samples[a:b], language=language, initial_prompt=prompt, **DECODE_OPTIONS
+        )
+        text = (second.get("text") or "").strip()
+        if text:
+            segments.append(Segment(start, end, text))
+        redecoded += end - start
+        i = j + 1
+    fraction = min(1.0, redecoded / total) if total else 0.0
+    return CascadeResult(" ".join(s.text for s in segments), segments, fraction)
+
+
+def _transcribe_each(
+    paths: list[str], transcribe: Callable[[str], str]
+) -> Iterator[TranscriptionResult]:
+    """One file at a time (for modes that parallelize within a file)."""
+    for p in paths:
         try:
-            Path(tmp_path).unlink(missing_ok=True)
-        except OSError:
-            pass
+            text = transcribe(p)
+        except Exception as e:  # noqa: BLE001
+            yield TranscriptionResult(p, "", f"{type(e).__name__}: {e}")
+        else:
+            yield TranscriptionResult(p, text)
+
+
+def _long_results(
+    args: argparse.Namespace, audio_cache: AudioCache | None
+) -> Iterator[TranscriptionResult]:
+    """--long: one file at a time, all files sharing one pool (or one in-process model)."""
+    model = pool = None
+    if args.workers > 1:
+        pool = whisper_pool(args.model, args.workers)
+    else:
+        model = load_whisper_model(args.model)
+
+    def long(p: str) -> str:
+        segs = transcribe_long(
+            p,
+            args.workers,
+            model=model,
+            model_name=args.model,
+            language=args.language,
+            audio_cache=audio_cache,
+            pool=pool,
+        )
+        return " ".join(s.text for s in segs)
+
+    try:
+        yield from _transcribe_each(args.paths, long)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _cli_results(args: argparse.Namespace) -> Iterable[TranscriptionResult]:
+    """Pick the transcription mode for the CLI flags."""
+    cache = None if args.no_cache else default_transcript_cache()
+    audio_cache = None if args.no_cache else default_audio_cache()
+    if args.cascade:
+
+        def cascade(p: str) -> str:
+            res = transcribe_cascade(
+                p,
+                fast_model_name=args.model,
+                accurate_model_name=args.cascade,
+                language=args.language,
+                audio_cache=audio_cache,
+            )
+            get_logger().info("%s: %.0f%% re-decoded", p, 100 * res.second_pass_fraction)
+            return res.text
+
+        return _transcribe_each(args.paths, cascade)
+    if args.long:
+        return _long_results(args, audio_cache)
+    return transcribe_many(args.paths, args.workers, args.model, args.language, cache, audio_cache)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI: python -m src.transcribe FILE [FILE ...] -- prints one JSON line per file."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.transcribe", description="Batch-transcribe audio files with Whisper."
+    )
+    parser.add_argument("paths", nargs="+", help="Audio files to transcribe")
+    parser.add_argument("-w", "--workers", type=int, default=TRANSCRIBE_WORKERS)
+    parser.add_argument("-m", "--model", default=WHISPER_MODEL, help="Whisper model size")
+    parser.add_argument(
+        "--int8", action="store_true", help="int8 dynamically quantized model (CPU)"
+    )
+    parser.add_argument("-l", "--language", default=None, help="Language code (auto if unset)")
+    parser.add_argument(
+        "-o", "--output-dir", default=None, help="Also write <name>.txt per file here"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Ignore the transcript and decoded-audio caches"
+    )
+    parser.add_argument(
+        "--long",
+        action="store_true",
+        help="Long recordings: one file at a time, split at silence across the workers",
+    )
+    parser.add_argument(
+        "--cascade",
+        metavar="MODEL",
+        default=None,
+        help="Re-decode low-confidence segments with this larger model (--model is the fast one)",
+    )
+    args = parser.parse_args(argv)
+    if args.int8 and not args.model.endswith(INT8_SUFFIX):
+        args.model += INT8_SUFFIX
+
+    log = get_logger()
+    out_dir = Path(args.output_dir) if args.output_dir else None
+    if out_dir is not None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+    n_failed = 0
+    for res in _cli_results(args):
+        if res.error:
+            n_failed += 1
+            log.error("%s: %s", res.path, res.error)
+        elif out_dir is not None:
+            (out_dir / f"{Path(res.path).stem}.txt").write_text(res.text, encoding="utf-8")
+        print(json.dumps(res._asdict(), ensure_ascii=False), flush=True)
+    log.info("Transcribed %d file(s), %d failed", len(args.paths) - n_failed, n_failed)
+    return 1 if n_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+"""Tests for the Aho–Corasick matcher."""
+
+import random
+
+from src.aho_corasick import AhoCorasick
+
+
+def test_overlapping_and_nested_patterns() -> None:
+    ac = AhoCorasick(["he", "she", "his", "hers", "", "xyz"])
+    assert ac.matches("ushers") == {0, 1, 3, 4}
+    assert ac.matches("") == {4}
+
+
+def test_matches_equal_substring_check() -> None:
+    rng = random.Random(0)
+    for _ in range(500):
+        patterns = ["".join(rng.choices("abc", k=rng.randint(0, 4))) for _ in range(6)]
+        text = "".join(rng.choices("abcd", k=rng.randint(0, 30)))
+        expected = {i for i, p in enumerate(patterns) if p in text}
+        assert AhoCorasick(patterns).matches(text) == expected
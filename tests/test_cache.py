@@ -0,0 +1,66 @@
+"""Tests for on-disk caches."""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from src.cache import AudioCache, TranscriptCache, audio_digest
+
+
+def test_audio_digest_bytes_matches_file(tmp_path: Path) -> None:
+    f = tmp_path / "a.wav"
+    f.write_bytes(b"abc" * 1000)
+    assert audio_digest(b"abc" * 1000) == audio_digest(f)
+
+
+def test_make_key_depends_on_settings() -> None:
+    d = audio_digest(b"audio")
+    k = TranscriptCache.make_key(d, "base")
+    assert k == TranscriptCache.make_key(d, "base", None, {})
+    assert k != TranscriptCache.make_key(d, "small")
+    assert k != TranscriptCache.make_key(d, "base", "en")
+    assert k != TranscriptCache.make_key(d, "base", None, {"fp16": True})
+
+
+def test_get_put_roundtrip(tmp_path: Path) -> None:
+    cache = TranscriptCache(tmp_path, max_bytes=1 << 20)
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, {"text": "hello"})
+    assert cache.get("ab" * 32) == {"text": "hello"}
+    assert not list(tmp_path.glob("*/.tmp_*"))
+
+
+def test_corrupt_entry_is_a_miss(tmp_path: Path) -> None:
+    cache = TranscriptCache(tmp_path, max_bytes=1 << 20)
+    cache.put("cd" * 32, {"text": "x"})
+    next(tmp_path.glob("*/*.json")).write_text("{not json", encoding="utf-8")
+    assert cache.get("cd" * 32) is None
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path: Path) -> None:
+    cache = TranscriptCache(tmp_path, max_bytes=300)
+    keys = [f"{i:02d}" * 32 for i in range(3)]
+    for i, k in enumerate(keys):
+        cache.put(k, {"text": "x" * 80})
+        p = next(tmp_path.glob(f"*/{k}.json"))
+        os.utime(p, (1000 + i, 1000 + i))
+    cache.get(keys[0])  # bump oldest to most recent
+    cache.put("ff" * 32, {"text": "x" * 80})
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get("ff" * 32) is not None
+
+
+def test_audio_cache_roundtrip_is_memory_mapped(tmp_path: Path) -> None:
+    cache = AudioCache(tmp_path, max_bytes=1 << 20)
+    key = AudioCache.make_key(audio_digest(b"mp3 bytes"), 16000)
+    assert key != AudioCache.make_key(audio_digest(b"mp3 bytes"), 8000)
+    assert cache.get(key) is None
+    samples = np.linspace(-1, 1, 1000, dtype=np.float64)
+    cache.put(key, samples)
+    out = cache.get(key)
+    assert isinstance(out, np.memmap)
+    assert out.dtype == np.float32
+    np.testing.assert_allclose(out, samples.astype(np.float32))
+    assert not out.flags.writeable
@@ -0,0 +1,81 @@
+"""Tests for the persisted corpus LSA model and fold-in."""
+
+import json
+import random
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from src.corpus_lsa import CorpusLSA, main
+
+THEMES = [
+    "machine learning model data training neural network",
+    "delivery order shipping package refund late courier",
+    "doctor patient hospital treatment medicine nurse clinic",
+]
+
+
+def _archive(n: int = 60, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(THEMES[i % 3].split(), k=30)) for i in range(n)]
+
+
+def test_fit_stores_float32_and_folds_in_like_the_fit() -> None:
+    docs = _archive()
+    model = CorpusLSA.fit(docs, n_topics=3, n_iter=7, n_oversamples=5)
+    assert model.n_topics == 3
+    assert model.components.dtype == np.float32
+    assert sp.issparse(model.tfidf) and model.tfidf.dtype == np.float32
+    assert model.tfidf.shape[0] == len(docs)
+    np.testing.assert_allclose(model.transform_to_topics(docs[:5]), model.doc_topic[:5], atol=1e-5)
+    assert model.svd_params == {"n_iter": 7, "n_oversamples": 5, "random_state": 42}
+    assert np.all(np.diff(model.singular_values) <= 0)
+
+
+def test_save_load_memory_maps_components(tmp_path) -> None:
+    docs = _archive()
+    model = CorpusLSA.fit(docs, n_topics=3)
+    path = model.save(tmp_path / "lsa")
+    assert (
+        json.loads((path / "meta.json").read_text())["svd"]["n_iter"] == model.svd_params["n_iter"]
+    )
+    loaded = CorpusLSA.load(path)
+    assert isinstance(loaded.components, np.memmap)
+    assert isinstance(loaded.doc_topic, np.memmap)
+    assert loaded.tfidf is None
+    new = _archive(6, seed=1)
+    np.testing.assert_allclose(loaded.transform_to_topics(new), model.transform_to_topics(new))
+    assert loaded.top_words(5) == model.top_words(5)
+    with_tfidf = CorpusLSA.load(path, load_tfidf=True)
+    assert (with_tfidf.tfidf != model.tfidf).nnz == 0
+    model.save(path)  # overwriting an existing model directory
+    assert CorpusLSA.load(path).n_topics == 3
+
+
+def test_top_words_group_each_theme() -> None:
+    model = CorpusLSA.fit(_archive(), n_topics=3)
+    words, weights = model.top_words(4)
+    assert len(words) == len(weights) == 3
+    assert all(len(w) == 4 for w in words)
+    assert all(ws == sorted(ws, reverse=True) for ws in weights)
+
+
+def test_small_corpus_clamps_topics_and_rejects_unknown_format(tmp_path) -> None:
+    model = CorpusLSA.fit(["cat dog", "dog bird", "cat bird fish"], n_topics=10, min_df=1)
+    assert model.n_topics <= 3
+    path = model.save(tmp_path / "lsa")
+    meta = json.loads((path / "meta.json").read_text())
+    meta["version"] = 99
+    (path / "meta.json").write_text(json.dumps(meta))
+    with pytest.raises(ValueError, match="format"):
+        CorpusLSA.load(path)
+
+
+def test_cli_fits_and_saves(tmp_path, capsys) -> None:
+    f = tmp_path / "archive.txt"
+    f.write_text("\n".join(_archive()), encoding="utf-8")
+    out = tmp_path / "model"
+    assert main([str(f), "-o", str(out), "-k", "3", "--chunk-size", "30", "--n-iter", "3"]) == 0
+    assert CorpusLSA.load(out).svd_params["n_iter"] == 3
+    assert capsys.readouterr().out.count("Topic ") == 3
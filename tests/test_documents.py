@@ -0,0 +1,81 @@
+"""Tests for token-ID documents and chunk views."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from src.documents import TokenDocument, Vocabulary
+from src.sentiment import chunk_text as sentiment_chunk_text
+from src.sentiment import sentiment_chunked
+from src.summarization import chunk_for_summary
+from src.topic_modeling import chunk_text as topic_chunk_text
+
+
+def test_vocabulary_interns_words() -> None:
+    vocab = Vocabulary()
+    ids = vocab.encode(["love", "it", "love"])
+    assert ids.dtype == np.int32
+    assert ids.tolist() == [0, 1, 0]
+    assert vocab.decode(ids) == ["love", "it", "love"]
+    assert len(vocab) == 2 and "it" in vocab
+
+
+def test_document_offsets_and_views() -> None:
+    vocab = Vocabulary()
+    doc = TokenDocument.from_text("we  love the\nnew product", vocab)
+    assert doc.text == "we love the new product"
+    assert doc.starts.tolist() == [0, 3, 8, 12, 16]
+    view = doc[1:4]
+    assert view.text == "love the new"
+    assert view.tokens == ["love", "the", "new"]
+    assert np.shares_memory(view.ids, doc.ids)
+    assert doc[5:].text == ""
+    with pytest.raises(TypeError):
+        doc[::2]
+
+
+def test_documents_share_vocabulary() -> None:
+    vocab = Vocabulary()
+    a = TokenDocument.from_tokens(["good", "service"], vocab)
+    b = TokenDocument.from_tokens(["bad", "service"], vocab)
+    assert a.ids[1] == b.ids[1]
+    assert len(vocab) == 3
+
+
+def test_default_vocabulary_is_per_document() -> None:
+    a = TokenDocument.from_tokens(["good", "service"])
+    b = TokenDocument.from_tokens(["service"])
+    assert a.vocab is not b.vocab
+    assert b.ids.tolist() == [0] and b.text == "service"
+    assert a[1:].vocab is a.vocab
+
+
+def test_concurrent_encode_keeps_ids_consistent() -> None:
+    vocab = Vocabulary()
+    words = [f"w{i}" for i in range(2000)]
+    docs = []
+
+    def encode(offset: int) -> None:
+        docs.append(TokenDocument.from_tokens(words[offset:] + words[:offset], vocab))
+
+    threads = [threading.Thread(target=encode, args=(k * 250,)) for k in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(vocab) == len(words)
+    assert sorted(vocab.words) == sorted(words)
+    for doc in docs:
+        assert doc.tokens == doc.text.split()
+
+
+def test_stage_chunkers_accept_documents() -> None:
+    text = " ".join(f"w{i}" for i in range(25))
+    doc = TokenDocument.from_text(text, Vocabulary())
+    assert sentiment_chunk_text(doc, 10) == sentiment_chunk_text(text, 10)
+    assert topic_chunk_text(doc, 7) == topic_chunk_text(text, 7)
+    assert chunk_for_summary(doc, 12) == chunk_for_summary(text, 12)
+    review = "i love this it is great but the delivery was terrible and slow"
+    review_doc = TokenDocument.from_text(review, Vocabulary())
+    assert sentiment_chunked(review_doc, chunk_size=4) == sentiment_chunked(review, chunk_size=4)
@@ -0,0 +1,183 @@
+"""Tests for the ONNX Runtime emotion backend (fake session; real export if onnxruntime is installed)."""
+
+import contextlib
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.emotion_onnx import OnnxEmotionClassifier, _export_fp32, onnx_model_dir
+from src.models import model_nbytes
+from src.sentiment import emotion_model_key, get_emotions_transformers
+
+LABELS = {0: "anger", 1: "joy", 2: "neutral"}
+
+
+class _FakeTokenizer:
+    def __call__(self, texts, padding, truncation, max_length, return_tensors):
+        n = max(len(t.split()) for t in texts)
+        ids = np.array([[len(w) for w in t.split()] + [0] * (n - len(t.split())) for t in texts])
+        return {"input_ids": ids, "attention_mask": (ids > 0).astype(np.int64)}
+
+
+class _FakeSession:
+    """logits = (sum of word lengths, number of words, 0) per text."""
+
+    def __init__(self) -> None:
+        self.batches: list[int] = []
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="input_ids"), SimpleNamespace(name="attention_mask")]
+
+    def run(self, output_names, feed):
+        ids, mask = feed["input_ids"], feed["attention_mask"]
+        assert ids.dtype == np.int64
+        self.batches.append(len(ids))
+        logits = np.stack([ids.sum(1) / 10, mask.sum(1) / 10, np.zeros(len(ids))], axis=1)
+        return [logits.astype(np.float32)]
+
+
+def _classifier() -> OnnxEmotionClassifier:
+    return OnnxEmotionClassifier(_FakeSession(), _FakeTokenizer(), LABELS, nbytes=1234)
+
+
+def test_classifier_matches_pipeline_output_shape() -> None:
+    clf = _classifier()
+    single = clf("a bb ccc")
+    assert [d["label"] for d in single] == ["anger", "joy", "neutral"]  # sorted by score
+    assert sum(d["score"] for d in single) == pytest.approx(1.0)
+    many = clf(["a bb", "ccc dddd eeeee", "f"], batch_size=2)
+    assert clf.session.batches == [1, 2, 1]
+    assert len(many) == 3 and all(len(row) == 3 for row in many)
+    logits = np.array([0.3, 0.2, 0.0])  # "a bb": word lengths 1 + 2, two words
+    expected = np.exp(logits) / np.exp(logits).sum()
+    scores = {d["label"]: d["score"] for d in many[0]}
+    assert [scores[LABELS[i]] for i in range(3)] == pytest.approx(expected.tolist(), abs=1e-6)
+
+
+def test_get_emotions_transformers_on_onnx_backend() -> None:
+    clf = _classifier()
+    text = " ".join(["good", "fine", "okay"] * 10)
+    with patch("src.sentiment._get_emotion_pipeline", return_value=clf):
+        out = get_emotions_transformers(text, max_length=7, batch_size=3, backend="onnx")
+    assert sorted(out) == sorted(LABELS.values())
+    assert sum(out.values()) == pytest.approx(1.0)
+
+
+def test_emotion_model_key_and_registry_size() -> None:
+    assert emotion_model_key("m", "torch") == ("emotion", "m")
+    assert emotion_model_key("m", "onnx") == ("emotion-onnx", "m")
+    assert emotion_model_key("m", "onnx-int8") == ("emotion-onnx", "m-int8")
+    with pytest.raises(ValueError, match="backend"):
+        emotion_model_key("m", "tensorrt")
+    assert model_nbytes(_classifier()) == 1234
+    assert onnx_model_dir("org/model", "/c").parent.name == "org--model"
+
+
+def test_export_dir_changes_with_library_versions() -> None:
+    with patch("src.emotion_onnx.version", return_value="1.0"):
+        old = onnx_model_dir("org/model", "/c")
+    with patch("src.emotion_onnx.version", return_value="2.0"):
+        new = onnx_model_dir("org/model", "/c")
+    assert old.name == "opset17-torch1.0-transformers1.0-onnxruntime1.0"
+    assert new != old and new.parent == old.parent
+
+
+class _DistilBertLike:
+    """forward() like DistilBERT's: no token_type_ids, head_mask third."""
+
+    config = SimpleNamespace(save_pretrained=lambda out: None)
+
+    def eval(self):
+        return self
+
+    def forward(self, input_ids=None, attention_mask=None, head_mask=None, inputs_embeds=None):
+        raise AssertionError("not called by the fake exporter")
+
+
+class _BertTokenizerLike:
+    def __call__(self, texts, padding, return_tensors):
+        return {"input_ids": "ids", "token_type_ids": "types", "attention_mask": "mask"}
+
+    def save_pretrained(self, out):
+        pass
+
+
+def test_export_passes_only_forward_inputs_by_name(tmp_path) -> None:
+    """Runs without torch: the export call's input mapping, with fake torch/transformers."""
+    calls = []
+
+    def fake_export(model, args, f, **kw):
+        calls.append((args, kw))
+        Path(f).write_bytes(b"graph")
+
+    fake_torch = SimpleNamespace(
+        no_grad=contextlib.nullcontext, onnx=SimpleNamespace(export=fake_export)
+    )
+    fake_transformers = SimpleNamespace(
+        AutoTokenizer=SimpleNamespace(from_pretrained=lambda name: _BertTokenizerLike()),
+        AutoModelForSequenceClassification=SimpleNamespace(
+            from_pretrained=lambda name: _DistilBertLike()
+        ),
+    )
+    modules = {"torch": fake_torch, "transformers": fake_transformers}
+    with patch.dict(sys.modules, modules):
+        _export_fp32("m", tmp_path, tmp_path / "model.onnx")
+    ((args, kw),) = calls
+    assert args == ({"input_ids": "ids", "attention_mask": "mask"},)  # no token_type_ids
+    assert kw["input_names"] == ["input_ids", "attention_mask"]
+    assert set(kw["dynamic_axes"]) == {"input_ids", "attention_mask", "logits"}
+    assert (tmp_path / "model.onnx").read_bytes() == b"graph"
+
+
+def _tiny_model(path) -> str:
+    """Random 2-layer DistilBERT classifier + WordPiece tokenizer saved to path (no download)."""
+    transformers = pytest.importorskip("transformers")
+    torch = pytest.importorskip("torch")
+    words = "the service was great but delivery slow and i am angry happy sad today".split()
+    path.mkdir()
+    vocab = path / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *words]))
+    tokenizer = transformers.BertTokenizerFast(vocab_file=str(vocab))
+    config = transformers.DistilBertConfig(
+        vocab_size=len(words) + 5,
+        dim=32,
+        n_layers=2,
+        n_heads=2,
+        hidden_dim=64,
+        max_position_embeddings=128,
+        id2label=LABELS,
+        label2id={v: k for k, v in LABELS.items()},
+    )
+    torch.manual_seed(0)
+    transformers.DistilBertForSequenceClassification(config).save_pretrained(path)
+    tokenizer.save_pretrained(path)
+    return str(path)
+
+
+@pytest.mark.parametrize(("backend", "tol"), [("onnx", 1e-4), ("onnx-int8", 5e-2)])
+def test_onnx_parity_with_torch_pipeline(tmp_path, backend: str, tol: float) -> None:
+    pytest.importorskip("onnxruntime")
+    model = _tiny_model(tmp_path / "model")
+    from transformers import pipeline
+
+    torch_pipe = pipeline("text-classification", model=model, top_k=None)
+    onnx_pipe = OnnxEmotionClassifier.from_pretrained(
+        model, cache_dir=tmp_path / "onnx", quantize=backend == "onnx-int8"
+    )
+    text = "the service was great but delivery was slow and i am angry today " * 6
+    with patch("src.sentiment._get_emotion_pipeline", return_value=torch_pipe):
+        expected = get_emotions_transformers(text, model, max_length=8, batch_size=4)
+    with patch("src.sentiment._get_emotion_pipeline", return_value=onnx_pipe):
+        got = get_emotions_transformers(text, model, max_length=8, batch_size=4, backend=backend)
+    assert sorted(got) == sorted(expected)
+    for label, score in expected.items():
+        assert got[label] == pytest.approx(score, abs=tol)
+
+    graph = onnx_model_dir(model, tmp_path / "onnx") / "model.onnx"
+    mtime = graph.stat().st_mtime_ns
+    OnnxEmotionClassifier.from_pretrained(model, cache_dir=tmp_path / "onnx")  # cached export
+    assert graph.stat().st_mtime_ns == mtime
@@ -0,0 +1,134 @@
+"""Tests for the shared model registry (fake loaders, no real models)."""
+
+import threading
+import time
+
+import pytest
+
+from src.models import ModelLoadError, ModelRegistry, parse_preload_spec
+
+
+def _registry(budget: int = 100, **loaders):
+    sizes = {"small": 30, "medium": 60, "huge": 500}
+    return ModelRegistry(
+        budget_bytes=budget,
+        loaders=loaders or {"whisper": lambda name: f"model-{name}"},
+        attempts=1,
+        size_of=lambda m: sizes[m.split("-", 1)[1]],
+    )
+
+
+def test_get_caches_and_counts_hits() -> None:
+    calls = []
+    reg = _registry(whisper=lambda name: calls.append(name) or f"model-{name}")
+    assert reg.get("whisper", "small") == "model-small"
+    assert reg.get("whisper", "small") == "model-small"
+    assert calls == ["small"]
+    (stat,) = reg.stats()
+    assert (stat.kind, stat.name, stat.size_bytes, stat.hits) == ("whisper", "small", 30, 1)
+    assert stat.load_seconds >= 0
+
+
+def test_budget_evicts_least_recently_used() -> None:
+    reg = _registry(budget=100)
+    reg.get("whisper", "small")
+    reg.get("whisper", "medium")  # 90 bytes
+    reg.get("whisper", "small")  # small is now most recent
+    reg.get("whisper", "huge")  # over budget on its own: everything else goes
+    assert [s.name for s in reg.stats()] == ["huge"]
+    reg.get("whisper", "small")
+    assert [s.name for s in reg.stats()] == ["small"]
+    assert reg.resident_bytes() == 30
+
+
+def test_failed_load_is_not_cached() -> None:
+    attempts = []
+
+    def flaky(name: str) -> str:
+        attempts.append(name)
+        if len(attempts) == 1:
+            raise OSError("network down")
+        return f"model-{name}"
+
+    reg = _registry(emotion=flaky)
+    with pytest.raises(ModelLoadError, match="network down"):
+        reg.get("emotion", "small")
+    assert reg.get("emotion", "small") == "model-small"
+    assert len(attempts) == 2
+
+
+def test_unknown_kind() -> None:
+    with pytest.raises(ValueError, match="Unknown model kind"):
+        _registry().get("nope", "small")
+
+
+def test_preload_reports_errors() -> None:
+    reg = _registry()
+    errors = reg.preload([("whisper", "small"), ("nope", "x")])
+    assert list(errors) == [("nope", "x")]
+    assert [s.name for s in reg.stats()] == ["small"]
+
+
+def test_concurrent_gets_load_once() -> None:
+    calls = []
+
+    def slow(name: str) -> str:
+        calls.append(name)
+        time.sleep(0.05)
+        return f"model-{name}"
+
+    reg = _registry(whisper=slow)
+    threads = [threading.Thread(target=reg.get, args=("whisper", "small")) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == ["small"]
+
+
+def test_room_is_made_before_a_reload() -> None:
+    resident_during_load = []
+
+    def loader(name: str) -> str:
+        resident_during_load.append(reg.resident_bytes())
+        return f"model-{name}"
+
+    reg = _registry(budget=80, whisper=loader)
+    reg.get("whisper", "small")
+    reg.get("whisper", "medium")  # size unknown until loaded: small is evicted afterwards
+    reg.get("whisper", "small")
+    reg.get("whisper", "medium")  # known to be 60 bytes now: small goes before the load
+    assert resident_during_load == [0, 30, 0, 0]
+    assert [s.name for s in reg.stats()] == ["medium"]
+
+
+def test_hit_is_not_blocked_by_a_concurrent_load() -> None:
+    started, release = threading.Event(), threading.Event()
+
+    def loader(name: str) -> str:
+        if name == "medium":
+            started.set()
+            release.wait(5)
+        return f"model-{name}"
+
+    reg = _registry(budget=1000, whisper=loader)
+    reg.get("whisper", "small")
+    slow = threading.Thread(target=reg.get, args=("whisper", "medium"))
+    slow.start()
+    try:
+        assert started.wait(5)
+        t0 = time.perf_counter()
+        assert reg.get("whisper", "small") == "model-small"
+        assert time.perf_counter() - t0 < 1
+    finally:
+        release.set()
+        slow.join()
+    assert sorted(s.name for s in reg.stats()) == ["medium", "small"]
+
+
+def test_parse_preload_spec() -> None:
+    assert parse_preload_spec("") == []
+    assert parse_preload_spec("whisper:base, emotion:org/model ,bad") == [
+        ("whisper", "base"),
+        ("emotion", "org/model"),
+    ]
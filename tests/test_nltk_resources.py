@@ -0,0 +1,66 @@
+"""Tests for the once-per-process NLTK resource layer (no network access)."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src import nltk_resources
+from src.nltk_resources import (
+    VENDORED_STOPWORDS,
+    NLTKResourceError,
+    english_stopwords,
+    ensure_tokenizer,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    english_stopwords.cache_clear()
+    nltk_resources._tokenizer_available.cache_clear()
+    yield
+    english_stopwords.cache_clear()
+    nltk_resources._tokenizer_available.cache_clear()
+
+
+@patch("src.nltk_resources.NLTK_OFFLINE", True)
+@patch("nltk.download")
+@patch("nltk.data.find", side_effect=LookupError)
+def test_offline_uses_vendored_stopwords(mock_find: MagicMock, mock_download: MagicMock) -> None:
+    sw = english_stopwords()
+    assert isinstance(sw, frozenset)
+    assert len(sw) == 198
+    assert {"the", "not", "you've"} <= sw
+    assert english_stopwords() is sw  # resolved once
+    mock_find.assert_called_once()
+    mock_download.assert_not_called()
+
+
+@patch("src.nltk_resources.NLTK_OFFLINE", True)
+@patch("nltk.download")
+@patch("nltk.data.find", side_effect=LookupError)
+def test_offline_missing_tokenizer_fails_fast(
+    mock_find: MagicMock, mock_download: MagicMock
+) -> None:
+    with pytest.raises(NLTKResourceError, match="NLTK_OFFLINE"):
+        ensure_tokenizer()
+    calls = mock_find.call_count
+    with pytest.raises(NLTKResourceError):
+        ensure_tokenizer()
+    assert mock_find.call_count == calls  # not looked up again
+    mock_download.assert_not_called()
+
+
+@patch("src.nltk_resources.NLTK_OFFLINE", False)
+@patch("nltk.download", side_effect=OSError("no network"))
+@patch("nltk.data.find", side_effect=LookupError)
+def test_failed_download_falls_back_to_vendored(
+    _mock_find: MagicMock, mock_download: MagicMock
+) -> None:
+    assert "the" in english_stopwords()
+    mock_download.assert_called_once_with("stopwords", quiet=True)
+
+
+def test_vendored_list_is_one_word_per_line() -> None:
+    lines = VENDORED_STOPWORDS.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == len(set(lines)) == 198
+    assert all(w == w.strip().lower() and w for w in lines)
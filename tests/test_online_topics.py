@@ -0,0 +1,80 @@
+"""Tests for the online (incremental) topic model."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.online_topics import OnlineTopicModel, main
+
+TECH = "machine learning model data training neural network deep".split()
+SHOP = "delivery order shipping late package refund customer support".split()
+
+
+def _batch(rng: random.Random, n: int = 20) -> list[str]:
+    return [" ".join(rng.choices(TECH if i % 2 else SHOP, k=40)) for i in range(n)]
+
+
+def _model() -> OnlineTopicModel:
+    return OnlineTopicModel(n_topics=2, n_features=2**12, batch_size=16)
+
+
+def test_partial_fit_separates_topics_and_labels_them() -> None:
+    rng = random.Random(0)
+    model = _model()
+    for _ in range(3):
+        model.partial_fit(_batch(rng))
+    assert model.n_docs == 60
+    words, weights = model.top_words(5)
+    assert len(words) == len(weights) == 2
+    assert all(set(w) <= set(TECH) or set(w) <= set(SHOP) for w in words)
+    assert {w[0] in TECH for w in words} == {True, False}
+    assert all(ws == sorted(ws, reverse=True) for ws in weights)
+    mix = model.transform([" ".join(TECH), " ".join(SHOP)])
+    assert mix.shape == (2, 2)
+    assert mix[0].argmax() != mix[1].argmax()
+
+
+def test_memory_does_not_grow_with_corpus() -> None:
+    rng = random.Random(1)
+    model = _model()
+    model.partial_fit(_batch(rng))
+    size = model.nbytes
+    for _ in range(5):
+        model.partial_fit(_batch(rng))
+    assert model.nbytes == size
+    assert len(model.bucket_words) <= model.n_features
+
+
+def test_empty_input_and_unfitted_model() -> None:
+    model = _model()
+    model.partial_fit(["", "   ", "the and of"])  # nothing left after stop words
+    assert not model.fitted
+    assert model.top_words() == ([], [])
+    with pytest.raises(ValueError, match="not seen"):
+        model.transform(["machine learning"])
+
+
+def test_save_load_round_trip_keeps_learning(tmp_path) -> None:
+    rng = random.Random(2)
+    model = _model().partial_fit(_batch(rng))
+    path = model.save(tmp_path / "topics.joblib")
+    loaded = OnlineTopicModel.load(path)
+    docs = [" ".join(TECH)]
+    np.testing.assert_allclose(loaded.transform(docs), model.transform(docs))
+    loaded.partial_fit(_batch(rng))
+    assert loaded.n_docs == 40
+    assert OnlineTopicModel.load_or_create(tmp_path / "missing.joblib", n_topics=3).n_topics == 3
+
+
+def test_cli_updates_persisted_model(tmp_path, capsys) -> None:
+    rng = random.Random(3)
+    files = []
+    for i in range(2):
+        f = tmp_path / f"call{i}.txt"
+        f.write_text("\n".join(_batch(rng, 10)), encoding="utf-8")
+        files.append(str(f))
+    model_path = tmp_path / "model.joblib"
+    assert main([*files, "--model", str(model_path), "-k", "2", "--chunk-size", "40"]) == 0
+    assert OnlineTopicModel.load(model_path).n_docs == 20
+    assert capsys.readouterr().out.count("Topic ") == 2
@@ -1,11 +1,19 @@
 """Tests for preprocessing module."""
 
+import pytest
+
 from src.preprocess import (
+    _tokens_reference,
+    chunk_tokens,
     clean_raw_whisper_text,
     get_effective_stopwords,
+    preprocess_corpus,
     preprocess_document,
     preprocess_for_nlp,
+    preprocess_stream,
+    preprocess_to_document,
 )
+from src.transcribe import Segment
 
 
 def test_clean_raw_whisper_text_empty() -> None:
@@ -62,3 +70,56 @@ def test_preprocess_for_nlp_non_string_returns_empty() -> None:
     # type ignore intentional for robustness test
     out = preprocess_for_nlp(123)  # type: ignore[arg-type]
     assert out == ""  # isinstance(text, str) is False
+
+
+@pytest.mark.parametrize("lowercase", [True, False])
+@pytest.mark.parametrize("remove_punct", [True, False])
+@pytest.mark.parametrize("remove_digits", [True, False])
+def test_fast_path_matches_reference_tokenizer(
+    lowercase: bool, remove_punct: bool, remove_digits: bool
+) -> None:
+    text = (
+        "I cannot WAIT, we're gonna go! Lemme see: 3.5 e-mails, naïve café… "
+        "It's 12abc o'clock\tand a_b — wanna gimme 'tis gotta"
+    )
+    flags = (lowercase, remove_punct, remove_digits, True)
+    expected = " ".join(_tokens_reference(text, *flags))
+    assert preprocess_for_nlp(text, *flags, remove_stopwords=False) == expected
+    sw = {"not", "me", "we"}
+    kept = [w for w in expected.split() if len(w) > 1 and w not in sw]
+    assert preprocess_for_nlp(text, *flags, custom_stopwords=sw) == " ".join(kept)
+
+
+def test_fast_path_splits_like_word_tokenize() -> None:
+    out = preprocess_for_nlp("I CANNOT go, gonna wanna", remove_stopwords=False)
+    assert out == "i can not go gon na wan na"
+
+
+def test_preprocess_stream_matches_preprocess_document() -> None:
+    raw = "Hello world, we love NLP!\n0.5 0.3 0.2\nprobability of speech 0.9\nNot bad at all."
+    sw = {"we", "at", "all"}
+    streamed = preprocess_stream(iter(raw.splitlines()), custom_stopwords=sw)
+    assert not isinstance(streamed, list)
+    assert " ".join(streamed) == preprocess_document(raw, custom_stopwords=sw)
+
+
+def test_preprocess_stream_accepts_segments_and_chunks() -> None:
+    segments = [Segment(0.0, 1.0, "One two three."), Segment(1.0, 2.0, "Four five!")]
+    tokens = preprocess_stream(segments, remove_stopwords=False)
+    assert list(chunk_tokens(tokens, 2)) == ["one two", "three four", "five"]
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_preprocess_corpus_keeps_order(n_jobs: int) -> None:
+    texts = [f"Document {i}: we LOVE item{i} and words!" for i in range(9)]
+    sw = {"we", "and"}
+    out = preprocess_corpus(texts, n_jobs=n_jobs, chunksize=2, custom_stopwords=sw)
+    assert out == [preprocess_document(t, custom_stopwords=sw) for t in texts]
+    assert preprocess_corpus([], n_jobs=n_jobs) == []
+
+
+def test_preprocess_to_document_matches_preprocess_document(sample_raw_text: str) -> None:
+    sw = {"is", "a", "and"}
+    doc = preprocess_to_document(sample_raw_text, custom_stopwords=sw)
+    assert doc.text == preprocess_document(sample_raw_text, custom_stopwords=sw)
+    assert len(doc) == len(doc.text.split())
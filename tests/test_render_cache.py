@@ -0,0 +1,61 @@
+"""Tests for the topic plot render cache and parallel rendering."""
+
+import numpy as np
+
+import src.render_cache as render_cache
+from src.render_cache import RenderCache, render_topic_images
+
+PNG = b"\x89PNG"
+
+
+def _inputs():
+    rng = np.random.default_rng(0)
+    doc_topic = rng.random((6, 3))
+    words = [["alpha", "beta", "gamma"], ["delta", "epsilon"], ["zeta", "eta", "theta"]]
+    weights = [[0.5, 0.3, 0.1], [0.4, -0.2], [0.9, 0.8, 0.7]]
+    return doc_topic, words, weights
+
+
+def test_renders_pngs_in_topic_order_with_timings() -> None:
+    doc_topic, words, weights = _inputs()
+    serial = render_topic_images(doc_topic, words, weights, n_jobs=1)
+    threaded = render_topic_images(doc_topic, words, weights, n_jobs=3)
+    assert serial.heatmap.startswith(PNG)
+    assert len(serial.wordclouds) == 3
+    assert all(png.startswith(PNG) for png in serial.wordclouds)
+    # Seeded layout: equal input gives equal bytes, whichever thread rendered it
+    assert threaded.wordclouds == serial.wordclouds
+    assert [t.image for t in threaded.timings] == ["heatmap", "topic 1", "topic 2", "topic 3"]
+    assert all(t.seconds > 0 and not t.cached for t in threaded.timings)
+
+
+def test_cache_hits_skip_rendering_and_track_changed_inputs(monkeypatch) -> None:
+    doc_topic, words, weights = _inputs()
+    cache = RenderCache()
+    first = render_topic_images(doc_topic, words, weights, cache=cache)
+    calls = []
+    real = render_cache.wordcloud_png
+    monkeypatch.setattr(render_cache, "wordcloud_png", lambda *a: calls.append(a) or real(*a))
+
+    again = render_topic_images(doc_topic, words, weights, cache=cache)
+    assert again.heatmap == first.heatmap and again.wordclouds == first.wordclouds
+    assert all(t.cached and t.seconds == 0.0 for t in again.timings)
+    assert calls == []
+
+    words[1] = ["iota", "kappa"]
+    changed = render_topic_images(doc_topic, words, weights, cache=cache)
+    assert [t.cached for t in changed.timings] == [True, True, False, True]
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (7, 5)
+
+
+def test_cache_evicts_least_recently_used_beyond_budget() -> None:
+    cache = RenderCache(max_mb=10 / 2**20)  # 10 bytes
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    assert cache.get("a") == b"12345"  # a is now most recent
+    cache.put("c", b"123")
+    assert cache.get("b") is None
+    assert len(cache) == 2 and cache.nbytes == 8
+    cache.put("huge", b"x" * 11)  # larger than the budget: not kept
+    assert len(cache) == 0 and cache.nbytes == 0
@@ -0,0 +1,61 @@
+"""Tests for the timestamped segment table."""
+
+from src.segments import SegmentTable
+from src.transcribe import Segment
+
+
+def _table() -> SegmentTable:
+    return SegmentTable.from_segments(
+        [
+            Segment(0.0, 60.0, "We love the new product."),
+            {"start": 60.0, "end": 120.0, "text": " The delivery was terrible! "},
+            Segment(120.0, 180.0, "Support fixed it quickly."),
+            Segment(180.0, 181.0, "   "),  # empty segments are dropped
+        ],
+        remove_stopwords=False,
+    )
+
+
+def test_offsets_index_text_and_tokens() -> None:
+    table = _table()
+    assert len(table) == 3
+    assert table.text == (
+        "We love the new product. The delivery was terrible! Support fixed it quickly."
+    )
+    assert table.text[table.char_start[1] : table.char_end[1]] == "The delivery was terrible!"
+    assert table.tokens[table.token_start[1] : table.token_end[1]] == [
+        "the",
+        "delivery",
+        "was",
+        "terrible",
+    ]
+    assert table.duration == 180.0
+
+
+def test_time_range_queries() -> None:
+    table = _table()
+    assert table.index_range(0, 60) == (0, 1)
+    assert table.index_range(30, 90) == (0, 2)
+    assert table.text_between(60, 120) == "The delivery was terrible!"
+    assert table.preprocessed_between(120, 1000) == "support fixed it quickly"
+    assert table.text_between(500, 600) == ""
+    assert table.tokens_between(500, 600) == []
+
+
+def test_token_times_map_token_offsets_to_segment_starts() -> None:
+    table = _table()
+    assert table.token_times([0, 4, 5, 8, 9, 12]).tolist() == [0, 0, 60, 60, 120, 120]
+    assert SegmentTable.from_segments([]).token_times([0]).tolist() == [0.0]
+
+
+def test_preprocessed_text_joins_all_tokens() -> None:
+    table = _table()
+    assert table.preprocessed_text.split() == table.tokens
+    assert table.preprocessed_between(0, table.duration) == table.preprocessed_text
+
+
+def test_empty_table() -> None:
+    table = SegmentTable.from_segments([])
+    assert len(table) == 0
+    assert table.duration == 0.0
+    assert table.text_between(0, 10) == ""
@@ -1,10 +1,22 @@
 """Tests for sentiment module."""
 
+import re
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from textblob import TextBlob
+
+from src.documents import TokenDocument
 from src.sentiment import (
     SentimentResult,
     aspect_based_sentiment,
     chunk_text,
+    emotion_chunks,
+    get_emotions_transformers,
     sentiment_chunked,
+    sentiment_chunked_many,
+    sentiment_timeline,
 )
 
 
@@ -50,3 +62,98 @@ def test_aspect_based_sentiment_returns_scores() -> None:
     assert "food" in out
     assert "service" in out
     assert all(isinstance(v, float) for v in out.values())
+
+
+def test_sentiment_chunked_accepts_token_stream() -> None:
+    text = "i love this product it is great and amazing but delivery was slow"
+    tokens = iter(text.split())
+    assert sentiment_chunked(tokens, chunk_size=5) == sentiment_chunked(text, chunk_size=5)
+    assert chunk_text(iter(text.split()), chunk_size=5) == chunk_text(text, chunk_size=5)
+
+
+def test_lexicon_engine_matches_textblob_engine() -> None:
+    text = "i really love this it is not bad but the delivery was very slow and terrible " * 30
+    with patch("src.sentiment.SENTIMENT_ENGINE", "textblob"):
+        expected = sentiment_chunked(text, chunk_size=50)
+    assert sentiment_chunked(text, chunk_size=50) == pytest.approx(expected)
+    assert sentiment_chunked(text, chunk_size=50).label == expected.label
+
+
+def test_sentiment_chunked_many_matches_single() -> None:
+    texts = ["we love this great product", "", "terrible awful service " * 100]
+    results = sentiment_chunked_many(texts, chunk_size=20)
+    assert results == [sentiment_chunked(t, chunk_size=20) for t in texts]
+
+
+def test_aspect_based_sentiment_matches_per_pair_scoring() -> None:
+    text = (
+        "The Food was great! Service was terribly slow. Foodies love the food court, "
+        "but parking is bad? Nothing else."
+    )
+    aspects = ["food", "Service ", "foo", "od", "", "parking", "missing", "food"]
+    expected = {}
+    sentences = [s.strip() for s in re.split(r"[.!?]+", text) if s.strip()]
+    for aspect in aspects:
+        pols = [
+            TextBlob(s).sentiment.polarity for s in sentences if aspect.lower().strip() in s.lower()
+        ]
+        expected[aspect] = sum(pols) / len(pols) if pols else 0.0
+    assert aspect_based_sentiment(text, aspects) == pytest.approx(expected)
+
+
+def _fake_emotion_pipe(texts: list[str], **_kw: object) -> list:
+    """Fake top_k=None pipeline: every label for every chunk; joy grows with length."""
+    return [
+        [{"label": "joy", "score": len(t) / 1000}, {"label": "anger", "score": 0.1}] for t in texts
+    ]
+
+
+def test_get_emotions_transformers_batches_chunks() -> None:
+    pipe = MagicMock(side_effect=_fake_emotion_pipe)
+    text = " ".join(["word"] * 25)
+    with patch("src.sentiment._get_emotion_pipeline", return_value=pipe):
+        out = get_emotions_transformers(text, max_length=10, batch_size=4)
+    pipe.assert_called_once()
+    chunks = pipe.call_args.args[0]
+    assert chunks == emotion_chunks(text, 10)
+    assert len(chunks) == 3
+    assert pipe.call_args.kwargs["batch_size"] == 4
+    assert out["anger"] == pytest.approx(0.1)
+    assert out["joy"] == pytest.approx(sum(len(c) for c in chunks) / len(chunks) / 1000)
+
+
+def test_get_emotions_transformers_normalizes_output_shapes() -> None:
+    outputs = [
+        {"label": "joy", "score": 0.2},
+        [[{"label": "joy", "score": 0.4}, {"label": "fear", "score": 0.6}]],
+    ]
+    pipe = MagicMock(return_value=outputs)
+    with patch("src.sentiment._get_emotion_pipeline", return_value=pipe):
+        out = get_emotions_transformers("one two three", max_length=2)
+    assert out == pytest.approx({"fear": 0.6, "joy": 0.3})
+    with patch("src.sentiment._get_emotion_pipeline", return_value=None):
+        assert get_emotions_transformers("text") == {}
+
+
+def test_sentiment_timeline_matches_rescoring_each_window() -> None:
+    # No negations or intensifiers, so no assessment straddles a window edge
+    words = ("great service but slow delivery and terrible support " * 30).split()
+    words += ("happy customer wonderful experience " * 20).split()
+    tl = sentiment_timeline(" ".join(words), window=50, step=7)
+    assert tl.start[0] == 0 and tl.end[-1] == len(words)
+    assert (tl.end - tl.start == 50).all()
+    assert (np.diff(tl.start)[:-1] == 7).all()
+    for i in range(len(tl.start)):
+        blob = TextBlob(" ".join(words[tl.start[i] : tl.end[i]])).sentiment
+        assert tl.polarity[i] == pytest.approx(blob.polarity)
+        assert tl.subjectivity[i] == pytest.approx(blob.subjectivity)
+    assert tl.polarity[-1] > tl.polarity[0]
+
+
+def test_sentiment_timeline_short_and_empty_text() -> None:
+    doc = TokenDocument.from_text("not good at all")
+    tl = sentiment_timeline(doc, window=200, step=20)
+    assert (tl.start.tolist(), tl.end.tolist()) == ([0], [4])
+    assert tl.polarity[0] == pytest.approx(TextBlob("not good at all").sentiment.polarity)
+    empty = sentiment_timeline("", window=10, step=2)
+    assert len(empty.start) == len(empty.polarity) == 0
@@ -0,0 +1,80 @@
+"""Parity tests: lexicon sentiment engine vs TextBlob's PatternAnalyzer."""
+
+import gc
+import weakref
+
+import numpy as np
+import pytest
+from textblob import TextBlob
+
+from src.documents import TokenDocument, Vocabulary
+from src.sentiment_engine import get_lexicon_engine
+
+PHRASES = [
+    "",
+    "good",
+    "very good",
+    "not good",
+    "not bad at all",
+    "really not good",
+    "not really good",
+    "this is a very very good movie",
+    "never a dull moment but hardly amazing",
+    "extremely terrible service and horribly slow delivery",
+    "I LOVE this Product it is Great",
+    "no",
+    "the movie was not a good one i think",
+    "seriously unfortunately definitely the worst",
+]
+WITH_PUNCTUATION = ["This is great!", "Not bad :) at all", "It's (!) amazing", "2 good 4 me"]
+
+
+def _textblob(texts: list[str]) -> np.ndarray:
+    return np.array([tuple(TextBlob(t).sentiment) for t in texts]).reshape(-1, 2)
+
+
+def test_texts_match_textblob() -> None:
+    texts = PHRASES + WITH_PUNCTUATION
+    got = get_lexicon_engine().score_texts(texts)
+    np.testing.assert_allclose(got, _textblob(texts), rtol=0, atol=1e-12)
+
+
+def test_documents_match_textblob() -> None:
+    vocab = Vocabulary()
+    docs = [TokenDocument.from_text(t.lower(), vocab) for t in PHRASES + WITH_PUNCTUATION]
+    got = get_lexicon_engine().score_documents(docs)
+    expected = _textblob([d.text for d in docs])
+    np.testing.assert_allclose(got, expected, rtol=0, atol=1e-12)
+
+
+def test_chunk_views_are_scored_independently() -> None:
+    engine = get_lexicon_engine()
+    doc = TokenDocument.from_text("really not good very bad never happy", Vocabulary())
+    chunks = doc.chunks(2)
+    expected = _textblob([c.text for c in chunks])
+    np.testing.assert_allclose(engine.score_documents(chunks), expected, atol=1e-12)
+    mixed = engine.score([chunks[0], chunks[1].text, chunks[2]])
+    np.testing.assert_allclose(mixed, expected[:3], atol=1e-12)
+
+
+def test_vocabulary_tables_do_not_outlive_their_vocabulary() -> None:
+    engine = get_lexicon_engine()
+    engine.score_texts(["a good day"])
+    doc = TokenDocument.from_text("good service", Vocabulary())
+    engine.score_documents([doc])
+    vocab = weakref.ref(doc.vocab)
+    assert vocab() in engine._vocab_tables
+    del doc
+    gc.collect()
+    assert vocab() is None
+    assert len(engine._vocab_tables) == 0
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_random_lexicon_text_matches_textblob(seed: int) -> None:
+    engine = get_lexicon_engine()
+    rng = np.random.default_rng(seed)
+    pool = [w for w in list(engine.index)[:1500] if w.isalpha()]
+    pool += ["not", "no", "never", "very", "really", "a", "i", "is", "the", "movie"] * 30
+    texts = [" ".join(rng.choice(pool, size=rng.integers(0, 30))) for _ in range(300)]
+    np.testing.assert_allclose(engine.score_texts(texts), _textblob(texts), atol=1e-12)
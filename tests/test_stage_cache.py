@@ -0,0 +1,122 @@
+"""Tests for the app's stage-result cache."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.documents import TokenDocument
+from src.models import ModelLoadError, ModelRegistry
+from src.sentiment import get_emotions_transformers
+from src.stage_cache import StageCache, fingerprint
+from src.summarization import summarize_with_t5
+
+
+def _counting(fn):
+    calls = []
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return fn(*args, **kwargs)
+
+    wrapper.calls = calls
+    return wrapper
+
+
+def test_run_memoizes_on_inputs_and_params() -> None:
+    cache = StageCache()
+    upper = _counting(str.upper)
+    assert cache.run("upper", upper, "abc").value == "ABC"
+    assert cache.run("upper", upper, "abc").hit
+    assert not cache.run("upper", upper, "abd").hit
+    split = _counting(lambda text, sep=" ": text.split(sep))
+    assert cache.run("split", split, "a,b", sep=",").value == ["a", "b"]
+    assert not cache.run("split", split, "a,b", sep=" ").hit
+    assert len(upper.calls) == 2 and len(split.calls) == 2
+    stats = {s.stage: s for s in cache.stats()}
+    assert (stats["upper"].hits, stats["upper"].misses) == (1, 2)
+    assert (stats["split"].hits, stats["split"].misses) == (0, 2)
+
+
+def test_downstream_stage_recomputes_only_when_upstream_changes() -> None:
+    cache = StageCache()
+    count = _counting(len)
+    clean = cache.run("clean", str.strip, "  some text ")
+    first = cache.run("count", count, clean)
+    assert first.value == 9 and not first.hit
+    # Same upstream input: both stages hit, the downstream key comes from the upstream key
+    again = cache.run("count", count, cache.run("clean", str.strip, "  some text "))
+    assert again.hit and again.key == first.key
+    changed = cache.run("count", count, cache.run("clean", str.strip, "other text"))
+    assert not changed.hit and changed.value == 10
+    assert count.calls == [("some text",), ("other text",)]
+
+
+def test_lru_eviction_and_failures_not_cached() -> None:
+    cache = StageCache(max_entries=2)
+    for text in ("a", "b", "c"):
+        cache.run("id", str, text)
+    assert len(cache) == 2
+    assert not cache.run("id", str, "a").hit  # evicted
+    assert cache.run("id", str, "c").hit
+
+    def boom(_):
+        raise ValueError("no")
+
+    with pytest.raises(ValueError):
+        cache.run("boom", boom, "x")
+    assert len(cache) == 2
+
+
+def test_fingerprint_covers_arrays_documents_and_containers() -> None:
+    a = np.arange(6, dtype=np.float64)
+    assert fingerprint(a) == fingerprint(a.copy())
+    assert fingerprint(a) != fingerprint(a.reshape(2, 3))
+    assert fingerprint(a) != fingerprint(a.astype(np.float32))
+    doc = TokenDocument.from_tokens(["good", "service"])
+    assert fingerprint(doc) == fingerprint(TokenDocument.from_tokens(["good", "service"]))
+    assert fingerprint(doc) != fingerprint("good service")
+    assert fingerprint(["ab", "c"]) != fingerprint(["a", "bc"])
+    assert fingerprint({"k": 1, "j": 2}) == fingerprint({"j": 2, "k": 1})
+    assert fingerprint(1) != fingerprint("1")
+    with pytest.raises(TypeError, match="fingerprint"):
+        fingerprint(object())
+
+
+def _flaky_registry(kind: str, model) -> ModelRegistry:
+    """Registry whose first load of any model fails, later loads return model."""
+    attempts = []
+
+    def load(_name: str):
+        attempts.append(_name)
+        if len(attempts) == 1:
+            raise OSError("network down")
+        return model
+
+    return ModelRegistry(loaders={kind: load}, attempts=1, size_of=lambda _: 0)
+
+
+def _fake_emotion_pipe(texts, **_kw):
+    return [[{"label": "joy", "score": 0.7}] for _ in texts]
+
+
+def _fake_summary_pipe(text, **_kw):
+    return [{"summary_text": "short"}]
+
+
+@pytest.mark.parametrize(
+    ("module", "kind", "model", "stage_fn", "expected"),
+    [
+        ("src.sentiment", "emotion", _fake_emotion_pipe, get_emotions_transformers, {"joy": 0.7}),
+        ("src.summarization", "summarization", _fake_summary_pipe, summarize_with_t5, "short"),
+    ],
+)
+def test_failed_model_load_is_retried_on_next_run(module, kind, model, stage_fn, expected) -> None:
+    cache = StageCache()
+    with patch(f"{module}.get_registry", return_value=_flaky_registry(kind, model)):
+        with pytest.raises(ModelLoadError):
+            cache.run(kind, stage_fn, "some words here", "m", raise_on_load_error=True)
+        second = cache.run(kind, stage_fn, "some words here", "m", raise_on_load_error=True)
+    assert not second.hit
+    assert second.value == expected
+    assert cache.run(kind, stage_fn, "some words here", "m", raise_on_load_error=True).hit
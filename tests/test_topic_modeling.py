@@ -1,8 +1,28 @@
 """Tests for topic modeling module."""
 
 import numpy as np
+import pytest
 
-from src.topic_modeling import chunk_text, run_lsa, topic_heatmap, wordcloud_for_topic
+from src import topic_modeling
+from src.topic_modeling import (
+    chunk_text,
+    lsa_explained_variance,
+    run_lsa,
+    topic_heatmap,
+    wordcloud_for_topic,
+)
+
+THEMES = [
+    "machine learning model data training neural network gradient",
+    "delivery order shipping package refund late courier warehouse",
+    "doctor patient hospital treatment medicine nurse clinic surgery",
+    "football match goal team player coach league season",
+]
+
+
+def _theme_docs(n: int = 40) -> list[str]:
+    words = [t.split() for t in THEMES]
+    return [" ".join(words[i % 4][j % 8] for j in range(i, i + 20)) for i in range(n)]
 
 
 def test_chunk_text_empty() -> None:
@@ -55,3 +75,58 @@ def test_wordcloud_for_topic_returns_bytes() -> None:
     assert buf is not None
     data = buf.read()
     assert len(data) > 0
+
+
+def test_run_lsa_fits_once_and_slices_smaller_k(monkeypatch) -> None:
+    docs = _theme_docs()
+    topic_modeling._fit_lsa.cache_clear()
+    fits = []
+    real = topic_modeling.TruncatedSVD
+    monkeypatch.setattr(topic_modeling, "TruncatedSVD", lambda **kw: fits.append(kw) or real(**kw))
+    _, svd6, doc_topic6, words6, _ = run_lsa(docs, n_topics=6, max_topics=8)
+    _, svd2, doc_topic2, words2, _ = run_lsa(docs, n_topics=2, max_topics=8)
+    assert [kw["n_components"] for kw in fits] == [8]
+    assert doc_topic6.shape == (len(docs), 6) and doc_topic2.shape == (len(docs), 2)
+    np.testing.assert_allclose(doc_topic2, doc_topic6[:, :2])
+    assert words2 == words6[:2]
+    assert svd2.components_.shape[0] == 2
+    tfidf = topic_modeling._fit_lsa(tuple(docs), 8, 2000, 1, 0.95)[0].transform(docs)
+    np.testing.assert_allclose(svd2.transform(tfidf), doc_topic2, atol=1e-10)
+
+
+def test_top_words_sorted_by_weight() -> None:
+    _, svd, _, top_words, top_weights = run_lsa(_theme_docs(), n_topics=3)
+    for words, weights, comp in zip(top_words, top_weights, svd.components_):
+        assert len(words) == 15
+        assert weights == sorted(weights, reverse=True)
+        assert weights[0] == pytest.approx(comp.max())
+
+
+def test_lsa_explained_variance_per_k() -> None:
+    docs = _theme_docs()
+    cum = lsa_explained_variance(docs, max_topics=6)
+    assert cum.shape == (6,)
+    assert np.all(np.diff(cum) >= 0) and 0 < cum[-1] <= 1 + 1e-9
+    _, svd, *_ = run_lsa(docs, n_topics=3, max_topics=6)
+    assert svd.explained_variance_ratio_.sum() == pytest.approx(cum[2])
+    assert lsa_explained_variance([]).size == 0
+
+
+def test_run_lsa_returns_copies_of_the_cached_fit() -> None:
+    docs = _theme_docs()
+    vectorizer, svd, *_ = run_lsa(docs, n_topics=8, max_topics=8)
+    with pytest.raises(ValueError):
+        svd.components_[0, 0] = 1.0
+    svd.fit(vectorizer.fit_transform(docs[:12]))
+    _, svd_again, doc_topic, *_ = run_lsa(docs, n_topics=8, max_topics=8)
+    assert svd_again.components_.shape[0] == 8
+    tfidf = topic_modeling._fit_lsa(tuple(docs), 8, 2000, 1, 0.95)[0].transform(docs)
+    np.testing.assert_allclose(svd_again.transform(tfidf), doc_topic, atol=1e-10)
+
+
+def test_run_lsa_max_fit_clamped_to_vocabulary() -> None:
+    docs = ["apple banana", "banana cherry", "cherry apple", "apple cherry banana"]
+    _, svd, doc_topic, words, _ = run_lsa(docs, n_topics=3, max_topics=10)
+    assert svd.n_components == 3 and doc_topic.shape == (4, 3)  # 3 terms: one topic each
+    assert len(words) == 3
+    assert lsa_explained_variance(docs, max_topics=10).shape == (3,)
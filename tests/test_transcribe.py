@@ -1,15 +1,35 @@
 """Tests for transcribe module (mocked Whisper to avoid heavy deps in CI)."""
 
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 
+from src.cache import AudioCache, TranscriptCache
 from src.transcribe import (
+    CascadeResult,
+    Segment,
+    TranscriptionResult,
     check_ffmpeg_available,
+    decode_audio_bytes,
+    load_audio,
     load_whisper_model,
+    lookup_cached_segments,
+    lookup_cached_transcript,
+    main,
+    quantize_whisper,
+    split_at_silence,
+    stitch_windows,
     transcribe_audio,
+    transcribe_cascade,
+    transcribe_long,
+    transcribe_many,
+    transcribe_stream,
     transcribe_uploaded_file,
+    word_error_rate,
 )
 
 
@@ -50,16 +70,400 @@ def test_check_ffmpeg_available_passes_when_found() -> None:
         check_ffmpeg_available()  # no raise
 
 
+@patch("src.transcribe.decode_audio_bytes")
+def test_transcribe_uploaded_file_decodes_in_memory(mock_decode: MagicMock) -> None:
+    audio = np.zeros(16000, dtype=np.float32)
+    mock_decode.return_value = audio
+    fake_model = MagicMock()
+    fake_model.transcribe.return_value = {"text": " Transcribed text "}
+    fake_upload = MagicMock()
+    fake_upload.name = "test.mp3"
+    fake_upload.getvalue.return_value = b"fake audio bytes"
+
+    out = transcribe_uploaded_file(fake_upload, model=fake_model)
+    assert out == "Transcribed text"
+    mock_decode.assert_called_once_with(b"fake audio bytes")
+    assert fake_model.transcribe.call_args.args[0] is audio
+
+
+@patch("src.transcribe.check_ffmpeg_available")
+@patch("src.transcribe.subprocess.run")
+def test_decode_audio_bytes_pipes_stdin(mock_run: MagicMock, _mock_ffmpeg: MagicMock) -> None:
+    pcm = np.array([0, 16384, -32768], dtype=np.int16).tobytes()
+    mock_run.return_value = MagicMock(stdout=pcm)
+
+    audio = decode_audio_bytes(b"encoded")
+    assert audio.dtype == np.float32
+    np.testing.assert_allclose(audio, [0.0, 0.5, -1.0])
+    cmd = mock_run.call_args.args[0]
+    assert "pipe:0" in cmd and "16000" in cmd
+    assert mock_run.call_args.kwargs["input"] == b"encoded"
+
+
 @patch("src.transcribe.check_ffmpeg_available")
-@patch("src.transcribe.transcribe_audio")
-def test_transcribe_uploaded_file_calls_transcribe_audio(
-    mock_transcribe: MagicMock, _mock_ffmpeg: MagicMock
+@patch("src.transcribe.subprocess.run")
+def test_decode_audio_bytes_falls_back_to_temp_file(
+    mock_run: MagicMock, _mock_ffmpeg: MagicMock
 ) -> None:
-    mock_transcribe.return_value = "Transcribed text"
+    pcm = np.zeros(4, dtype=np.int16).tobytes()
+    mock_run.side_effect = [
+        subprocess.CalledProcessError(1, "ffmpeg", stderr=b"moov atom not found"),
+        MagicMock(stdout=pcm),
+    ]
+    assert decode_audio_bytes(b"m4a bytes").shape == (4,)
+    tmp_input = mock_run.call_args.args[0][mock_run.call_args.args[0].index("-i") + 1]
+    assert tmp_input != "pipe:0"
+    assert not Path(tmp_input).exists()
+
+
+@patch("src.transcribe.check_ffmpeg_available")
+@patch("src.transcribe.load_whisper_model")
+def test_transcribe_many_reports_failures_without_aborting(
+    mock_load: MagicMock, _mock_ffmpeg: MagicMock, tmp_path: Path
+) -> None:
+    fake_model = MagicMock()
+    fake_model.transcribe.return_value = {"text": " ok "}
+    mock_load.return_value = fake_model
+    good = tmp_path / "a.wav"
+    good.write_bytes(b"fake")
+    missing = tmp_path / "missing.wav"
+
+    results = list(transcribe_many([good, missing, good], workers=1))
+    assert len(results) == 3
+    assert [r.text for r in results if not r.error] == ["ok", "ok"]
+    failed = [r for r in results if r.error]
+    assert len(failed) == 1 and failed[0].path == str(missing)
+    mock_load.assert_called_once()
+
+
+def test_transcribe_many_empty() -> None:
+    assert not list(transcribe_many([]))
+
+
+@patch("src.transcribe.check_ffmpeg_available")
+@patch("src.transcribe.load_whisper_model")
+def test_transcribe_many_caches_under_requested_model(
+    mock_load: MagicMock, _mock_ffmpeg: MagicMock, tmp_path: Path
+) -> None:
+    cache = TranscriptCache(tmp_path / "cache", max_bytes=1 << 20)
+    audio_file = tmp_path / "a.wav"
+    audio_file.write_bytes(b"fake wav content")
+    base_model = MagicMock()
+    base_model.transcribe.return_value = {"text": "base text"}
+    transcribe_audio(audio_file, model=base_model, model_name="base", cache=cache)
+    small_model = MagicMock()
+    small_model.transcribe.return_value = {"text": "small text"}
+    mock_load.return_value = small_model
+
+    # An entry for another model is neither returned nor overwritten
+    results = list(transcribe_many([audio_file], workers=1, model_name="small", cache=cache))
+    assert [r.text for r in results] == ["small text"]
+    mock_load.assert_called_once_with("small")
+    assert lookup_cached_transcript(audio_file, "small", cache=cache) == "small text"
+    assert lookup_cached_transcript(audio_file, "base", cache=cache) == "base text"
+
+
+@patch("src.transcribe.transcribe_many")
+def test_main_prints_json_lines_and_exit_code(
+    mock_many: MagicMock, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    mock_many.return_value = iter(
+        [TranscriptionResult("a.wav", "hello"), TranscriptionResult("b.wav", "", "boom")]
+    )
+    code = main(["a.wav", "b.wav", "-o", str(tmp_path)])
+    assert code == 1
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert len(lines) == 2
+    assert (tmp_path / "a.txt").read_text(encoding="utf-8") == "hello"
+    assert not (tmp_path / "b.txt").exists()
+
+
+@patch("src.transcribe.check_ffmpeg_available")
+def test_transcribe_audio_cache_hit_skips_model(_mock_ffmpeg: MagicMock, tmp_path: Path) -> None:
+    cache = TranscriptCache(tmp_path / "cache", max_bytes=1 << 20)
+    audio_file = tmp_path / "a.wav"
+    audio_file.write_bytes(b"fake wav content")
+    fake_model = MagicMock()
+    fake_model.transcribe.return_value = {"text": "Hello"}
+
+    assert transcribe_audio(audio_file, model=fake_model, cache=cache) == "Hello"
+    with patch("src.transcribe.load_whisper_model") as mock_load:
+        assert transcribe_audio(audio_file, cache=cache) == "Hello"
+        mock_load.assert_not_called()
+    fake_model.transcribe.assert_called_once()
+    # A different language is a different cache entry
+    assert transcribe_audio(audio_file, model=fake_model, language="de", cache=cache) == "Hello"
+    assert fake_model.transcribe.call_count == 2
+
+
+@patch("src.transcribe.decode_audio_bytes")
+def test_transcribe_uploaded_file_cache_hit(mock_decode: MagicMock, tmp_path: Path) -> None:
+    cache = TranscriptCache(tmp_path, max_bytes=1 << 20)
+    mock_decode.return_value = np.zeros(16000, dtype=np.float32)
+    fake_model = MagicMock()
+    fake_model.transcribe.return_value = {"text": "Transcribed text"}
     fake_upload = MagicMock()
     fake_upload.name = "test.mp3"
     fake_upload.getvalue.return_value = b"fake audio bytes"
 
-    out = transcribe_uploaded_file(fake_upload)
-    assert out == "Transcribed text"
-    mock_transcribe.assert_called_once()
+    assert transcribe_uploaded_file(fake_upload, fake_model, cache=cache) == "Transcribed text"
+    assert transcribe_uploaded_file(fake_upload, fake_model, cache=cache) == "Transcribed text"
+    fake_model.transcribe.assert_called_once()
+    mock_decode.assert_called_once()
+
+
+def _windowed_fake_model() -> MagicMock:
+    """Fake Whisper: two segments per window, the second one ending at the window's end."""
+
+    def fake_transcribe(chunk: np.ndarray, **_kw: object) -> dict:
+        dur = len(chunk) / 16000
+        return {
+            "language": "en",
+            "segments": [
+                {"start": 0.0, "end": dur / 2, "text": f" first {dur:.0f}"},
+                {"start": dur / 2, "end": dur, "text": f" second {dur:.0f}"},
+            ],
+        }
+
+    model = MagicMock()
+    model.transcribe.side_effect = fake_transcribe
+    return model
+
+
+def test_transcribe_stream_yields_offset_segments_and_progress() -> None:
+    audio = np.zeros(16000 * 70, dtype=np.float32)  # 70 s
+    model = _windowed_fake_model()
+    events: list[tuple[float, float]] = []
+
+    segs = list(transcribe_stream(audio, model=model, progress=lambda d, t: events.append((d, t))))
+    # Window 1 (0-30 s) keeps only its first segment, re-decoding from 15 s
+    assert segs[0] == Segment(0.0, 15.0, "first 30")
+    assert segs[1].start == 15.0
+    assert all(a.end <= b.start + 1e-6 for a, b in zip(segs, segs[1:]))
+    assert segs[-1].end == pytest.approx(70.0)
+    assert events[-1] == (70.0, 70.0)
+    assert [d for d, _ in events] == sorted(d for d, _ in events)
+    # Detected language is reused and previous text is passed as prompt
+    second_call = model.transcribe.call_args_list[1].kwargs
+    assert second_call["language"] == "en"
+    assert second_call["initial_prompt"] == "first 30"
+
+
+def test_transcribe_stream_short_audio_single_window() -> None:
+    audio = np.zeros(16000 * 10, dtype=np.float32)
+    segs = list(transcribe_stream(audio, model=_windowed_fake_model()))
+    assert [s.text for s in segs] == ["first 10", "second 10"]
+
+
+@patch("src.transcribe.decode_audio_bytes")
+def test_transcribe_uploaded_file_streams_segments(mock_decode: MagicMock) -> None:
+    mock_decode.return_value = np.zeros(16000 * 10, dtype=np.float32)
+    fake_upload = MagicMock()
+    fake_upload.getvalue.return_value = b"fake audio bytes"
+    seen: list[Segment] = []
+
+    out = transcribe_uploaded_file(fake_upload, _windowed_fake_model(), on_segment=seen.append)
+    assert out == "first 10 second 10"
+    assert len(seen) == 2
+
+
+@patch("src.transcribe.decode_audio_bytes")
+def test_cached_transcript_keeps_segments(mock_decode: MagicMock, tmp_path: Path) -> None:
+    cache = TranscriptCache(tmp_path, max_bytes=1 << 20)
+    mock_decode.return_value = np.zeros(16000 * 10, dtype=np.float32)
+    fake_upload = MagicMock()
+    fake_upload.getvalue.return_value = b"fake audio bytes"
+
+    assert lookup_cached_segments(b"fake audio bytes", cache=cache, streamed=True) is None
+    transcribe_uploaded_file(
+        fake_upload, _windowed_fake_model(), cache=cache, on_segment=lambda _s: None
+    )
+    segs = lookup_cached_segments(b"fake audio bytes", cache=cache, streamed=True)
+    assert segs == [Segment(0.0, 5.0, "first 10"), Segment(5.0, 10.0, "second 10")]
+
+
+def test_split_at_silence_cuts_in_quiet_gap() -> None:
+    rng = np.random.default_rng(0)
+    sr = 16000
+    audio = rng.uniform(-0.5, 0.5, sr * 25).astype(np.float32)
+    audio[sr * 8 : sr * 9] = 0.0  # 1 s of silence at 8-9 s
+    windows = split_at_silence(audio, window_s=10, overlap_s=0.5, search_s=5, sr=sr)
+    assert len(windows) >= 2
+    first_cut = windows[0][2]
+    assert sr * 8 <= first_cut <= sr * 9
+    # Overlap on both sides of the cut, last window ends at the end of the audio
+    assert windows[0][1] == first_cut + sr // 2
+    assert windows[1][0] == first_cut - sr // 2
+    assert windows[-1][1] == windows[-1][2] == len(audio)
+
+
+def test_split_at_silence_short_audio_single_window() -> None:
+    audio = np.zeros(16000 * 5, dtype=np.float32)
+    assert split_at_silence(audio, window_s=10) == [(0, len(audio), len(audio))]
+
+
+def test_stitch_windows_drops_duplicated_boundary_words() -> None:
+    sr = 16000
+    windows = [(0, 12 * sr, 10 * sr), (8 * sr, 20 * sr, 20 * sr)]
+    results = [
+        [
+            Segment(0.0, 5.0, "hello there."),
+            Segment(5.0, 9.5, "how are you"),
+            Segment(9.8, 12.0, "today"),
+        ],
+        [
+            Segment(8.0, 8.4, "there."),  # ends before the cut: belongs to window 1
+            Segment(8.5, 10.6, "are you today?"),
+            Segment(10.6, 15.0, "fine thanks"),
+        ],
+    ]
+    merged = stitch_windows(windows, results, sr=sr)
+    text = " ".join(s.text for s in merged)
+    assert text == "hello there. how are you today fine thanks"
+    assert [s.start for s in merged] == sorted(s.start for s in merged)
+
+
+def test_transcribe_long_in_process_stitches_windows() -> None:
+    audio = np.zeros(16000 * 25, dtype=np.float32)
+    model = _windowed_fake_model()
+    segs = transcribe_long(audio, workers=1, model=model, window_s=10, overlap_s=0.0)
+    assert model.transcribe.call_count == len(split_at_silence(audio, 10, 0.0))
+    assert all(a.start <= b.start for a, b in zip(segs, segs[1:]))
+    assert segs[-1].end == pytest.approx(25.0)
+
+
+def test_transcribe_long_reuses_given_pool() -> None:
+    audio = np.zeros(16000 * 25, dtype=np.float32)
+    fake = _windowed_fake_model().transcribe.side_effect
+    calls = []  # list.append is thread-safe; MagicMock's call_count is not
+    model = MagicMock()
+    model.transcribe = lambda chunk, **kw: calls.append(len(chunk)) or fake(chunk, **kw)
+    n_windows = len(split_at_silence(audio, 10, 0.0))
+    with patch("src.transcribe._worker_model", model), ThreadPoolExecutor(2) as pool:
+        for _ in range(2):
+            segs = transcribe_long(audio, model_name="x", window_s=10, overlap_s=0.0, pool=pool)
+            assert segs[-1].end == pytest.approx(25.0)
+        assert pool.submit(int, "7").result() == 7  # still running: the caller owns it
+    assert len(calls) == 2 * n_windows
+
+
+@patch("src.transcribe.load_audio", return_value=np.zeros(16000 * 25, dtype=np.float32))
+@patch("src.transcribe.whisper_pool")
+def test_main_long_starts_one_pool_for_all_files(
+    mock_pool: MagicMock, _mock_load: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    pool = ThreadPoolExecutor(2)
+    mock_pool.return_value = pool
+    with patch("src.transcribe._worker_model", _windowed_fake_model()):
+        code = main(["a.wav", "b.wav", "c.wav", "--long", "-w", "2", "--no-cache"])
+    assert code == 0
+    assert len(capsys.readouterr().out.strip().splitlines()) == 3
+    mock_pool.assert_called_once()
+    with pytest.raises(RuntimeError):
+        pool.submit(int)  # shut down after the last file
+
+
+def test_word_error_rate() -> None:
+    assert word_error_rate("Hello world.", "hello, world") == 0.0
+    assert word_error_rate("the cat sat", "the cat") == pytest.approx(1 / 3)
+    assert word_error_rate("the cat sat", "a cat sat down") == pytest.approx(2 / 3)
+    assert word_error_rate("", "") == 0.0
+
+
+def test_quantize_whisper_swaps_linear_subclasses() -> None:
+    torch = pytest.importorskip("torch")
+
+    class CastingLinear(torch.nn.Linear):  # stands in for whisper.model.Linear
+        pass
+
+    model = torch.nn.Sequential(CastingLinear(8, 8), torch.nn.ReLU(), torch.nn.Linear(8, 2))
+    x = torch.randn(4, 8)
+    expected = model(x)
+    q = quantize_whisper(model)
+    assert all("quantized" in type(q[i]).__module__ for i in (0, 2))
+    assert torch.allclose(q(x), expected, atol=0.1)
+
+
+@patch("src.transcribe.quantize_whisper")
+def test_load_whisper_model_int8_suffix(mock_quantize: MagicMock) -> None:
+    with patch.dict("sys.modules", {"whisper": MagicMock()}) as modules:
+        load_whisper_model("base-int8")
+        modules["whisper"].load_model.assert_called_once_with("base", device="cpu")
+    mock_quantize.assert_called_once()
+
+
+@patch("src.transcribe.decode_audio_file")
+def test_load_audio_uses_audio_cache(mock_decode: MagicMock, tmp_path: Path) -> None:
+    audio_file = tmp_path / "a.mp3"
+    audio_file.write_bytes(b"fake mp3")
+    mock_decode.return_value = np.ones(320, dtype=np.float32)
+    cache = AudioCache(tmp_path / "pcm", max_bytes=1 << 20)
+
+    first = load_audio(audio_file, cache)
+    second = load_audio(audio_file, cache)
+    mock_decode.assert_called_once()
+    assert isinstance(second, np.memmap)
+    np.testing.assert_array_equal(first, second)
+
+
+@patch("src.transcribe.check_ffmpeg_available")
+@patch("src.transcribe.decode_audio_file")
+def test_transcribe_audio_with_audio_cache_passes_samples(
+    mock_decode: MagicMock, _mock_ffmpeg: MagicMock, tmp_path: Path
+) -> None:
+    audio_file = tmp_path / "a.mp3"
+    audio_file.write_bytes(b"fake mp3")
+    mock_decode.return_value = np.zeros(160, dtype=np.float32)
+    fake_model = MagicMock()
+    fake_model.transcribe.return_value = {"text": "hi"}
+    cache = AudioCache(tmp_path / "pcm", max_bytes=1 << 20)
+
+    transcribe_audio(audio_file, model=fake_model, audio_cache=cache)
+    transcribe_audio(audio_file, model=fake_model, language="en", audio_cache=cache)
+    mock_decode.assert_called_once()
+    assert isinstance(fake_model.transcribe.call_args.args[0], np.ndarray)
+
+
+def _scored(start: float, end: float, text: str, logprob: float, ratio: float) -> dict:
+    return {
+        "start": start,
+        "end": end,
+        "text": text,
+        "avg_logprob": logprob,
+        "compression_ratio": ratio,
+    }
+
+
+def test_transcribe_cascade_redecodes_only_low_confidence_spans() -> None:
+    audio = np.zeros(16000 * 10, dtype=np.float32)
+    fast = MagicMock()
+    fast.transcribe.return_value = {
+        "language": "en",
+        "segments": [
+            _scored(0.0, 2.0, " good", -0.2, 1.2),
+            _scored(2.0, 4.0, " mumble", -1.5, 1.1),  # low confidence
+            _scored(4.0, 5.0, " la la la", -0.3, 3.0),  # repetitive
+            _scored(5.0, 10.0, " fine", -0.1, 1.0),
+        ],
+    }
+    accurate = MagicMock()
+    accurate.transcribe.return_value = {"text": " clear words"}
+
+    res = transcribe_cascade(audio, fast_model=fast, accurate_model=accurate)
+    assert res.text == "good clear words fine"
+    assert res.second_pass_fraction == pytest.approx(0.3)
+    accurate.transcribe.assert_called_once()
+    chunk = accurate.transcribe.call_args.args[0]
+    assert len(chunk) == int(3.4 * 16000)  # 2-5 s plus 0.2 s padding on both sides
+    assert accurate.transcribe.call_args.kwargs["language"] == "en"
+
+
+def test_transcribe_cascade_confident_audio_skips_second_model() -> None:
+    fast = MagicMock()
+    fast.transcribe.return_value = {
+        "segments": [{"start": 0.0, "end": 1.0, "text": " ok", "avg_logprob": -0.1}]
+    }
+    with patch("src.models.get_registry") as mock_registry:
+        res = transcribe_cascade(np.zeros(16000, dtype=np.float32), fast_model=fast)
+        mock_registry.return_value.get.assert_not_called()
+    assert res == CascadeResult("ok", [Segment(0.0, 1.0, "ok")], 0.0)